@@ -0,0 +1 @@
+# Benchmark suite of iLEAPP, see benchmarks/__main__.py
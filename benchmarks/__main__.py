@@ -0,0 +1,101 @@
+# Benchmarks of iLEAPP on synthetic extractions, run from the repository folder:
+#
+#   python -m benchmarks generate --size 100k          generate (or reuse) an extraction in every input form
+#   python -m benchmarks run --size 100k               run all the cases and store the results
+#   python -m benchmarks run --cases seeker.tar.* ccl  run some groups or cases
+#   python -m benchmarks compare [BASE [HEAD]]         compare the runs of two commits
+
+import argparse
+import os
+import sys
+
+from benchmarks.suite import REPO_FOLDER, compare_runs, find_run, groups, load_runs, run_benchmarks
+from benchmarks.synthetic import get_extraction, input_forms, parse_size, sizes
+
+DEFAULT_WORK_FOLDER = os.path.join(REPO_FOLDER, 'benchmarks', 'work')
+DEFAULT_RESULTS_PATH = os.path.join(REPO_FOLDER, 'benchmarks', 'results.jsonl')
+
+
+def get_extraction_folder(work_folder, file_count, seed):
+    return os.path.join(work_folder, 'extractions', f'synthetic_{file_count}_{seed}')
+
+def parse_forms(value):
+    forms = [form.strip() for form in value.split(',') if form.strip()]
+    for form in forms:
+        if form not in input_forms:
+            raise argparse.ArgumentTypeError(f'Unknown input form {form}, use some of {", ".join(input_forms)}')
+    return forms
+
+def parse_file_count(value):
+    try:
+        return parse_size(value)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(str(ex))
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='iLEAPP benchmarks on synthetic iOS extractions.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    extraction_args = argparse.ArgumentParser(add_help=False)
+    extraction_args.add_argument('--size', type=parse_file_count, default=sizes['10k'],
+                                 help=f'Number of files of the extraction: {", ".join(sizes)} or a number '
+                                      f'(default: 10k)')
+    extraction_args.add_argument('--seed', type=int, default=0, help='Seed of the generated data (default: 0)')
+    extraction_args.add_argument('--forms', type=parse_forms, default=list(input_forms),
+                                 help=f'Comma separated input forms (default: {",".join(input_forms)})')
+    extraction_args.add_argument('--work', default=DEFAULT_WORK_FOLDER,
+                                 help='Folder of the generated extractions and of the reports and temporary files '
+                                      'of the runs (default: benchmarks/work)')
+
+    subparsers.add_parser('generate', parents=[extraction_args],
+                          help='Generate a synthetic extraction, unless it was generated before')
+
+    run_parser = subparsers.add_parser('run', parents=[extraction_args], help='Run benchmark cases')
+    run_parser.add_argument('--cases', nargs='+', metavar='CASE',
+                            help=f'Groups ({", ".join(groups)}) or case name patterns, eg: seeker.zip.* '
+                                 f'(default: all)')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Runs of each case (default: 3)')
+    run_parser.add_argument('--workers', type=int, default=1, help='--workers of the crunch cases (default: 1)')
+    run_parser.add_argument('--results', default=DEFAULT_RESULTS_PATH,
+                            help='File the run is appended to (default: benchmarks/results.jsonl)')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare the results of two runs')
+    compare_parser.add_argument('base', nargs='?',
+                                help='Commit (hash prefix) of the base run (default: the run before the head run)')
+    compare_parser.add_argument('head', nargs='?', help='Commit of the head run (default: the latest run)')
+    compare_parser.add_argument('--threshold', type=float, default=10,
+                                help='Percentage above which a case is reported slower (default: 10)')
+    compare_parser.add_argument('--results', default=DEFAULT_RESULTS_PATH,
+                                help='File of the runs (default: benchmarks/results.jsonl)')
+
+    args = parser.parse_args()
+
+    if args.command in ('generate', 'run'):
+        extraction_folder = get_extraction_folder(args.work, args.size, args.seed)
+        extraction = get_extraction(extraction_folder, args.size, args.seed, args.forms)
+        if args.command == 'generate':
+            for form in args.forms:
+                print(f'{form}: {extraction["forms"][form]}')
+            return 0
+        run_benchmarks(extraction, args.forms, os.path.join(args.work, 'runs'), args.results, args.repeat,
+                       args.workers, args.cases)
+        print(f'Results appended to {args.results}')
+        return 0
+
+    try:
+        runs = load_runs(args.results)
+    except OSError as ex:
+        parser.error(f'Could not read the results: {ex}')
+    head = find_run(runs, args.head)
+    if head is None:
+        parser.error(f'No run found for {args.head or "the head"} in {args.results}')
+    base = find_run(runs, args.base, before=head)
+    if base is None:
+        parser.error(f'No earlier run on the same extraction found for {args.base or "the base"} in {args.results}')
+    regressions = compare_runs(base, head, args.threshold / 100)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,398 @@
+# Benchmark cases and the results store.
+#
+# Each case times one operation on a synthetic extraction (see benchmarks/synthetic.py), a number of times. Cases are
+# named <group>.<...>: 'seeker' cases time the FileSeeker* of each input form, 'crunch' cases run ileapp.py end to end
+# in a new process, 'report' times generate_report on the report of a crunch run and 'ccl' cases time the ccl parsers
+# on the fixtures of the extraction.
+#
+# Every run is appended as one JSON line to the results file, with the commit it ran on, so that runs can be compared
+# across commits.
+
+import contextlib
+import fnmatch
+import glob
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime
+
+REPO_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+groups = ('seeker', 'crunch', 'report', 'ccl')
+
+
+class Case:
+    '''A benchmark case. setup() is called before each timed run of run(), cleanup() after it, neither is timed.
+       run() returns the number of items it processed (files, records, ...) or None'''
+    def __init__(self, name, run, setup=None, cleanup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.cleanup = cleanup
+
+    def measure(self, repeat):
+        '''Runs the case repeat times, returns its result: the time of each run, the best and median times and the
+           items processed'''
+        times = []
+        items = None
+        extra = {}
+        for _ in range(repeat):
+            state = self.setup() if self.setup else None
+            try:
+                start = time.perf_counter()
+                items = self.run(state) if self.setup else self.run()
+                times.append(time.perf_counter() - start)
+                if isinstance(items, tuple):
+                    items, extra = items
+            finally:
+                if self.cleanup:
+                    self.cleanup(state)
+        result = {'times': [round(t, 6) for t in times], 'best': round(min(times), 6),
+                  'median': round(statistics.median(times), 6), 'items': items}
+        result.update(extra)
+        return result
+
+
+@contextlib.contextmanager
+def quiet():
+    '''Hides what iLEAPP prints while a case runs'''
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _init_logs(work_folder):
+    '''logfunc() writes to the screen output of a report, cases that are not run in a report log to the work folder'''
+    from scripts.ilapfuncs import OutputParameters
+    log_folder = os.path.join(work_folder, 'logs')
+    os.makedirs(log_folder, exist_ok=True)
+    OutputParameters.screen_output_file_path = os.path.join(log_folder, 'Screen Output.html')
+    OutputParameters.screen_output_file_path_devinfo = os.path.join(log_folder, 'DeviceInfo.html')
+
+def get_search_patterns():
+    '''The search patterns of all plugins, as searched by crunch_artifacts'''
+    import plugin_loader
+    from ileapp import get_search_patterns as get_plugin_patterns
+    plugins = plugin_loader.PluginLoader().plugins
+    return list(dict.fromkeys(pattern for plugin in plugins for pattern in get_plugin_patterns(plugin)))
+
+def get_seeker(form, input_path, temp_folder):
+    from scripts.search_files import FileSeekerDir, FileSeekerItunes, FileSeekerTar, FileSeekerZip
+    if form == 'fs':
+        return FileSeekerDir(input_path)
+    if form in ('tar', 'gz'):
+        return FileSeekerTar(input_path, temp_folder)
+    if form == 'zip':
+        return FileSeekerZip(input_path, temp_folder)
+    return FileSeekerItunes(input_path, temp_folder)
+
+def get_attachment_suffixes(extraction):
+    '''Attachment paths of sms.db, as resolved by the sms artifact'''
+    import sqlite3
+    db = sqlite3.connect(os.path.join(extraction['forms']['fs'], extraction['fixtures']['sms'][0]))
+    try:
+        return [row[0].replace('~', '', 1) for row in db.execute('SELECT filename FROM attachment')]
+    finally:
+        db.close()
+
+
+def seeker_cases(extraction, forms, work_folder):
+    patterns = []
+    suffixes = []
+
+    def new_seeker(form):
+        def setup():
+            if not patterns:
+                patterns.extend(get_search_patterns())
+                suffixes.extend(get_attachment_suffixes(extraction))
+            temp_folder = tempfile.mkdtemp(dir=work_folder)
+            with quiet():
+                seeker = get_seeker(form, extraction['forms'][form], temp_folder)
+            return seeker, temp_folder
+        return setup
+
+    def cleanup(state):
+        if state is None:
+            return
+        seeker, temp_folder = state
+        if seeker is not None:
+            seeker.cleanup()
+        shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def listing(form):
+        def run(state):
+            seeker, temp_folder = state
+            with quiet():
+                seeker = get_seeker(form, extraction['forms'][form], temp_folder)
+            seeker.cleanup()
+            return extraction['file_count']
+        return run
+
+    def search(state):
+        seeker, _ = state
+        with quiet():
+            return sum(len(seeker.search(pattern)) for pattern in patterns)
+
+    def search_many(state):
+        seeker, _ = state
+        with quiet():
+            results = seeker.search_many(patterns)
+            return sum(len(seeker.materialize(found)) for found in results.values())
+
+    def resolve_suffixes(state):
+        seeker, _ = state
+        with quiet():
+            return sum(len(found) for found in seeker.resolve_suffixes(suffixes).values())
+
+    cases = []
+    for form in forms:
+        cases.append(Case(f'seeker.{form}.listing', listing(form),
+                          lambda: (None, tempfile.mkdtemp(dir=work_folder)), cleanup))
+        cases.append(Case(f'seeker.{form}.search', search, new_seeker(form), cleanup))
+        cases.append(Case(f'seeker.{form}.search_many', search_many, new_seeker(form), cleanup))
+        cases.append(Case(f'seeker.{form}.resolve_suffixes', resolve_suffixes, new_seeker(form), cleanup))
+    return cases
+
+
+def run_ileapp(form, input_path, output_folder, workers):
+    '''Runs ileapp.py in a new process. Returns (report folder, peak RSS of the process in KB or None)'''
+    os.makedirs(output_folder, exist_ok=True)
+    command = [sys.executable, os.path.join(REPO_FOLDER, 'ileapp.py'), '-t', form, '-i', input_path,
+               '-o', output_folder, '--workers', str(workers)]
+    with open(os.path.join(output_folder, 'ileapp_output.txt'), 'w', encoding='utf8') as output:
+        process = subprocess.Popen(command, cwd=REPO_FOLDER, stdout=output, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            peak_rss = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+        else:
+            process.wait()
+            peak_rss = None
+    if process.returncode != 0:
+        raise RuntimeError(f'ileapp.py failed with exit code {process.returncode}, see {output.name}')
+    reports = glob.glob(os.path.join(output_folder, 'iLEAPP_Reports_*'))
+    if len(reports) != 1:
+        raise RuntimeError(f'Expected one report in {output_folder}, found {len(reports)}')
+    return reports[0], peak_rss
+
+def read_artifact_count(report_folder):
+    try:
+        with open(os.path.join(report_folder, 'Script Logs', 'perf.json'), 'r', encoding='utf8') as f:
+            return len(json.load(f)['plugins'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def crunch_cases(extraction, forms, work_folder, workers, reports):
+    '''reports gets the folder of a report generated by each form, for the report case'''
+    def crunch(form):
+        def setup():
+            return tempfile.mkdtemp(dir=work_folder)
+
+        def run(output_folder):
+            report_folder, peak_rss = run_ileapp(form, extraction['forms'][form], output_folder, workers)
+            return read_artifact_count(report_folder), {'peak_rss_kb': peak_rss}
+
+        def cleanup(output_folder):
+            # the report of the last run is kept for the report case
+            previous = reports.pop(form, None)
+            if previous:
+                shutil.rmtree(os.path.dirname(previous), ignore_errors=True)
+            found = glob.glob(os.path.join(output_folder, 'iLEAPP_Reports_*'))
+            if found:
+                reports[form] = found[0]
+            else:
+                shutil.rmtree(output_folder, ignore_errors=True)
+        return Case(f'crunch.{form}', run, setup, cleanup)
+    return [crunch(form) for form in forms]
+
+
+def report_cases(extraction, work_folder, workers, reports):
+    '''generate_report on the report of a crunch case, moving its pages back to their category folders before each
+       run as --resume does'''
+    def setup():
+        from scripts.ilapfuncs import OutputParameters
+        from scripts.run_manifest import RunManifest
+        if not reports:
+            output_folder = tempfile.mkdtemp(dir=work_folder)
+            reports['fs'] = run_ileapp('fs', extraction['forms']['fs'], output_folder, workers)[0]
+        form, report_folder = next(iter(reports.items()))
+        RunManifest.load(report_folder).reopen_report()
+        OutputParameters.screen_output_file_path = os.path.join(report_folder, 'Script Logs', 'Screen Output.html')
+        return form, report_folder
+
+    def run(state):
+        import scripts.report
+        form, report_folder = state
+        with quiet():
+            scripts.report.generate_report(report_folder, 0, '00:00:00', form, extraction['forms'][form], {})
+        return sum(1 for name in os.listdir(report_folder) if name.endswith('.html'))
+
+    return [Case('report.generate', run, setup)]
+
+
+def ccl_cases(extraction):
+    root = extraction['forms']['fs']
+    fixtures = {kind: [os.path.join(root, *path.split('/')) for path in paths]
+                for kind, paths in extraction['fixtures'].items()}
+
+    def bplist():
+        from scripts.ccl import ccl_bplist
+        for path in fixtures['bplist']:
+            with open(path, 'rb') as f:
+                ccl_bplist.load(f)
+        return len(fixtures['bplist'])
+
+    def segb1():
+        from scripts.ccl import ccl_segb1
+        return sum(1 for path in fixtures['segb1'] for _ in ccl_segb1.read_segb1_file(path))
+
+    def segb2():
+        from scripts.ccl import ccl_segb2
+        return sum(1 for path in fixtures['segb2'] for _ in ccl_segb2.read_segb2_file(path))
+
+    def biome_segb():
+        from scripts.biome import read_segb_records
+        count = 0
+        for path in fixtures['segb1'] + fixtures['segb2']:
+            with open(path, 'rb') as f:
+                count += sum(1 for _ in read_segb_records(f.read()))
+        return count
+
+    def leveldb_scan():
+        from scripts.ccl_leveldb import RawLevelDb
+        with RawLevelDb(fixtures['leveldb'][0]) as db:
+            return sum(1 for _ in db.iterate_records_raw())
+
+    def leveldb_get():
+        from scripts.ccl_leveldb import RawLevelDb
+        with RawLevelDb(fixtures['leveldb'][0]) as db:
+            keys = sorted({record.user_key for record in db.iterate_records_raw()})
+            keys = keys[::max(1, len(keys) // 1000)]
+            return sum(1 for key in keys if db.get(key) is not None)
+
+    snappy_blocks = []
+
+    def snappy():
+        from scripts import ccl_simplesnappy
+        if not snappy_blocks:
+            for path in fixtures['leveldb_table']:
+                snappy_blocks.extend(ccl_simplesnappy._read_ldb_compressed_blocks(path))
+        for block in snappy_blocks:
+            ccl_simplesnappy.decompress(block)
+        return len(snappy_blocks)
+
+    return [Case('ccl.bplist', bplist), Case('ccl.segb1', segb1), Case('ccl.segb2', segb2),
+            Case('ccl.biome_segb', biome_segb), Case('ccl.leveldb_scan', leveldb_scan),
+            Case('ccl.leveldb_get', leveldb_get), Case('ccl.snappy', snappy)]
+
+
+def get_cases(extraction, forms, work_folder, workers, selection=None):
+    '''Returns the cases selected by selection, a list of groups or case name patterns (eg: 'seeker.tar.*'), or all'''
+    reports = {}
+    cases = (seeker_cases(extraction, forms, work_folder)
+             + crunch_cases(extraction, forms, work_folder, workers, reports)
+             + report_cases(extraction, work_folder, workers, reports) + ccl_cases(extraction))
+    if not selection:
+        return cases
+    patterns = [item + '.*' if item in groups else item for item in selection]
+    return [case for case in cases if any(fnmatch.fnmatchcase(case.name, pattern) for pattern in patterns)]
+
+
+def get_commit():
+    '''Returns (commit hash, subject, whether tracked files are modified) of the repository, or Nones without git'''
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=REPO_FOLDER, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    try:
+        return git('rev-parse', 'HEAD'), git('log', '-1', '--format=%s'), bool(git('status', '--porcelain',
+                                                                                    '--untracked-files=no'))
+    except (OSError, subprocess.CalledProcessError):
+        return None, None, None
+
+def run_benchmarks(extraction, forms, work_folder, results_path, repeat=3, workers=1, selection=None, log=print):
+    '''Runs the selected cases on the extraction, appends the run to the results file and returns it. Reports and
+       temporary files are written in a new folder of work_folder, deleted at the end'''
+    os.makedirs(work_folder, exist_ok=True)
+    work_folder = tempfile.mkdtemp(dir=work_folder)
+    try:
+        _init_logs(work_folder)
+    except ImportError as ex:
+        # The ccl cases do not need the dependencies of iLEAPP, the other cases fail and are recorded as errors
+        log(f'Could not import iLEAPP: {ex}')
+    commit, subject, dirty = get_commit()
+    run = {'commit': commit, 'subject': subject, 'dirty': dirty, 'date': datetime.now().isoformat(timespec='seconds'),
+           'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+           'file_count': extraction['file_count'], 'seed': extraction['seed'],
+           'generator_version': extraction['generator_version'], 'repeat': repeat, 'workers': workers, 'cases': {}}
+    try:
+        for case in get_cases(extraction, forms, work_folder, workers, selection):
+            log(f'{case.name}...')
+            try:
+                result = case.measure(repeat)
+            except Exception as ex:
+                log(f'{case.name} failed: {ex}')
+                run['cases'][case.name] = {'error': str(ex)}
+                continue
+            run['cases'][case.name] = result
+            items = f', {result["items"]} items' if result['items'] is not None else ''
+            log(f'{case.name}: best {result["best"]:.4f} s, median {result["median"]:.4f} s{items}')
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+    if os.path.dirname(results_path):
+        os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, 'a', encoding='utf8') as f:
+        f.write(json.dumps(run) + '\n')
+    return run
+
+
+def load_runs(results_path):
+    runs = []
+    with open(results_path, 'r', encoding='utf8') as f:
+        for line in f:
+            if line.strip():
+                runs.append(json.loads(line))
+    return runs
+
+def find_run(runs, commit=None, before=None):
+    '''Returns the latest run of the commit (hash prefix), or the latest run, only looking at runs before the run
+       before and on the same extraction and settings'''
+    if before is not None:
+        runs = [run for run in runs[:runs.index(before)]
+                if all(run.get(key) == before.get(key) for key in ('file_count', 'seed', 'generator_version',
+                                                                    'workers'))]
+    for run in reversed(runs):
+        if commit is None or (run['commit'] or '').startswith(commit):
+            return run
+    return None
+
+def compare_runs(base, head, threshold=0.1, log=print):
+    '''Prints the best time of each case of head against base. Returns the names of the cases that are slower by more
+       than threshold (a fraction of the base time)'''
+    def describe(run):
+        commit = (run['commit'] or 'unknown')[:10] + (' (modified)' if run['dirty'] else '')
+        return f'{commit} {run["date"]} {run["subject"] or ""}'
+    log(f'base: {describe(base)}')
+    log(f'head: {describe(head)}')
+    regressions = []
+    width = max((len(name) for name in head['cases']), default=10)
+    log(f'{"case":<{width}}  {"base (s)":>10}  {"head (s)":>10}  change')
+    for name, result in head['cases'].items():
+        base_result = base['cases'].get(name)
+        if 'best' not in result or not base_result or 'best' not in base_result:
+            log(f'{name:<{width}}  {"-":>10}  {result.get("best", "error"):>10}')
+            continue
+        change = (result['best'] - base_result['best']) / base_result['best'] if base_result['best'] else 0
+        flag = ''
+        if change > threshold:
+            flag = '  slower'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        log(f'{name:<{width}}  {base_result["best"]:>10.4f}  {result["best"]:>10.4f}  {change:+7.1%}{flag}')
+    return regressions
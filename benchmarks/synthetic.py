@@ -0,0 +1,803 @@
+# Generator of synthetic iOS extractions for the benchmarks.
+#
+# An extraction is generated once for a file count and seed, as a file system tree, and then written in each input
+# form iLEAPP supports: the tree itself (fs), a tar and a tar.gz archive, a zip archive and an iTunes backup with a
+# Manifest.db. Besides filler files spread over app containers, the tree is seeded with fixtures that artifacts parse:
+# sms.db with attachments, knowledgeC.db, Photos.sqlite with DCIM files, Biome SEGB v1 and v2 streams, binary and XML
+# plists and a LevelDB database with snappy compressed tables. Their row counts grow with the file count.
+#
+# The same file count and seed always give the same extraction. synthetic.json in the extraction folder describes it,
+# so that it is reused by later runs and the benchmarks can find the fixtures.
+
+import hashlib
+import json
+import os
+import plistlib
+import random
+import shutil
+import sqlite3
+import struct
+import tarfile
+import uuid
+import zlib
+
+from datetime import datetime, timezone
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
+
+GENERATOR_VERSION = 1  # changing what is generated must change this, so that cached extractions are regenerated
+DESCRIPTION_FILENAME = 'synthetic.json'
+
+input_forms = ('fs', 'tar', 'gz', 'zip', 'itunes')
+sizes = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '5m': 5_000_000}
+
+FIXED_MTIME = 1700000000  # every file and archive member gets this time, so archives are the same on each generation
+COCOA_EPOCH_OFFSET = 978307200
+COCOA_START = 662688000  # 2022-01-01, fixture timestamps are spread over the two years after it
+COCOA_SPAN = 2 * 365 * 86400
+
+IOS_VERSION = '17.3'
+IOS_BUILD = '21D50'
+PRODUCT_TYPE = 'iPhone15,2'
+
+MOBILE = 'private/var/mobile'
+APP_CONTAINERS = MOBILE + '/Containers/Data/Application'
+GROUP_CONTAINERS = MOBILE + '/Containers/Shared/AppGroup'
+CONTAINER_METADATA = '.com.apple.mobile_container_manager.metadata.plist'
+
+FILES_PER_FOLDER = 64  # filler files are written in folders of at most this many files
+SEGB_RECORDS_PER_FILE = 2000
+LEVELDB_RECORDS_PER_TABLE = 50_000
+LEVELDB_BLOCK_SIZE = 4096
+LEVELDB_RESTART_INTERVAL = 16
+
+words = ('ok', 'see', 'you', 'later', 'tomorrow', 'call', 'me', 'when', 'the', 'meeting', 'is', 'over', 'thanks',
+         'lunch', 'at', 'noon', 'running', 'late', 'sorry', 'photo', 'from', 'trip', 'where', 'are', 'we', 'going',
+         'tonight', 'love', 'it', 'happy', 'birthday', 'did', 'get', 'my', 'message', 'address', 'sent', 'home')
+artists = ('The Synthetics', 'Null Pointer', 'Seg Fault', 'Heap Overflow', 'Race Condition')
+
+
+def parse_size(value):
+    '''Returns the file count of a size given as a name of sizes ('10k', '1m', ...) or a number, eg: 250000, 250k'''
+    value = str(value).strip().lower()
+    if value in sizes:
+        return sizes[value]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    try:
+        count = int(float(value.rstrip('km')) * multiplier)
+    except ValueError:
+        raise ValueError(f'Invalid extraction size: {value}')
+    if count < 1000:
+        raise ValueError(f'Extraction size must be at least 1000 files, not {count}')
+    return count
+
+
+# Encoders for the binary formats of the fixtures
+
+def encode_varint(value):
+    out = bytearray()
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def encode_protobuf(fields):
+    '''Encodes a protobuf message from [(field number, value)]: int values are varints, float values doubles, str and
+       bytes values length delimited, and lists of fields nested messages'''
+    out = bytearray()
+    for number, value in fields:
+        if isinstance(value, float):
+            out += encode_varint(number << 3 | 1) + struct.pack('<d', value)
+        elif isinstance(value, int):
+            out += encode_varint(number << 3) + encode_varint(value)
+        else:
+            if isinstance(value, str):
+                value = value.encode('utf8')
+            elif isinstance(value, list):
+                value = encode_protobuf(value)
+            out += encode_varint(number << 3 | 2) + encode_varint(len(value)) + value
+    return bytes(out)
+
+def encode_segb1(records):
+    '''Returns a SEGB v1 file of [(timestamp1, timestamp2, payload)], a None payload is a deleted record'''
+    body = bytearray()
+    for timestamp1, timestamp2, payload in records:
+        data = payload if payload is not None else bytes(16)
+        body += struct.pack('<i4xdd8x', len(data), timestamp1, timestamp2) + data
+        body += bytes(-len(body) % 8)
+    header = struct.pack('<I', 56 + len(body)) + bytes(48) + b'SEGB'
+    return header + bytes(body)
+
+def encode_segb2(records, created):
+    '''Returns a SEGB v2 file of [(timestamp, payload)], a None payload is a deleted record'''
+    body = bytearray()
+    trailer = bytearray()
+    for timestamp, payload in records:
+        data = payload if payload is not None else bytes(16)
+        body += struct.pack('<I4x', zlib.crc32(data)) + data
+        trailer += struct.pack('<2id', len(body), 1 if payload is not None else 3, timestamp)
+        body += bytes(-len(body) % 4)
+    header = struct.pack('<4sid16x', b'SEGB', len(records), created)
+    return header + bytes(body) + bytes(trailer)
+
+def snappy_compress(data):
+    '''Greedy snappy compressor: literals and 2 byte offset copies of at least 4 bytes'''
+    out = bytearray(encode_varint(len(data)))
+
+    def add_literal(literal):
+        length = len(literal) - 1
+        if length < 60:
+            out.append(length << 2)
+        else:
+            size = (length.bit_length() + 7) // 8
+            out.append((59 + size) << 2)
+            out.extend(length.to_bytes(size, 'little'))
+        out.extend(literal)
+
+    table = {}
+    literal_start = pos = 0
+    end = len(data) - 4
+    while pos <= end:
+        key = data[pos:pos + 4]
+        candidate = table.get(key)
+        table[key] = pos
+        if candidate is None or pos - candidate > 0xffff:
+            pos += 1
+            continue
+        length = 4
+        while pos + length < len(data) and length < 64 and data[candidate + length] == data[pos + length]:
+            length += 1
+        if literal_start < pos:
+            add_literal(data[literal_start:pos])
+        out.append((length - 1) << 2 | 2)
+        out.extend(struct.pack('<H', pos - candidate))
+        pos += length
+        literal_start = pos
+    if literal_start < len(data):
+        add_literal(data[literal_start:])
+    return bytes(out)
+
+def _encode_block(entries, restart_interval):
+    '''Returns a LevelDB table block of sorted [(key, value)], keys sharing a prefix with the previous one'''
+    out = bytearray()
+    restarts = []
+    previous = b''
+    for i, (key, value) in enumerate(entries):
+        shared = 0
+        if i % restart_interval:
+            while shared < min(len(key), len(previous)) and key[shared] == previous[shared]:
+                shared += 1
+        else:
+            restarts.append(len(out))
+        out += encode_varint(shared) + encode_varint(len(key) - shared) + encode_varint(len(value))
+        out += key[shared:] + value
+        previous = key
+    for restart in restarts or [0]:
+        out += struct.pack('<I', restart)
+    out += struct.pack('<I', len(restarts or [0]))
+    return bytes(out)
+
+def encode_ldb(records):
+    '''Returns a LevelDB table file of [(user key, sequence number, live, value)] sorted by user key. Data blocks are
+       snappy compressed when that makes them smaller; block checksums are not written (readers do not check them)'''
+    out = bytearray()
+    index = []
+
+    def add_block(block, compress):
+        data, compression = block, 0
+        if compress:
+            compressed = snappy_compress(block)
+            if len(compressed) < len(block):
+                data, compression = compressed, 1
+        handle = encode_varint(len(out)) + encode_varint(len(data))
+        out.extend(data + bytes([compression]) + bytes(4))
+        return handle
+
+    entries = []
+    size = 0
+    for user_key, seq, live, value in records:
+        key = user_key + struct.pack('<Q', seq << 8 | int(live))
+        entries.append((key, value))
+        size += len(key) + len(value)
+        if size >= LEVELDB_BLOCK_SIZE:
+            index.append((key, add_block(_encode_block(entries, LEVELDB_RESTART_INTERVAL), True)))
+            entries, size = [], 0
+    if entries:
+        index.append((entries[-1][0], add_block(_encode_block(entries, LEVELDB_RESTART_INTERVAL), True)))
+    meta_index_handle = add_block(_encode_block([], 1), False)
+    index_handle = add_block(_encode_block(index, 1), False)
+    footer = meta_index_handle + index_handle
+    out += footer + bytes(40 - len(footer)) + struct.pack('<Q', 0xdb4775248b80fb57)
+    return bytes(out)
+
+def encode_leveldb_log(batches):
+    '''Returns a LevelDB log file of write batches [(first sequence number, [(key, value or None to delete)])]'''
+    block_size = 32768
+    out = bytearray()
+    for seq, entries in batches:
+        batch = bytearray(struct.pack('<QI', seq, len(entries)))
+        for key, value in entries:
+            batch += bytes([value is not None]) + encode_varint(len(key)) + key
+            if value is not None:
+                batch += encode_varint(len(value)) + value
+        first = True
+        while True:
+            space = block_size - len(out) % block_size
+            if space < 7:
+                out += bytes(space)
+                continue
+            fragment, batch = batch[:space - 7], batch[space - 7:]
+            if first:
+                record_type = 1 if not batch else 2
+            else:
+                record_type = 4 if not batch else 3
+            out += struct.pack('<IHB', 0, len(fragment), record_type) + fragment  # checksum is not verified
+            first = False
+            if not batch:
+                break
+    return bytes(out)
+
+def fake_jpeg(rng, size):
+    '''JPEG markers around random bytes, enough for file type detection'''
+    return b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00' + rng.randbytes(size) + b'\xff\xd9'
+
+
+class ExtractionWriter:
+    '''Writes the file system tree of a synthetic extraction'''
+    def __init__(self, root, file_count, seed):
+        self.root = root
+        self.file_count = file_count
+        self.rng = random.Random(seed)
+        self.scale = file_count / 10_000
+        self.files_written = 0
+        self.fixtures = {}  # fixture kind -> [paths relative to root] of the files the ccl parsers are run on
+        self.counts = {}  # fixture item -> number generated, eg: sms messages
+        self.apps = []  # (container uuid, bundle id)
+        self._filler_data = self.rng.randbytes(1 << 17)
+
+    def uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4)).upper()
+
+    def cocoa_time(self):
+        return COCOA_START + self.rng.random() * COCOA_SPAN
+
+    def write(self, relative_path, data, fixture=None):
+        path = os.path.join(self.root, *relative_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (FIXED_MTIME, FIXED_MTIME))
+        self.files_written += 1
+        if fixture:
+            self.fixtures.setdefault(fixture, []).append(relative_path)
+        return path
+
+    def write_plist(self, relative_path, value, binary=True):
+        fmt = plistlib.FMT_BINARY if binary else plistlib.FMT_XML
+        return self.write(relative_path, plistlib.dumps(value, fmt=fmt), 'bplist' if binary else 'plist')
+
+    def write_db(self, relative_path, schema, tables, fixture):
+        '''Creates the SQLite database relative_path with the schema and the rows of tables {table: [rows]}'''
+        path = os.path.join(self.root, *relative_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = sqlite3.connect(path)
+        db.executescript(schema)
+        with db:
+            for table, rows in tables.items():
+                rows = iter(rows)
+                first = next(rows, None)
+                if first is None:
+                    continue
+                placeholders = ', '.join('?' * len(first))
+                db.execute(f'INSERT INTO {table} VALUES ({placeholders})', first)
+                db.executemany(f'INSERT INTO {table} VALUES ({placeholders})', rows)
+        db.close()
+        os.utime(path, (FIXED_MTIME, FIXED_MTIME))
+        self.files_written += 1
+        self.fixtures.setdefault(fixture, []).append(relative_path)
+        return path
+
+    def count(self, base, minimum=1, maximum=None):
+        '''Number of fixture items for this extraction size'''
+        count = max(minimum, int(base * self.scale))
+        return min(count, maximum) if maximum else count
+
+    def generate(self):
+        self.write_system()
+        self.write_apps()
+        self.write_sms()
+        self.write_knowledgec()
+        self.write_photos()
+        self.write_biome()
+        self.write_leveldb()
+        self.write_filler()
+
+    def write_system(self):
+        build_info = {'ProductBuildVersion': IOS_BUILD, 'ProductName': 'iPhone OS', 'ProductVersion': IOS_VERSION}
+        self.write_plist('private/var/installd/Library/MobileInstallation/LastBuildInfo.plist', build_info, False)
+        self.write_plist('System/Library/CoreServices/SystemVersion.plist', dict(build_info,
+                         ProductCopyright='1983-2024 Apple Inc.', ReleaseType='User'), False)
+        self.write_plist(MOBILE + '/Library/Preferences/com.apple.preferences.datetime.plist',
+                         {'timezone': 'America/New_York'})
+        self.write_plist('private/var/root/Library/Lockdown/data_ark.plist',
+                         {'-DeviceName': 'Synthetic iPhone', '-TimeZone': 'America/New_York',
+                          'com.apple.international-Language': 'en', 'com.apple.international-Locale': 'en_US'})
+
+    def write_apps(self):
+        '''App data and group containers with their metadata and preferences plists'''
+        for i in range(self.count(20, 20, 5000)):
+            bundle_id = f'com.synthetic.app{i:04d}'
+            container = self.uuid()
+            self.apps.append((container, bundle_id))
+            base = f'{APP_CONTAINERS}/{container}'
+            self.write_plist(f'{base}/{CONTAINER_METADATA}', {
+                'MCMMetadataIdentifier': bundle_id, 'MCMMetadataContentClass': 2, 'MCMMetadataSchemaVersion': 1,
+                'MCMMetadataUUID': container})
+            self.write_plist(f'{base}/Library/Preferences/{bundle_id}.plist', {
+                'LaunchCount': self.rng.randrange(1000), 'LastLaunch': datetime.fromtimestamp(
+                    COCOA_EPOCH_OFFSET + self.cocoa_time(), timezone.utc).replace(tzinfo=None),
+                'UserName': f'user{self.rng.randrange(10000)}', 'Settings': {
+                    'notifications': bool(i % 2), 'theme': ('light', 'dark')[i % 2],
+                    'recent': [self.uuid() for _ in range(5)]}}, binary=bool(i % 3))
+            if i % 4 == 0:
+                group = self.uuid()
+                self.write_plist(f'{GROUP_CONTAINERS}/{group}/{CONTAINER_METADATA}', {
+                    'MCMMetadataIdentifier': f'group.{bundle_id}', 'MCMMetadataContentClass': 7,
+                    'MCMMetadataSchemaVersion': 1, 'MCMMetadataUUID': group})
+
+    def write_sms(self):
+        rng = self.rng
+        message_count = self.count(2000, 100, 1_000_000)
+        chat_count = max(5, message_count // 100)
+        handles = [(i + 1, f'+1555{rng.randrange(10 ** 7):07d}', 'us', 'iMessage' if i % 3 else 'SMS', None, None)
+                   for i in range(chat_count)]
+        chats = [(i + 1, f'iMessage;-;{handle[1]}', 45, 3, None, None, handle[1], handle[3], None,
+                  'E:synthetic@icloud.com', 0, None, None, self.uuid(), 0, 1) for i, handle in enumerate(handles)]
+        chat_handles = [(i + 1, i + 1) for i in range(chat_count)]
+        messages, chat_messages, attachments, message_attachments = [], [], [], []
+        dates = sorted(int(self.cocoa_time() * 1e9) for _ in range(message_count))
+        for rowid, date in enumerate(dates, 1):
+            chat = rng.randrange(chat_count)
+            from_me = rng.randrange(2)
+            text = ' '.join(rng.choice(words) for _ in range(rng.randrange(1, 20)))
+            has_attachment = rng.random() < 0.05
+            messages.append((rowid, self.uuid(), text, handles[chat][0], handles[chat][3], 'e:synthetic@icloud.com',
+                             date, date + rng.randrange(10 ** 11) if not from_me else 0, 1, from_me, 1, from_me,
+                             0, int(has_attachment)))
+            chat_messages.append((chat + 1, rowid, date))
+            if has_attachment:
+                attachment = len(attachments) + 1
+                guid = self.uuid()
+                name = f'IMG_{attachment:04d}.jpeg'
+                relative = f'Library/SMS/Attachments/{guid[:2].lower()}/{attachment % 16:02d}/{guid}/{name}'
+                data = fake_jpeg(rng, rng.randrange(2000, 20000))
+                self.write(f'{MOBILE}/{relative}', data)
+                attachments.append((attachment, guid, date // 10 ** 9, f'~/{relative}', 'public.jpeg', 'image/jpeg',
+                                    5, from_me, name, len(data)))
+                message_attachments.append((rowid, attachment))
+        # deleted messages leave gaps in the ROWIDs
+        deleted = set(rng.sample(range(1, message_count + 1), message_count // 100))
+        deleted_rows = [(i + 1, message[1]) for i, message in enumerate(m for m in messages if m[0] in deleted)]
+        self.counts.update(sms_messages=message_count - len(deleted), sms_attachments=len(attachments))
+        self.write_db(MOBILE + '/Library/SMS/sms.db', sms_schema, {
+            'handle': handles, 'chat': chats, 'chat_handle_join': chat_handles,
+            'message': (m for m in messages if m[0] not in deleted),
+            'chat_message_join': (j for j in chat_messages if j[1] not in deleted),
+            'attachment': attachments,
+            'message_attachment_join': (j for j in message_attachments if j[0] not in deleted),
+            'deleted_messages': deleted_rows}, 'sms')
+
+    def write_knowledgec(self):
+        rng = self.rng
+        object_count = self.count(5000, 200, 2_000_000)
+        sources, objects, metadata = [], [], []
+        bundle_ids = [bundle_id for _, bundle_id in self.apps] + ['com.apple.mobilesafari', 'com.apple.MobileSMS']
+        for i, bundle_id in enumerate(bundle_ids, 1):
+            sources.append((i, 1, 1, 501, bundle_id, None, None, None, None))
+        for pk in range(1, object_count + 1):
+            start = self.cocoa_time()
+            end = start + rng.randrange(1, 3600)
+            stream = rng.choice(knowledgec_streams)
+            source = rng.randrange(len(bundle_ids)) + 1
+            value_string = value_integer = structured = None
+            if stream in ('/app/inFocus', '/app/usage', '/app/activity'):
+                value_string = bundle_ids[source - 1]
+            elif stream == '/device/batteryPercentage':
+                value_integer = rng.randrange(101)
+            elif stream in ('/device/isPluggedIn', '/display/isBacklit', '/settings/doNotDisturb'):
+                value_integer = rng.randrange(2)
+            elif stream == '/media/nowPlaying':
+                value_string = 'com.apple.Music'
+                structured = len(metadata) + 1
+                metadata.append((structured, 2, 1, None, rng.randrange(2), None, rng.randrange(2),
+                                 rng.randrange(120, 400), rng.choice(artists), rng.choice(artists) + ' Album',
+                                 rng.choice(('Pop', 'Rock', 'Jazz')), ' '.join(rng.sample(words, 3)).title(), None))
+            objects.append((pk, 11, 1, int(structured is not None), value_integer, int(rng.random() * 86400),
+                            -18000, source, structured, start, end, end, stream, value_string, self.uuid()))
+        self.counts['knowledgec_objects'] = object_count
+        self.write_db(MOBILE + '/Library/CoreDuet/Knowledge/knowledgeC.db', knowledgec_schema, {
+            'ZSOURCE': sources, 'ZSTRUCTUREDMETADATA': metadata, 'ZOBJECT': objects}, 'knowledgec')
+
+    def write_photos(self):
+        rng = self.rng
+        asset_count = self.count(500, 20, 500_000)
+        assets, attributes, masters, resources, albums, album_assets = [], [], [], [], [], []
+        album_count = max(3, asset_count // 200)
+        for pk in range(1, album_count + 1):
+            albums.append((pk, 2, ' '.join(rng.sample(words, 2)).title(), 0, self.uuid(), self.cocoa_time(), 0, None))
+        for pk in range(1, asset_count + 1):
+            folder = f'{100 + (pk - 1) // 1000}APPLE'
+            filename = f'IMG_{pk:04d}.JPG'
+            data = fake_jpeg(rng, rng.randrange(4000, 40000))
+            self.write(f'{MOBILE}/Media/DCIM/{folder}/{filename}', data)
+            created = self.cocoa_time()
+            has_location = rng.random() < 0.6
+            assets.append((pk, self.uuid(), filename, f'DCIM/{folder}', created, created + rng.randrange(86400),
+                           created, 0, 0, 4032, 3024, 40.0 + rng.random() if has_location else -180.0,
+                           -74.0 - rng.random() if has_location else -180.0, int(rng.random() < 0.02),
+                           int(rng.random() < 0.02), int(rng.random() < 0.05), pk, pk, 3, 1, 0))
+            attributes.append((pk, pk, filename, len(data), 'America/New_York',
+                               datetime.fromtimestamp(COCOA_EPOCH_OFFSET + created, timezone.utc).strftime(
+                                   '%Y:%m:%d %H:%M:%S'), None, self.uuid()))
+            masters.append((pk, filename, None, self.uuid(), created))
+            resources.append((pk, pk, 1, 0, len(data), 3))
+            album_assets.append((rng.randrange(album_count) + 1, pk, pk))
+        self.counts['photos_assets'] = asset_count
+        self.write_db(MOBILE + '/Media/PhotoData/Photos.sqlite', photos_schema, {
+            'ZASSET': assets, 'ZADDITIONALASSETATTRIBUTES': attributes, 'ZCLOUDMASTER': masters,
+            'ZINTERNALRESOURCE': resources, 'ZGENERICALBUM': albums, 'Z_28ASSETS': album_assets}, 'photos')
+
+    def write_biome(self):
+        rng = self.rng
+        bundle_ids = [bundle_id for _, bundle_id in self.apps]
+        record_count = self.count(2000, 100, 1_000_000)
+        self.counts['biome_records'] = 2 * record_count
+        # Backlight public stream, SEGB v2
+        folder = MOBILE + '/Library/Biome/streams/public/Backlight/local'
+        for start in range(0, record_count, SEGB_RECORDS_PER_FILE):
+            records = []
+            for _ in range(min(SEGB_RECORDS_PER_FILE, record_count - start)):
+                timestamp = self.cocoa_time()
+                payload = encode_protobuf([(1, timestamp), (2, rng.randrange(2))])
+                records.append((timestamp, payload if rng.random() >= 0.03 else None))
+            records.sort(key=lambda record: record[0])
+            self.write(f'{folder}/{int(records[0][0])}', encode_segb2(records, records[0][0]), 'segb2')
+        # App.InFocus restricted stream, SEGB v1
+        folder = MOBILE + '/Library/Biome/streams/restricted/_DKEvent.App.InFocus/local'
+        for start in range(0, record_count, SEGB_RECORDS_PER_FILE):
+            records = []
+            for _ in range(min(SEGB_RECORDS_PER_FILE, record_count - start)):
+                begin = self.cocoa_time()
+                end = begin + rng.randrange(1, 600)
+                payload = encode_protobuf([
+                    (1, [(1, 'App.InFocus'), (2, [(1, 1), (2, 0)])]), (2, begin), (3, end),
+                    (4, [(1, [(1, 1), (2, 0)]), (3, rng.choice(bundle_ids))]), (5, self.uuid()),
+                    (7, [(2, [(1, [(1, 1), (2, 0)]), (3, 'com.apple.springboard')]), (3, 1)]), (8, end), (10, 1)])
+                records.append((begin, end, payload if rng.random() >= 0.03 else None))
+            records.sort(key=lambda record: record[0])
+            self.write(f'{folder}/{int(records[0][0])}', encode_segb1(records), 'segb1')
+
+    def write_leveldb(self):
+        '''Local storage of the first app: table files holding older versions and a log with the latest writes'''
+        rng = self.rng
+        container, bundle_id = self.apps[0]
+        folder = f'{APP_CONTAINERS}/{container}/Library/Application Support/{bundle_id}/Local Storage/leveldb'
+        record_count = self.count(2000, 200, 500_000)
+        keys = sorted({f'_https://app{rng.randrange(50)}.example.com\x00\x01item{rng.randrange(10 ** 9)}'.encode()
+                       for _ in range(record_count)})
+        seq = 1
+        tables = []
+        for file_no, start in enumerate(range(0, len(keys), LEVELDB_RECORDS_PER_TABLE), 5):
+            records = []
+            for key in keys[start:start + LEVELDB_RECORDS_PER_TABLE]:
+                value = json.dumps({'id': seq, 'text': ' '.join(rng.choice(words) for _ in range(12)),
+                                    'updated': int(self.cocoa_time())}).encode('utf-16-le')
+                records.append((key, seq, True, value))
+                seq += 1
+            tables.append(self.write(f'{folder}/{file_no:06d}.ldb', encode_ldb(records), 'leveldb_table'))
+        batches = []
+        for _ in range(max(1, len(keys) // 1000)):
+            entries = [(rng.choice(keys), None if rng.random() < 0.1 else json.dumps(
+                {'id': seq, 'text': ' '.join(rng.choice(words) for _ in range(12))}).encode('utf-16-le'))
+                for _ in range(rng.randrange(1, 100))]
+            batches.append((seq, entries))
+            seq += len(entries)
+        self.write(f'{folder}/{len(tables) + 5:06d}.log', encode_leveldb_log(batches), 'leveldb_log')
+        self.counts['leveldb_records'] = seq - 1
+        self.fixtures['leveldb'] = [folder]
+
+    def write_filler(self):
+        '''Files in app containers up to the file count: caches, documents, cookies and temporary files'''
+        rng = self.rng
+        remaining = self.file_count - self.files_written
+        if remaining <= 0 or not self.apps:
+            return
+        kinds = (('Library/Caches/{bundle}/fsCachedData', '{uuid}', None),
+                 ('Library/Caches/{bundle}/Cache.db-files', '{n:08X}.cache', None),
+                 ('Documents/{folder}', 'document_{n}.json', 'json'),
+                 ('Library/Application Support/{bundle}/{folder}', 'blob_{n}.dat', None),
+                 ('tmp', '{uuid}.tmp', None))
+        size_buckets = (0, 64, 512, 2048, 8192, 32768)
+        size_weights = (5, 30, 30, 20, 10, 5)
+        per_app = -(-remaining // len(self.apps))
+        n = 0
+        for container, bundle_id in self.apps:
+            for start in range(0, min(per_app, remaining), FILES_PER_FOLDER):
+                folder_template, name_template, content = kinds[rng.randrange(len(kinds))]
+                folder = folder_template.format(bundle=bundle_id, folder=f'{start // FILES_PER_FOLDER:04d}')
+                for _ in range(min(FILES_PER_FOLDER, per_app - start, remaining)):
+                    n += 1
+                    name = name_template.format(uuid=self.uuid(), n=n)
+                    if content == 'json':
+                        data = json.dumps({'n': n, 'words': rng.sample(words, 8)}).encode()
+                    else:
+                        size = rng.choices(size_buckets, size_weights)[0]
+                        offset = rng.randrange(len(self._filler_data) - size)
+                        data = self._filler_data[offset:offset + size]
+                    self.write(f'{APP_CONTAINERS}/{container}/{folder}/{name}', data)
+                    remaining -= 1
+            if remaining <= 0:
+                break
+
+
+def walk_tree(root):
+    '''Yields (relative path, full path, is folder) for everything below root, sorted, folders before their files'''
+    for folder, dirs, files in os.walk(root):
+        dirs.sort()
+        relative_folder = os.path.relpath(folder, root).replace(os.sep, '/')
+        if relative_folder != '.':
+            yield relative_folder, folder, True
+        else:
+            relative_folder = ''
+        for name in sorted(files):
+            yield (relative_folder + '/' if relative_folder else '') + name, os.path.join(folder, name), False
+
+def _reset_tarinfo(info):
+    info.mtime = FIXED_MTIME
+    info.uid = info.gid = 501
+    info.uname = info.gname = 'mobile'
+    return info
+
+def write_archives(root, paths):
+    '''Writes the tree at root to the archives {form: path} in a single walk'''
+    archives = {}
+    try:
+        for form, path in paths.items():
+            if form == 'tar':
+                archives[form] = tarfile.open(path, 'w')
+            elif form == 'gz':
+                archives[form] = tarfile.open(path, 'w:gz', compresslevel=6)
+            elif form == 'zip':
+                archives[form] = ZipFile(path, 'w', ZIP_DEFLATED, compresslevel=6)
+        for relative_path, full_path, is_folder in walk_tree(root):
+            for form, archive in archives.items():
+                if form == 'zip':
+                    info = ZipInfo(relative_path + ('/' if is_folder else ''),
+                                   datetime.fromtimestamp(FIXED_MTIME, timezone.utc).timetuple()[:6])
+                    if is_folder:
+                        info.external_attr = 0o40755 << 16 | 0x10
+                        archive.writestr(info, b'')
+                    else:
+                        info.external_attr = 0o100644 << 16
+                        info.compress_type = ZIP_DEFLATED
+                        with open(full_path, 'rb') as f:
+                            archive.writestr(info, f.read())
+                else:
+                    archive.add(full_path, relative_path, recursive=False, filter=_reset_tarinfo)
+    finally:
+        for archive in archives.values():
+            archive.close()
+
+def get_backup_domain(relative_path, bundle_ids):
+    '''Returns (domain, path relative to the domain) of a file in an iTunes backup, or None for files that are not
+       backed up. bundle_ids maps container uuids to the bundle ids of their apps'''
+    parts = relative_path.split('/')
+    if relative_path.startswith((APP_CONTAINERS + '/', GROUP_CONTAINERS + '/')):
+        # container metadata, caches and temporary files are not backed up
+        if (len(parts) < 8 or parts[7] in (CONTAINER_METADATA, 'tmp') or parts[7:9] == ['Library', 'Caches']
+                or parts[6] not in bundle_ids):
+            return None
+        prefix = 'AppDomain-' if parts[4] == 'Data' else 'AppDomainGroup-'
+        return prefix + bundle_ids[parts[6]], '/'.join(parts[7:])
+    if relative_path == MOBILE + '/Containers' or relative_path.startswith(MOBILE + '/Containers/'):
+        return None
+    if relative_path.startswith(MOBILE + '/Media/'):
+        return 'MediaDomain', relative_path[len(MOBILE) + 1:]
+    if relative_path.startswith(MOBILE + '/'):
+        return 'HomeDomain', relative_path[len(MOBILE) + 1:]
+    for prefix, domain in (('private/var/installd/', 'InstallDomain'), ('private/var/root/', 'RootDomain'),
+                           ('private/var/db/', 'DatabaseDomain'), ('private/var/wireless/', 'WirelessDomain'),
+                           ('private/var/preferences/', 'SystemPreferencesDomain')):
+        if relative_path.startswith(prefix):
+            return domain, relative_path[len(prefix):]
+    return None
+
+def _read_container_bundle_ids(root):
+    '''Returns {container uuid: bundle id} from the container metadata plists of the tree'''
+    bundle_ids = {}
+    for containers in (APP_CONTAINERS, GROUP_CONTAINERS):
+        folder = os.path.join(root, *containers.split('/'))
+        for container in sorted(os.listdir(folder)) if os.path.isdir(folder) else ():
+            try:
+                with open(os.path.join(folder, container, CONTAINER_METADATA), 'rb') as f:
+                    bundle_ids[container] = plistlib.load(f)['MCMMetadataIdentifier']
+            except (OSError, KeyError, plistlib.InvalidFileException):
+                continue
+    return bundle_ids
+
+def write_itunes_backup(root, backup_folder):
+    '''Writes the tree at root as an unencrypted iTunes backup: files named by the SHA-1 of their domain and path,
+       Manifest.db, Info.plist, Manifest.plist and Status.plist. Files are hard linked from the tree when possible'''
+    os.makedirs(backup_folder)
+    bundle_ids = _read_container_bundle_ids(root)
+    db = sqlite3.connect(os.path.join(backup_folder, 'Manifest.db'))
+    db.executescript('''
+        CREATE TABLE Files (fileID TEXT PRIMARY KEY, domain TEXT, relativePath TEXT, flags INTEGER, file BLOB);
+        CREATE INDEX FilesDomainIdx ON Files(domain);
+        CREATE INDEX FilesRelativePathIdx ON Files(relativePath);
+        CREATE INDEX FilesFlagsIdx ON Files(flags);
+        CREATE TABLE Properties (key TEXT PRIMARY KEY, value BLOB);
+    ''')
+    rows = []
+    for relative_path, full_path, is_folder in walk_tree(root):
+        domain = get_backup_domain(relative_path, bundle_ids)
+        if domain is None:
+            continue
+        domain, domain_path = domain
+        file_id = hashlib.sha1(f'{domain}-{domain_path}'.encode('utf8')).hexdigest()
+        rows.append((file_id, domain, domain_path, 2 if is_folder else 1, None))
+        if not is_folder:
+            target = os.path.join(backup_folder, file_id[:2], file_id)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.link(full_path, target)
+            except OSError:
+                shutil.copy2(full_path, target)
+        if len(rows) >= 10000:
+            db.executemany('INSERT OR REPLACE INTO Files VALUES (?, ?, ?, ?, ?)', rows)
+            rows = []
+    db.executemany('INSERT OR REPLACE INTO Files VALUES (?, ?, ?, ?, ?)', rows)
+    db.commit()
+    db.close()
+
+    backup_date = datetime.fromtimestamp(FIXED_MTIME, timezone.utc).replace(tzinfo=None)
+    apps = sorted(set(bundle_ids.values()) - {b for b in bundle_ids.values() if b.startswith('group.')})
+    udid = os.path.basename(backup_folder)
+    info = {'Build Version': IOS_BUILD, 'Device Name': 'Synthetic iPhone', 'Display Name': 'Synthetic iPhone',
+            'GUID': udid[:32].upper(), 'ICCID': '89014103211118510720', 'IMEI': '356938035643809',
+            'Last Backup Date': backup_date, 'Phone Number': '+1 (555) 010-0000', 'Product Name': 'iPhone 14 Pro',
+            'Product Type': PRODUCT_TYPE, 'Product Version': IOS_VERSION, 'Serial Number': 'F2LSYNTH0001',
+            'Target Identifier': udid, 'Target Type': 'Device', 'Unique Identifier': udid.upper(),
+            'iTunes Version': '12.13.1.3', 'Installed Applications': apps, 'Applications': {}}
+    with open(os.path.join(backup_folder, 'Info.plist'), 'wb') as f:
+        plistlib.dump(info, f)
+    manifest = {'IsEncrypted': False, 'Version': '10.0', 'Date': backup_date, 'SystemDomainsVersion': '24.0',
+                'WasPasscodeSet': True, 'Lockdown': {'ProductVersion': IOS_VERSION, 'ProductType': PRODUCT_TYPE,
+                                                     'BuildVersion': IOS_BUILD, 'UniqueDeviceID': udid,
+                                                     'DeviceName': 'Synthetic iPhone'},
+                'Applications': {bundle_id: {'CFBundleIdentifier': bundle_id} for bundle_id in apps}}
+    with open(os.path.join(backup_folder, 'Manifest.plist'), 'wb') as f:
+        plistlib.dump(manifest, f, fmt=plistlib.FMT_BINARY)
+    status = {'BackupState': 'new', 'Date': backup_date, 'IsFullBackup': False, 'SnapshotState': 'finished',
+              'UUID': udid.upper(), 'Version': '3.3'}
+    with open(os.path.join(backup_folder, 'Status.plist'), 'wb') as f:
+        plistlib.dump(status, f, fmt=plistlib.FMT_BINARY)
+
+
+def get_extraction(folder, file_count, seed=0, forms=input_forms, log=print):
+    '''Returns the description of the synthetic extraction of file_count files and seed in folder, generating the
+       file system tree and the input forms that are not there yet. Its 'forms' maps each form to the input path to
+       give iLEAPP, its 'fixtures' maps fixture kinds to their paths relative to the file system tree'''
+    folder = os.path.abspath(folder)
+    description_path = os.path.join(folder, DESCRIPTION_FILENAME)
+    description = None
+    if os.path.exists(description_path):
+        with open(description_path, 'r', encoding='utf8') as f:
+            description = json.load(f)
+        if (description.get('generator_version') != GENERATOR_VERSION or description.get('file_count') != file_count
+                or description.get('seed') != seed):
+            log(f'Removing the outdated synthetic extraction in {folder}')
+            shutil.rmtree(folder)
+            description = None
+
+    root = os.path.join(folder, 'fs')
+    if description is None:
+        log(f'Generating a synthetic extraction of {file_count} files in {folder}')
+        writer = ExtractionWriter(root, file_count, seed)
+        writer.generate()
+        description = {'generator_version': GENERATOR_VERSION, 'file_count': file_count, 'seed': seed,
+                       'files_written': writer.files_written, 'ios_version': IOS_VERSION,
+                       'counts': writer.counts, 'fixtures': writer.fixtures, 'forms': {'fs': 'fs'}}
+
+    # form paths are stored relative to the extraction folder, so that it can be moved
+    archive_names = {'tar': 'extraction.tar', 'gz': 'extraction.tar.gz', 'zip': 'extraction.zip'}
+    archives = {form: name for form, name in archive_names.items()
+                if form in forms and form not in description['forms']}
+    if archives:
+        log(f'Writing the synthetic extraction as {", ".join(archives)}')
+        write_archives(root, {form: os.path.join(folder, name + '.partial') for form, name in archives.items()})
+        for form, name in archives.items():
+            os.replace(os.path.join(folder, name + '.partial'), os.path.join(folder, name))
+            description['forms'][form] = name
+    if 'itunes' in forms and 'itunes' not in description['forms']:
+        log('Writing the synthetic extraction as an iTunes backup')
+        backup = os.path.join('itunes', hashlib.sha1(f'synthetic-{seed}'.encode()).hexdigest())
+        shutil.rmtree(os.path.join(folder, 'itunes'), ignore_errors=True)
+        write_itunes_backup(root, os.path.join(folder, backup))
+        description['forms']['itunes'] = backup
+
+    with open(description_path + '.tmp', 'w', encoding='utf8') as f:
+        json.dump(description, f, indent=1)
+    os.replace(description_path + '.tmp', description_path)
+    description['folder'] = folder
+    description['forms'] = {form: os.path.join(folder, path) for form, path in description['forms'].items()}
+    return description
+
+
+sms_schema = '''
+CREATE TABLE handle (ROWID INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE, id TEXT NOT NULL, country TEXT,
+    service TEXT NOT NULL, uncanonicalized_id TEXT, person_centric_id TEXT);
+CREATE TABLE chat (ROWID INTEGER PRIMARY KEY AUTOINCREMENT, guid TEXT UNIQUE NOT NULL, style INTEGER, state INTEGER,
+    account_id TEXT, properties BLOB, chat_identifier TEXT, service_name TEXT, room_name TEXT, account_login TEXT,
+    is_archived INTEGER DEFAULT 0, last_addressed_handle TEXT, display_name TEXT, group_id TEXT,
+    is_filtered INTEGER DEFAULT 0, successful_query INTEGER);
+CREATE TABLE chat_handle_join (chat_id INTEGER REFERENCES chat (ROWID) ON DELETE CASCADE,
+    handle_id INTEGER REFERENCES handle (ROWID) ON DELETE CASCADE, UNIQUE(chat_id, handle_id));
+CREATE TABLE message (ROWID INTEGER PRIMARY KEY AUTOINCREMENT, guid TEXT UNIQUE NOT NULL, text TEXT,
+    handle_id INTEGER DEFAULT 0, service TEXT, account TEXT, date INTEGER, date_read INTEGER,
+    is_delivered INTEGER DEFAULT 0, is_from_me INTEGER DEFAULT 0, is_read INTEGER DEFAULT 0,
+    is_sent INTEGER DEFAULT 0, is_audio_message INTEGER DEFAULT 0, cache_has_attachments INTEGER DEFAULT 0);
+CREATE TABLE chat_message_join (chat_id INTEGER REFERENCES chat (ROWID) ON DELETE CASCADE,
+    message_id INTEGER REFERENCES message (ROWID) ON DELETE CASCADE, message_date INTEGER DEFAULT 0,
+    PRIMARY KEY (chat_id, message_id));
+CREATE TABLE attachment (ROWID INTEGER PRIMARY KEY AUTOINCREMENT, guid TEXT UNIQUE NOT NULL,
+    created_date INTEGER DEFAULT 0, filename TEXT, uti TEXT, mime_type TEXT, transfer_state INTEGER DEFAULT 0,
+    is_outgoing INTEGER DEFAULT 0, transfer_name TEXT, total_bytes INTEGER DEFAULT 0);
+CREATE TABLE message_attachment_join (message_id INTEGER REFERENCES message (ROWID) ON DELETE CASCADE,
+    attachment_id INTEGER REFERENCES attachment (ROWID) ON DELETE CASCADE, UNIQUE(message_id, attachment_id));
+CREATE TABLE deleted_messages (ROWID INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE, guid TEXT NOT NULL);
+CREATE INDEX chat_message_join_idx_message_id_only ON chat_message_join(message_id);
+CREATE INDEX message_attachment_join_idx_message_id ON message_attachment_join(message_id);
+CREATE INDEX message_idx_date ON message(date);
+'''
+
+knowledgec_streams = ('/app/inFocus', '/app/usage', '/app/activity', '/device/batteryPercentage',
+                      '/device/isPluggedIn', '/display/isBacklit', '/media/nowPlaying', '/settings/doNotDisturb')
+
+knowledgec_schema = '''
+CREATE TABLE ZSOURCE (Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER, ZUSERID INTEGER, ZBUNDLEID VARCHAR,
+    ZDEVICEID VARCHAR, ZGROUPID VARCHAR, ZITEMID VARCHAR, ZSOURCEID VARCHAR);
+CREATE TABLE ZSTRUCTUREDMETADATA (Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER,
+    Z_DKDEVICEISPLUGGEDINMETADATAKEY__ADAPTERISWIRELESS INTEGER, Z_DKNOWPLAYINGMETADATAKEY__ISAIRPLAYVIDEO INTEGER,
+    Z_DKNOWPLAYINGMETADATAKEY__OUTPUTDEVICEIDS BLOB, Z_DKNOWPLAYINGMETADATAKEY__PLAYING INTEGER,
+    Z_DKNOWPLAYINGMETADATAKEY__DURATION FLOAT, Z_DKNOWPLAYINGMETADATAKEY__ARTIST VARCHAR,
+    Z_DKNOWPLAYINGMETADATAKEY__ALBUM VARCHAR, Z_DKNOWPLAYINGMETADATAKEY__GENRE VARCHAR,
+    Z_DKNOWPLAYINGMETADATAKEY__TITLE VARCHAR, Z_DKAPPLICATIONACTIVITYMETADATAKEY__ACTIVITYTYPE VARCHAR);
+CREATE TABLE ZOBJECT (Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER, ZHASSTRUCTUREDMETADATA INTEGER,
+    ZVALUEINTEGER INTEGER, ZSTARTSECONDOFDAY INTEGER, ZSECONDSFROMGMT INTEGER, ZSOURCE INTEGER,
+    ZSTRUCTUREDMETADATA INTEGER, ZSTARTDATE TIMESTAMP, ZENDDATE TIMESTAMP, ZCREATIONDATE TIMESTAMP,
+    ZSTREAMNAME VARCHAR, ZVALUESTRING VARCHAR, ZUUID VARCHAR);
+CREATE INDEX ZOBJECT_ZSOURCE_INDEX ON ZOBJECT (ZSOURCE);
+CREATE INDEX ZOBJECT_ZSTRUCTUREDMETADATA_INDEX ON ZOBJECT (ZSTRUCTUREDMETADATA);
+CREATE INDEX Z_OBJECT_ZSTREAMNAME_ZSTARTDATE ON ZOBJECT (ZSTREAMNAME, ZSTARTDATE);
+'''
+
+photos_schema = '''
+CREATE TABLE ZASSET (Z_PK INTEGER PRIMARY KEY, ZUUID VARCHAR, ZFILENAME VARCHAR, ZDIRECTORY VARCHAR,
+    ZDATECREATED TIMESTAMP, ZMODIFICATIONDATE TIMESTAMP, ZADDEDDATE TIMESTAMP, ZKIND INTEGER, ZKINDSUBTYPE INTEGER,
+    ZWIDTH INTEGER, ZHEIGHT INTEGER, ZLATITUDE FLOAT, ZLONGITUDE FLOAT, ZTRASHEDSTATE INTEGER, ZHIDDEN INTEGER,
+    ZFAVORITE INTEGER, ZADDITIONALATTRIBUTES INTEGER, ZMASTER INTEGER, ZSAVEDASSETTYPE INTEGER,
+    ZVISIBILITYSTATE INTEGER, ZAVALANCHEPICKTYPE INTEGER);
+CREATE TABLE ZADDITIONALASSETATTRIBUTES (Z_PK INTEGER PRIMARY KEY, ZASSET INTEGER, ZORIGINALFILENAME VARCHAR,
+    ZORIGINALFILESIZE INTEGER, ZTIMEZONENAME VARCHAR, ZEXIFTIMESTAMPSTRING VARCHAR, ZSYNDICATIONIDENTIFIER VARCHAR,
+    ZMASTERFINGERPRINT VARCHAR);
+CREATE TABLE ZCLOUDMASTER (Z_PK INTEGER PRIMARY KEY, ZORIGINALFILENAME VARCHAR, ZIMPORTSESSIONID VARCHAR,
+    ZCLOUDMASTERGUID VARCHAR, ZCREATIONDATE TIMESTAMP);
+CREATE TABLE ZINTERNALRESOURCE (Z_PK INTEGER PRIMARY KEY, ZASSET INTEGER, ZRESOURCETYPE INTEGER,
+    ZTRASHEDSTATE INTEGER, ZDATALENGTH INTEGER, ZLOCALAVAILABILITY INTEGER);
+CREATE TABLE ZGENERICALBUM (Z_PK INTEGER PRIMARY KEY, ZKIND INTEGER, ZTITLE VARCHAR, ZTRASHEDSTATE INTEGER,
+    ZUUID VARCHAR, ZCREATIONDATE TIMESTAMP, ZCACHEDCOUNT INTEGER, ZPARENTFOLDER INTEGER);
+CREATE TABLE Z_28ASSETS (Z_28ALBUMS INTEGER, Z_3ASSETS INTEGER, Z_FOK_3ASSETS INTEGER,
+    PRIMARY KEY (Z_28ALBUMS, Z_3ASSETS));
+CREATE INDEX ZASSET_ZADDITIONALATTRIBUTES_INDEX ON ZASSET (ZADDITIONALATTRIBUTES);
+'''
@@ -1,18 +1,31 @@
 import json
 import argparse
+import cProfile
+import csv
 import io
+import multiprocessing
 import pytz
 import os.path
 import typing
 import plugin_loader
+import scripts.artifacts.artGlobals
 import scripts.report as report
 import traceback
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from scripts.search_files import *
 from scripts.ilapfuncs import *
+from scripts.run_manifest import RunManifest, get_input_fingerprint, get_outputs_journal_path
 from scripts.version_info import ileapp_version
 from time import process_time, gmtime, strftime, perf_counter
 
+# optional, not available on Windows
+try:
+    import resource
+except ImportError:
+    resource = None
+
 def validate_args(args):
     if args.artifact_paths or args.create_profile_casedata:
         return  # Skip further validation if --artifact_paths is used
@@ -41,6 +54,21 @@ def validate_args(args):
         timezone = pytz.timezone(args.timezone)
     except pytz.UnknownTimeZoneError:
       raise argparse.ArgumentError(None, 'Unknown timezone! Run the program again.')
+
+    if args.workers < 1:
+        raise argparse.ArgumentError(None, 'Number of workers must be at least 1! Run the program again.')
+
+    if args.max_temp_size is not None and args.max_temp_size < 1:
+        raise argparse.ArgumentError(None, 'Maximum temp folder size must be at least 1 MB! Run the program again.')
+
+    if args.resume and not os.path.isdir(args.resume):
+        raise argparse.ArgumentError(None, 'Report folder to resume does not exist! Run the program again.')
+
+    if args.paged_tables is not None and args.paged_tables < 1:
+        raise argparse.ArgumentError(None, 'Number of rows for paged tables must be at least 1! Run the program again.')
+
+    if args.parquet and pyarrow is None:
+        raise argparse.ArgumentError(None, 'Parquet export requires pyarrow (pip install pyarrow)! Run the program again.')
         
 
 def create_profile(plugins, path):
@@ -142,7 +170,7 @@ def main():
     parser.add_argument('-o', '--output_path', required=False, action="store",
                         help='Path to base output folder (this must exist)')
     parser.add_argument('-i', '--input_path', required=False, action="store", help='Path to input file/folder')
-    parser.add_argument('-tz', '--timezone', required=False, action="store", default='UTC', type=str, help="Timezone name (e.g., 'America/New_York')")
+    parser.add_argument('-tz', '--timezone', required=False, action="store", type=str, help="Timezone name (e.g., 'America/New_York'), UTC by default")
     parser.add_argument('-w', '--wrap_text', required=False, action="store_false", default=True,
                         help='Do not wrap text for output of data files')
     parser.add_argument('-m', '--load_profile', required=False, action="store", help="Path to iLEAPP Profile file (.ilprofile).")
@@ -153,6 +181,34 @@ def main():
     parser.add_argument('-p', '--artifact_paths', required=False, action="store_true",
                         help=("Generate a text file list of artifact paths. "
                               "This argument is meant to be used alone, without any other arguments."))
+    parser.add_argument('--itunes_password', required=False, action="store",
+                        help=("Password of an encrypted iTunes backup. Its files are decrypted to the temp folder "
+                              "when an artifact needs them. The password is not saved in the report."))
+    parser.add_argument('--workers', required=False, action="store", default=1, type=int,
+                        help=("Number of worker processes used to parse artifacts in parallel (default: 1). "
+                              "The lastbuild artifact is always parsed first, before any other artifact."))
+    parser.add_argument('--max_temp_size', required=False, action="store", type=int,
+                        help=("For tar, gz, zip and itunes inputs, maximum size in MB of the files extracted to the "
+                              "temp folder. Least recently used files are deleted when it is reached, so report "
+                              "pages linking to them may not find them. No limit by default."))
+    parser.add_argument('--parquet', required=False, action="store_true",
+                        help=("Also export artifact tables as Parquet files with typed columns in the "
+                              "_Parquet Exports folder. Requires pyarrow."))
+    parser.add_argument('--paged_tables', required=False, action="store", type=int,
+                        help=("HTML report tables with more rows than this number load their rows page by page from "
+                              "data files in the _Table Data folder, so that huge tables can be opened in a browser. "
+                              "By default all rows are written in the report pages."))
+    parser.add_argument('--thumbnails', required=False, action="store", choices=['webp', 'jpeg'],
+                        help=("Show the images decoded from KTX files (app snapshots) as downscaled thumbnails of "
+                              "this format in the report pages, linking to the full size PNG images."))
+    parser.add_argument('--resume', required=False, action="store", metavar='REPORT_FOLDER',
+                        help=("Resume an interrupted run in its report folder, or update a report after upgrading "
+                              "iLEAPP. Artifacts that were parsed completely with the same plugin code and input "
+                              "files are skipped, the others are parsed again and the report is generated again. "
+                              "The input type, input path and timezone of the report's run are used unless given."))
+    parser.add_argument('--profile-plugins', required=False, action="store_true",
+                        help=("Profile each artifact with cProfile and save the stats (pstats format) in the "
+                              "Script Logs/Plugin Profiles folder."))
 
     loader = plugin_loader.PluginLoader()
     available_plugins = list(loader.plugins)
@@ -172,6 +228,18 @@ def main():
 
     args = parser.parse_args()
 
+    if args.resume:
+        args.resume = os.path.abspath(args.resume)
+        try:
+            settings = RunManifest.load(args.resume).settings
+        except ValueError as ex:
+            parser.error(str(ex))
+        args.t = args.t or settings.get('extraction_type')
+        args.input_path = args.input_path or settings.get('input_path')
+        args.timezone = args.timezone or settings.get('timezone')
+        args.output_path = os.path.dirname(args.resume)
+    args.timezone = args.timezone or 'UTC'
+
     try:
         validate_args(args)
     except argparse.ArgumentError as e:
@@ -284,16 +352,244 @@ def main():
         if input_path[1] == ':' and extracttype =='fs': input_path = '\\\\?\\' + input_path.replace('/', '\\')
         if output_path[1] == ':': output_path = '\\\\?\\' + output_path.replace('/', '\\')
 
-    out_params = OutputParameters(output_path)
+    out_params = OutputParameters(output_path, args.resume)
+    OutputParameters.parquet_export = args.parquet
+    OutputParameters.paged_table_rows = args.paged_tables
+    OutputParameters.image_thumbnails = args.thumbnails
 
     selected_plugins = plugins_parsed_first + selected_plugins
     
-    crunch_artifacts(selected_plugins, extracttype, input_path, out_params, wrap_text, loader, casedata, time_offset, profile_filename)
+    max_temp_size = args.max_temp_size * 1024 * 1024 if args.max_temp_size else None
+    crunch_artifacts(selected_plugins, extracttype, input_path, out_params, wrap_text, loader, casedata, time_offset,
+                     profile_filename, args.workers, max_temp_size, bool(args.resume), args.profile_plugins,
+                     args.itunes_password)
+
+
+def get_search_patterns(plugin):
+    '''Returns the list of search patterns of a plugin'''
+    if isinstance(plugin.search, list) or isinstance(plugin.search, tuple):
+        return list(plugin.search)
+    return [plugin.search]
+
+
+def search_plugin_files(plugin, search_results, seeker, log):
+    '''Gets the files found for all search patterns of a plugin from the results of seeker.search_many()
+       and logs them, with their path in the input if it is named differently. Returns the list of files found'''
+    files_found = []
+    log.write(f'<b>For {plugin.name} module</b>')
+    for artifact_search_regex in get_search_patterns(plugin):
+        found = search_results[artifact_search_regex]
+        if not found:
+            log.write(f'<ul><li>No file found for regex <i>{artifact_search_regex}</i></li></ul>')
+        else:
+            log.write(f'<ul><li>{len(found)} {"files" if len(found) > 1 else "file"} for regex <i>{artifact_search_regex}</i> located at:')
+            for pathh in found:
+                source_path = seeker.get_source_path(pathh)
+                if pathh.startswith('\\\\?\\'):
+                    pathh = pathh[4:]
+                if source_path not in (pathh, '\\\\?\\' + pathh):
+                    pathh = f'{pathh} ({source_path})'  # eg: the domain and path of an iTunes backup file
+                log.write(f'<ul><li>{pathh}</li></ul>')
+            log.write(f'</li></ul>')
+            files_found.extend(found)
+    return files_found
+
+
+def get_category_folder(plugin, report_folder_base):
+    '''Creates the report folder of the plugin category if needed. Returns None if it cannot be created'''
+    category_folder = os.path.join(report_folder_base, plugin.category)
+    if not os.path.exists(category_folder):
+        try:
+            os.mkdir(category_folder)
+        except (FileExistsError, FileNotFoundError) as ex:
+            logfunc('Error creating {} report directory at path {}'.format(plugin.name, category_folder))
+            logfunc('Error was {}'.format(str(ex)))
+            return None
+    return category_folder
+
+
+class PluginPerf:
+    '''Measures the resources used by an artifact in the process that parses it'''
+    def __init__(self, plugin, files_found, seeker):
+        self.plugin = plugin
+        self.files_found = files_found
+        self.seeker = seeker
+        get_output_row_counts(reset=True)
+        self._sql_time = get_sqlite_query_time()
+        self._peak_rss = self.get_peak_rss()
+        self._bytes_read = self.get_bytes_read()
+        self._cpu_time = process_time()
+        self._wall_time = perf_counter()
+
+    @staticmethod
+    def get_peak_rss():
+        '''Returns the peak resident set size of this process in bytes, None if it is not available'''
+        if resource is None:
+            return None
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+    @staticmethod
+    def get_bytes_read():
+        '''Returns the bytes read by this process (Linux only), None if it is not available'''
+        try:
+            with open('/proc/self/io', 'r') as io_file:
+                for line in io_file:
+                    if line.startswith('rchar:'):
+                        return int(line.split()[1])
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def stop(self, completed):
+        '''Returns the performance record of the artifact, a dictionary'''
+        wall_time = perf_counter() - self._wall_time
+        cpu_time = process_time() - self._cpu_time
+        peak_rss = self.get_peak_rss()
+        bytes_read = self.get_bytes_read()
+        sql_queries, sql_time = get_sqlite_query_time()
+        input_bytes = 0
+        for path in self.files_found:
+            info = self.seeker.get_source_info(path)
+            if info:
+                input_bytes += info[0]
+        return {
+            'name': self.plugin.name,
+            'module': self.plugin.module_name,
+            'category': self.plugin.category,
+            'completed': completed,
+            'wall_seconds': round(wall_time, 3),
+            'cpu_seconds': round(cpu_time, 3),
+            # the peak of the process only grows, this is how much the artifact raised it
+            'peak_rss_delta_bytes': peak_rss - self._peak_rss if peak_rss is not None else None,
+            'files_matched': len(self.files_found),
+            'input_bytes': input_bytes,
+            'bytes_read': bytes_read - self._bytes_read if bytes_read is not None else None,
+            'sql_queries': sql_queries - self._sql_time[0],
+            'sql_seconds': round(sql_time - self._sql_time[1], 3),
+            'rows': get_output_row_counts(reset=True),
+        }
+
+
+def run_plugin(plugin, files_found, category_folder, seeker, wrap_text, time_offset, profile_folder=None):
+    '''Executes the plugin on the files found, profiled with cProfile if profile_folder is given.
+       Returns whether it completed without errors and its performance record (see PluginPerf)'''
+    timeline_writer.module = plugin.name
+    start_report_outputs(get_outputs_journal_path(os.path.dirname(category_folder), plugin.name))
+    profiler = cProfile.Profile() if profile_folder else None
+    perf = PluginPerf(plugin, files_found, seeker)
+    completed = True
+    try:
+        if profiler:
+            profiler.runcall(plugin.method, files_found, category_folder, seeker, wrap_text, time_offset)
+        else:
+            plugin.method(files_found, category_folder, seeker, wrap_text, time_offset)
+    except Exception as ex:
+        logfunc('Reading {} artifact had errors!'.format(plugin.name))
+        logfunc('Error was {}'.format(str(ex)))
+        logfunc('Exception Traceback: {}'.format(traceback.format_exc()))
+        completed = False
+    release_sqlite_dbs()
+    if profiler:
+        os.makedirs(profile_folder, exist_ok=True)
+        profiler.dump_stats(os.path.join(profile_folder, sanitize_file_name(plugin.name) + '.pstats'))
+    return completed, perf.stop(completed)
+
+
+def write_plugin_perf(log_folder, perf_records, workers, resume=False, top=10):
+    '''Logs the artifacts that took the most time and writes the performance records of all of them to perf.json.
+       When resuming a run, the records of the artifacts that were not parsed again are kept'''
+    perf_path = os.path.join(log_folder, 'perf.json')
+    records = {}
+    if resume and os.path.exists(perf_path):
+        try:
+            with open(perf_path, 'r', encoding='utf8') as perf_file:
+                records = {record['name']: record for record in json.load(perf_file)['plugins']}
+        except (OSError, ValueError, KeyError, TypeError):
+            records = {}
+    records.update(perf_records)
+    records = sorted(records.values(), key=lambda record: record['wall_seconds'], reverse=True)
+    if perf_records:
+        logfunc('')
+        logfunc(f'Artifact parsing time, top {top}:')
+        for record in sorted(perf_records.values(), key=lambda record: record['wall_seconds'], reverse=True)[:top]:
+            logfunc(f"{record['wall_seconds']:10.2f}s  {record['name']} [{record['module']}]")
+    with open(perf_path, 'w', encoding='utf8') as perf_file:
+        json.dump({'ileapp_version': ileapp_version, 'workers': workers, 'plugins': records}, perf_file, indent=1)
+
+
+def write_sqlite_query_stats(log_folder, top=10):
+    '''Logs the databases that took the most SQLite time, and writes the time of every query to a TSV file'''
+    stats = get_sqlite_query_stats()
+    if not stats:
+        return
+    db_times = {}
+    for (db_path, sql), (executions, seconds) in stats.items():
+        db_times[db_path] = db_times.get(db_path, 0) + seconds
+    logfunc('')
+    logfunc(f'SQLite query time, top {top} databases:')
+    for db_path, seconds in sorted(db_times.items(), key=lambda item: item[1], reverse=True)[:top]:
+        logfunc(f'{seconds:10.2f}s  {db_path}')
+    with open(os.path.join(log_folder, 'SQLite Query Times.tsv'), 'w', encoding='utf8', newline='') as tsvfile:
+        tsv_writer = csv.writer(tsvfile, delimiter='\t')
+        tsv_writer.writerow(('Seconds', 'Executions', 'Database', 'Query'))
+        for (db_path, sql), (executions, seconds) in sorted(stats.items(), key=lambda item: item[1][1], reverse=True):
+            tsv_writer.writerow((f'{seconds:.3f}', executions, db_path, ' '.join(sql.split())))
+
+
+def skip_parsed_plugin(plugin, fingerprint, manifest):
+    '''Returns True if plugin was parsed completely in an earlier run of a resumed report, with the same code and
+       input files. Otherwise the report files it wrote in that run are deleted, so that it can be parsed again'''
+    if manifest.is_up_to_date(plugin, fingerprint):
+        logfunc('{} [{}] artifact already parsed, skipped'.format(plugin.name, plugin.module_name))
+        if plugin.name == 'lastbuild' and manifest.data['ios_version'] is not None:
+            scripts.artifacts.artGlobals.versionf = manifest.data['ios_version']
+        return True
+    manifest.discard_outputs(plugin.name)
+    return False
+
+
+# State of a worker process, set once by init_plugin_worker()
+_worker_loader = None
+_worker_seeker = None
+
+
+def init_plugin_worker(seeker, screen_output_file_path, devinfo_file_path, parquet_export, paged_table_rows,
+                       image_thumbnails, ios_version, output_lock, working_copy_lock):
+    '''Initializes a worker process so that it parses artifacts like the main process does'''
+    global _worker_loader, _worker_seeker
+    GuiWindow.window_handle = None  # only the main process may update the GUI
+    OutputParameters.screen_output_file_path = screen_output_file_path
+    OutputParameters.screen_output_file_path_devinfo = devinfo_file_path
+    OutputParameters.parquet_export = parquet_export
+    OutputParameters.paged_table_rows = paged_table_rows
+    OutputParameters.image_thumbnails = image_thumbnails
+    scripts.artifacts.artGlobals.versionf = ios_version
+    set_output_lock(output_lock)
+    set_working_copy_lock(working_copy_lock)
+    _worker_seeker = seeker
+    _worker_loader = plugin_loader.PluginLoader()
+
+
+def run_plugin_in_worker(plugin_name, files_found, category_folder, wrap_text, time_offset, profile_folder=None):
+    '''Worker process entry point, plugins are looked up by name as their functions cannot be pickled.
+       Returns whether the plugin completed, the SQLite query stats of the worker since the last call, the report
+       files the plugin wrote and its performance record'''
+    try:
+        get_report_outputs(reset=True)
+        completed, perf = run_plugin(_worker_loader[plugin_name], files_found, category_folder, _worker_seeker,
+                                     wrap_text, time_offset, profile_folder)
+        return completed, get_sqlite_query_stats(reset=True), get_report_outputs(reset=True), perf
+    finally:
+        # the worker may not get another plugin before the pool shuts down
+        timeline_writer.close()
+        parquet_writer.close()
 
 
 def crunch_artifacts(
         plugins: typing.Sequence[plugin_loader.PluginSpec], extracttype, input_path, out_params, wrap_text,
-        loader: plugin_loader.PluginLoader, casedata, time_offset, profile_filename):
+        loader: plugin_loader.PluginLoader, casedata, time_offset, profile_filename, workers=1, max_temp_size=None,
+        resume=False, profile_plugins=False, itunes_password=None):
     start = process_time()
     start_wall = perf_counter()
  
@@ -312,13 +608,13 @@ def crunch_artifacts(
             seeker = FileSeekerDir(input_path)
 
         elif extracttype in ('tar', 'gz'):
-            seeker = FileSeekerTar(input_path, out_params.temp_folder)
+            seeker = FileSeekerTar(input_path, out_params.temp_folder, max_temp_size)
 
         elif extracttype == 'zip':
-            seeker = FileSeekerZip(input_path, out_params.temp_folder)
+            seeker = FileSeekerZip(input_path, out_params.temp_folder, max_temp_size)
 
         elif extracttype == 'itunes':
-            seeker = FileSeekerItunes(input_path, out_params.temp_folder)
+            seeker = FileSeekerItunes(input_path, out_params.temp_folder, max_temp_size, itunes_password)
 
         else:
             logfunc('Error on argument -o (input type)')
@@ -339,68 +635,150 @@ def crunch_artifacts(
     logfunc(f'File/Directory selected: {input_path}')
     logfunc('\n--------------------------------------------------------------------------------------')
 
-    log = open(os.path.join(out_params.report_folder_base, 'Script Logs', 'ProcessedFilesLog.html'), 'w+', encoding='utf8')
+    # The run manifest records the artifacts parsed so far, a resumed run skips those that are up to date
+    if resume:
+        try:
+            manifest = RunManifest.load(out_params.report_folder_base)
+        except ValueError as ex:
+            logfunc(str(ex))
+            return False
+        manifest.reopen_report()
+        logfunc(f'Resuming the run of {out_params.report_folder_base}')
+    else:
+        manifest = RunManifest(out_params.report_folder_base, {
+            'extraction_type': extracttype, 'input_path': input_path, 'timezone': time_offset, 'wrap_text': wrap_text})
+        manifest.save()
+
+    log = open(os.path.join(out_params.report_folder_base, 'Script Logs', 'ProcessedFilesLog.html'), 'a' if resume else 'w+', encoding='utf8')
     log.write(f'Extraction/Path selected: {input_path}<br><br>')
     log.write(f'Timezone selected: {time_offset}<br><br>')
     
     parsed_modules = 0
+    perf_records = {}  # name -> performance record of the artifacts parsed
+    profile_folder = os.path.join(out_params.report_folder_base, 'Script Logs', 'Plugin Profiles') if profile_plugins else None
     # Special processing for iTunesBackup Info.plist as it is a seperate entity, not part of the Manifest.db. Seeker won't find it
     if extracttype == 'itunes':
         info_plist_path = os.path.join(input_path, 'Info.plist')
         if os.path.exists(info_plist_path):
             # process_artifact([info_plist_path], 'iTunesBackupInfo', 'Device Info', seeker, out_params.report_folder_base)
             #plugin.method([info_plist_path], out_params.report_folder_base, seeker, wrap_text)
-            loader["iTunesBackupInfo"].method([info_plist_path], out_params.report_folder_base, seeker, wrap_text, time_offset)
+            plugin = loader["iTunesBackupInfo"]
+            fingerprint = get_input_fingerprint(seeker, [info_plist_path])
+            if manifest.is_up_to_date(plugin, fingerprint):
+                logfunc(f'{plugin.name} [{plugin.module_name}] artifact already parsed, skipped')
+            else:
+                manifest.discard_outputs(plugin.name)
+                get_report_outputs(reset=True)
+                plugin.method([info_plist_path], out_params.report_folder_base, seeker, wrap_text, time_offset)
+                timeline_writer.flush()
+                manifest.record(plugin, fingerprint, True, get_report_outputs(reset=True))
             #del search_list['lastBuild'] # removing lastBuild as this takes its place
             print([info_plist_path])  # TODO Remove special consideration for itunes? Merge into main search
         else:
             logfunc('Info.plist not found for iTunes Backup!')
             log.write('Info.plist not found for iTunes Backup!')
 
-    # Search for the files per the arguments
-    for plugin in plugins:
-        if isinstance(plugin.search, list) or isinstance(plugin.search, tuple):
-            search_regexes = plugin.search
-        else:
-            search_regexes = [plugin.search]
+    # lastbuild sets the iOS version read by many other artifacts, so it must complete before the others start
+    barrier_plugins = [plugin for plugin in plugins if plugin.name == 'lastbuild']
+    other_plugins = [plugin for plugin in plugins if plugin.name != 'lastbuild']
+    if workers == 1:
+        barrier_plugins, other_plugins = list(plugins), []
+
+    # Search for the files of all plugins at once, so the seeker goes through its files only one time
+    all_search_patterns = list(dict.fromkeys(pattern for plugin in plugins for pattern in get_search_patterns(plugin)))
+    logfunc(f'Searching files for {len(all_search_patterns)} search patterns...')
+    search_results = seeker.search_many(all_search_patterns)
+    logfunc('File search complete')
+
+    for plugin in barrier_plugins:
         parsed_modules += 1
         GuiWindow.SetProgressBar(parsed_modules, len(plugins))
-        files_found = []
-        log.write(f'<b>For {plugin.name} module</b>')
-        for artifact_search_regex in search_regexes:
-            found = seeker.search(artifact_search_regex)
-            if not found:
-                log.write(f'<ul><li>No file found for regex <i>{artifact_search_regex}</i></li></ul>')
-            else:
-                log.write(f'<ul><li>{len(found)} {"files" if len(found) > 1 else "file"} for regex <i>{artifact_search_regex}</i> located at:')
-                for pathh in found:
-                    if pathh.startswith('\\\\?\\'):
-                        pathh = pathh[4:]
-                    log.write(f'<ul><li>{pathh}</li></ul>')
-                log.write(f'</li></ul>')
-                files_found.extend(found)
+        files_found = search_plugin_files(plugin, search_results, seeker, log)
+        fingerprint = get_input_fingerprint(seeker, files_found)
+        if skip_parsed_plugin(plugin, fingerprint, manifest):
+            continue
         if files_found:
             logfunc()
             logfunc('{} [{}] artifact started'.format(plugin.name, plugin.module_name))
-            category_folder = os.path.join(out_params.report_folder_base, plugin.category)
-            if not os.path.exists(category_folder):
-                try:
-                    os.mkdir(category_folder)
-                except (FileExistsError, FileNotFoundError) as ex:
-                    logfunc('Error creating {} report directory at path {}'.format(plugin.name, category_folder))
-                    logfunc('Error was {}'.format(str(ex)))
-                    continue  # cannot do work
-            try:
-                plugin.method(files_found, category_folder, seeker, wrap_text, time_offset)
-            except Exception as ex:
-                logfunc('Reading {} artifact had errors!'.format(plugin.name))
-                logfunc('Error was {}'.format(str(ex)))
-                logfunc('Exception Traceback: {}'.format(traceback.format_exc()))
+            category_folder = get_category_folder(plugin, out_params.report_folder_base)
+            if category_folder is None:
+                continue  # cannot do work
+            files_found = seeker.materialize(files_found)
+            get_report_outputs(reset=True)
+            completed, perf_records[plugin.name] = run_plugin(plugin, files_found, category_folder, seeker, wrap_text,
+                                                              time_offset, profile_folder)
+            # the rows of the artifact are written before it is recorded as parsed, as a worker does when it returns
+            timeline_writer.flush()
+            parquet_writer.close()
+            if plugin.name == 'lastbuild':
+                manifest.data['ios_version'] = scripts.artifacts.artGlobals.versionf
+            manifest.record(plugin, fingerprint, completed, get_report_outputs(reset=True))
+            if not completed:
                 continue  # nope
 
             logfunc('{} [{}] artifact completed'.format(plugin.name, plugin.module_name))
 
+    if other_plugins:
+        logfunc(f'Parsing artifacts with {workers} worker processes')
+        # spawn is used on all platforms, so that no open file handle is shared with the workers
+        mp_context = multiprocessing.get_context('spawn')
+        output_lock = mp_context.RLock()
+        set_output_lock(output_lock)
+        working_copy_lock = mp_context.Lock()
+        init_args = (seeker, OutputParameters.screen_output_file_path, OutputParameters.screen_output_file_path_devinfo,
+                     OutputParameters.parquet_export, OutputParameters.paged_table_rows, OutputParameters.image_thumbnails,
+                     scripts.artifacts.artGlobals.versionf, output_lock, working_copy_lock)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=init_plugin_worker, initargs=init_args) as executor:
+            pending = {}
+            pinned = {}  # future -> files of a plugin, kept in the temp folder until its worker is done with them
+            for plugin in other_plugins:
+                files_found = search_plugin_files(plugin, search_results, seeker, log)
+                fingerprint = get_input_fingerprint(seeker, files_found)
+                if skip_parsed_plugin(plugin, fingerprint, manifest):
+                    parsed_modules += 1
+                    GuiWindow.SetProgressBar(parsed_modules, len(plugins))
+                    continue
+                category_folder = get_category_folder(plugin, out_params.report_folder_base) if files_found else None
+                if category_folder is None:
+                    parsed_modules += 1
+                    GuiWindow.SetProgressBar(parsed_modules, len(plugins))
+                    continue
+                logfunc()
+                logfunc('{} [{}] artifact started'.format(plugin.name, plugin.module_name))
+                for future in [future for future in pinned if future.done()]:
+                    seeker.unpin(pinned.pop(future))
+                # files are extracted here, so that each is only extracted once for all workers
+                files_found = seeker.materialize(files_found)
+                seeker.pin(files_found)
+                future = executor.submit(run_plugin_in_worker, plugin.name, files_found, category_folder, wrap_text,
+                                         time_offset, profile_folder)
+                pending[future] = plugin, fingerprint
+                pinned[future] = files_found
+
+            for future in as_completed(pending):
+                plugin, fingerprint = pending[future]
+                seeker.unpin(pinned.pop(future, ()))
+                parsed_modules += 1
+                GuiWindow.SetProgressBar(parsed_modules, len(plugins))
+                try:
+                    completed, sqlite_query_stats, outputs, perf_records[plugin.name] = future.result()
+                    add_sqlite_query_stats(sqlite_query_stats)
+                    manifest.record(plugin, fingerprint, completed, outputs)
+                except Exception as ex:  # worker process died, the plugin could not report its own error
+                    logfunc('Reading {} artifact had errors!'.format(plugin.name))
+                    logfunc('Error was {}'.format(str(ex)))
+                    continue
+                if completed:
+                    logfunc('{} [{}] artifact completed'.format(plugin.name, plugin.module_name))
+        set_output_lock(None)
+
+    timeline_writer.close()
+    parquet_writer.close()
+    close_sqlite_dbs()
     log.close()
+    write_sqlite_query_stats(os.path.join(out_params.report_folder_base, 'Script Logs'))
+    write_plugin_perf(os.path.join(out_params.report_folder_base, 'Script Logs'), perf_records, workers, resume)
 
     logfunc('')
     logfunc('Processes completed.')
@@ -424,11 +802,13 @@ def crunch_artifacts(
     
         
     report.generate_report(out_params.report_folder_base, run_time_secs, run_time_HMS, extracttype, input_path, casedata)
+    manifest.set_report_finalized()
     logfunc('Report generation Completed.')
     logfunc('')
     logfunc(f'Report location: {out_params.report_folder_base}')
     return True
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
     
@@ -1,3 +1,5 @@
+import ast
+import json
 import pathlib
 import dataclasses
 import typing
@@ -7,6 +9,24 @@ import importlib.util
 # a bit long-winded to make compatible with PyInstaller
 PLUGINPATH = pathlib.Path(__file__).resolve().parent / pathlib.Path("scripts/artifacts")
 
+# The artifacts declared by each plugin are read from its source without importing it, and cached by file mtime and
+# size, so that plugin modules (and their dependencies) are only imported when a plugin is run
+MANIFEST_FORMAT_VERSION = 1
+MANIFEST_FILENAME = "plugin_manifest.json"
+
+_modules = {}  # plugin file path -> imported module
+
+
+def _import_plugin(path: pathlib.Path):
+    '''Imports (once) and returns the plugin module at path'''
+    mod = _modules.get(path)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _modules[path] = mod
+    return mod
+
 
 @dataclasses.dataclass(frozen=True)
 class PluginSpec:
@@ -14,7 +34,75 @@ class PluginSpec:
     module_name: str
     category: str
     search: str
-    method: typing.Callable  # todo define callable signature
+    function_name: str
+    path: pathlib.Path
+
+    @property
+    def method(self) -> typing.Callable:  # todo define callable signature
+        '''The artifact function, importing the plugin module on first use'''
+        return getattr(_import_plugin(self.path), self.function_name)
+
+
+def _read_artifacts_from_source(source: str) -> typing.Optional[list]:
+    '''Returns [name, category, search, function name] for each artifact declared in the source of a plugin, [] if it
+       declares none, or None if they are not plain literals and the plugin has to be imported to read them'''
+    tree = ast.parse(source)
+    declarations = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id in ('__artifacts__', '__artifacts_v2__')):
+            if node.targets[0].id in declarations:
+                return None
+            declarations[node.targets[0].id] = node.value
+    if not declarations:
+        return []
+    # the declarations must not be changed anywhere else in the module
+    references = sum(1 for node in ast.walk(tree)
+                     if isinstance(node, ast.Name) and node.id in ('__artifacts__', '__artifacts_v2__'))
+    if references != len(declarations):
+        return None
+
+    version = 2 if '__artifacts_v2__' in declarations else 1
+    declaration = declarations['__artifacts_v2__' if version == 2 else '__artifacts__']
+    if not isinstance(declaration, ast.Dict) or None in declaration.keys:
+        return None
+    artifacts = []
+    try:
+        for key, value in zip(declaration.keys, declaration.values):
+            name = ast.literal_eval(key)
+            if version == 2:
+                if not isinstance(value, ast.Dict) or None in value.keys:
+                    return None
+                fields = {ast.literal_eval(k): v for k, v in zip(value.keys, value.values)}
+                category = ast.literal_eval(fields['category'])
+                search = ast.literal_eval(fields['paths'])
+                func_name = ast.literal_eval(fields['function'])
+            else:
+                if not isinstance(value, ast.Tuple) or len(value.elts) != 3 or not isinstance(value.elts[2], ast.Name):
+                    return None
+                category = ast.literal_eval(value.elts[0])
+                search = ast.literal_eval(value.elts[1])
+                func_name = value.elts[2].id
+            artifacts.append([name, category, search, func_name])
+    except (ValueError, KeyError, TypeError, SyntaxError):
+        return None
+    return artifacts
+
+
+def _read_artifacts_from_module(path: pathlib.Path) -> list:
+    '''Imports the plugin at path and returns [name, category, search, function name] for each of its artifacts'''
+    mod = _import_plugin(path)
+    mod_artifacts = getattr(mod, '__artifacts_v2__', None) or getattr(mod, '__artifacts__', None)
+    if mod_artifacts is None:
+        return []  # no artifacts defined in this plugin
+
+    version = 2 if '__artifacts_v2__' in dir(mod) else 1  # determine the version
+    artifacts = []
+    for name, artifact in mod_artifacts.items():
+        category, search, func = (
+            artifact.get('category'), artifact.get('paths'), artifact.get('function')) if version == 2 else artifact
+        artifacts.append([name, category, search, func if isinstance(func, str) else func.__name__])
+    return artifacts
 
 
 class PluginLoader:
@@ -32,23 +120,55 @@ class PluginLoader:
         loader.exec_module(mod)
         return mod
 
+    @property
+    def _manifest_path(self) -> pathlib.Path:
+        return self._plugin_path / "__pycache__" / MANIFEST_FILENAME
+
+    def _read_manifest(self) -> dict:
+        try:
+            with self._manifest_path.open("r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+            return {}
+        return manifest.get("plugins", {})
+
+    def _write_manifest(self, plugins: dict):
+        # like Python's bytecode cache, the manifest is not written if the plugin folder is read only
+        try:
+            self._manifest_path.parent.mkdir(exist_ok=True)
+            tmp_path = self._manifest_path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as manifest_file:
+                json.dump({"format_version": MANIFEST_FORMAT_VERSION, "plugins": plugins}, manifest_file)
+            tmp_path.replace(self._manifest_path)
+        except OSError:
+            pass
+
     def _load_plugins(self):
+        manifest = self._read_manifest()
+        updated_manifest = {}
         for py_file in self._plugin_path.glob("*.py"):
-            mod = PluginLoader.load_module_lazy(py_file)
-            mod_artifacts = getattr(mod, '__artifacts_v2__', None) or getattr(mod, '__artifacts__', None)
-            if mod_artifacts is None:
-                continue  # no artifacts defined in this plugin
+            stat = py_file.stat()
+            entry = manifest.get(py_file.name)
+            if entry is None or entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+                artifacts = _read_artifacts_from_source(py_file.read_text(encoding="utf-8"))
+                entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "artifacts": artifacts}
+            updated_manifest[py_file.name] = entry
 
-            version = 2 if '__artifacts_v2__' in dir(mod) else 1  # determine the version
+            artifacts = entry["artifacts"]
+            if artifacts is None:  # declared dynamically, the module has to be imported
+                artifacts = _read_artifacts_from_module(py_file)
 
-            for name, artifact in mod_artifacts.items():
-                category, search, func_name = (
-                artifact.get('category'), artifact.get('paths'), artifact.get('function')) if version == 2 else artifact
-                func = getattr(mod, func_name) if version == 2 and isinstance(func_name, str) else func_name
+            for name, category, search, func_name in artifacts:
                 if name in self._plugins:
                     raise KeyError("Duplicate plugin")
-                self._plugins[name] = PluginSpec(name, py_file.stem, category, search, func)
+                if isinstance(search, list):
+                    search = tuple(search)  # json has no tuples
+                self._plugins[name] = PluginSpec(name, py_file.stem, category, search, func_name, py_file)
 
+        if updated_manifest != manifest:
+            self._write_manifest(updated_manifest)
 
     @property
     def plugins(self) -> typing.Iterable[PluginSpec]:
@@ -62,4 +182,3 @@ class PluginLoader:
 
     def __len__(self):
         return len(self._plugins)
-
@@ -1,14 +1,21 @@
 import html
+import json
 import os
+from urllib.parse import quote
 from scripts.html_parts import *
-from scripts.ilapfuncs import is_platform_windows
+from scripts.ilapfuncs import add_report_output, count_output_rows, is_platform_windows, OutputParameters
 from scripts.version_info import ileapp_version
 
 class ArtifactHtmlReport:
+    # Rows per data file of a paged table, see write_artifact_data_table()
+    paged_table_chunk_rows = 5000
 
     def __init__(self, artifact_name, artifact_category=''):
         self.report_file = None
         self.report_file_path = ''
+        self.report_folder = ''
+        self.artifact_file_name = ''
+        self.paged_tables = 0
         self.script_code = ''
         self.artifact_name = artifact_name
         self.artifact_category = artifact_category # unused
@@ -19,11 +26,14 @@ class ArtifactHtmlReport:
 
     def start_artifact_report(self, report_folder, artifact_file_name, artifact_description=''):
         '''Creates the report HTML file and writes the artifact name as a heading'''
+        self.report_folder = report_folder
+        self.artifact_file_name = artifact_file_name
         self.report_file = open(os.path.join(report_folder, f'{artifact_file_name}.temphtml'), 'w', encoding='utf8')
+        add_report_output(self.report_file.name)
         self.report_file.write(page_header.format(f'iLEAPP - {self.artifact_name} report'))
         self.report_file.write(body_start.format(f'iLEAPP {ileapp_version}'))
         self.report_file.write(body_sidebar_setup)
-        self.report_file.write(body_sidebar_dynamic_data_placeholder) # placeholder for sidebar data
+        self.report_file.write(nav_bar_data_script + nav_bar_script) # sidebar data, shared by all pages
         self.report_file.write(body_sidebar_trailer)
         self.report_file.write(body_main_header)
         self.report_file.write(body_main_data_title.format(f'{self.artifact_name} report', artifact_description))
@@ -75,11 +85,15 @@ class ArtifactHtmlReport:
             table_id       : Specify an identifier string, which will be referenced in javascript
 
             html_no_escape  : if html_escape=True, list of columns not to escape
+
+            If OutputParameters.paged_table_rows is set and there are more rows than that, the rows are written to
+            data files in the _Table Data folder instead of the page, and the page loads them into a paged table.
         '''
         if (not self.report_file):
             raise ValueError('Output report file is closed/unavailable!')
 
         num_entries = len(data_list)
+        count_output_rows('html', num_entries)
         if write_total:
             self.write_minor_header(f'Total number of entries: {num_entries}', 'h6')
         if write_location:
@@ -96,33 +110,70 @@ class ArtifactHtmlReport:
 
         table_head = '<table id="{}" class="table table-striped table-bordered table-xsm" cellspacing="0" {}>' \
                      '<thead>'.format(table_id, (f'style="{table_style}"') if table_style else '')
+        paged = bool(OutputParameters.paged_table_rows) and num_entries > OutputParameters.paged_table_rows
+        if paged:
+            chunk_url = '/'.join(quote(part) for part in
+                                 ('_Table Data', self.artifact_file_name, f'table{self.paged_tables}_'))
+            table_head = table_head.replace(
+                ' class="table ', f' data-chunks="{self.paged_tables}" data-rows="{num_entries}" '
+                f'data-chunk-rows="{self.paged_table_chunk_rows}" data-chunk-url="{html.escape(chunk_url)}" '
+                'class="table table-paged ', 1)
         self.report_file.write(table_head)
         self.report_file.write(
             '<tr>' + ''.join(('<th class="th-sm">{}</th>'.format(html.escape(str(x))) for x in data_headers)) + '</tr>')
         self.report_file.write('</thead><tbody>')
 
-        if html_escape:
-            for row in data_list:
-                if html_no_escape:
-                    self.report_file.write('<tr>' + ''.join(('<td>{}</td>'.format(html.escape(
-                        str(x) if x not in [None, 'N/A'] else '')) if h not in html_no_escape else '<td>{}</td>'.format(
-                        str(x) if x not in [None, 'N/A'] else '') for x, h in zip(row, data_headers))) + '</tr>')
-                else:
-                    self.report_file.write('<tr>' + ''.join(
-                        ('<td>{}</td>'.format(html.escape(str(x) if x not in [None, 'N/A'] else '')) for x in
-                         row)) + '</tr>')
-        else:
+        if not paged:
             for row in data_list:
-                self.report_file.write('<tr>' + ''.join( ('<td>{}</td>'.format(str(x) if x not in [None, 'N/A'] else '') for x in row) ) + '</tr>')
-        
+                self.report_file.write('<tr>' + ''.join(
+                    '<td>{}</td>'.format(x) for x in self.get_row_cells(row, data_headers, html_escape, html_no_escape)) +
+                    '</tr>')
+
         self.report_file.write('</tbody>')
         if cols_repeated_at_bottom:
             self.report_file.write('<tfoot><tr>' + ''.join(
                 ('<th>{}</th>'.format(html.escape(str(x))) for x in data_headers)) + '</tr></tfoot>')
         self.report_file.write('</table>')
+        if paged:
+            self.write_paged_table_data(data_headers, data_list, html_escape, html_no_escape)
         if table_responsive:
             self.report_file.write("</div>")
 
+    @staticmethod
+    def get_row_cells(row, data_headers, html_escape, html_no_escape):
+        '''Returns the HTML content of the cells of a table row'''
+        if html_escape:
+            if html_no_escape:
+                return [html.escape(str(x) if x not in [None, 'N/A'] else '') if h not in html_no_escape else
+                        (str(x) if x not in [None, 'N/A'] else '') for x, h in zip(row, data_headers)]
+            return [html.escape(str(x) if x not in [None, 'N/A'] else '') for x in row]
+        return [str(x) if x not in [None, 'N/A'] else '' for x in row]
+
+    def write_paged_table_data(self, data_headers, data_list, html_escape, html_no_escape):
+        '''Writes the rows of a table as script files of paged_table_chunk_rows rows, which the page loads when it
+           shows their rows (see paged_table_script). Script files (rather than JSON) can be loaded from a report
+           opened as a local file'''
+        table_key = str(self.paged_tables)
+        self.paged_tables += 1
+        report_folder_base = os.path.dirname(self.report_folder.rstrip('/').rstrip('\\'))
+        data_folder = os.path.join(report_folder_base, '_Table Data', self.artifact_file_name)
+        os.makedirs(data_folder, exist_ok=True)
+        add_report_output(data_folder)
+
+        columns = len(data_headers)
+        if table_key == '0':
+            self.script_code += paged_table_script
+        for start in range(0, len(data_list), self.paged_table_chunk_rows):
+            rows = []
+            for row in data_list[start:start + self.paged_table_chunk_rows]:
+                cells = self.get_row_cells(row, data_headers, html_escape, html_no_escape)[:columns]
+                rows.append(cells + [''] * (columns - len(cells)))
+            number = start // self.paged_table_chunk_rows
+            with open(os.path.join(data_folder, f'table{table_key}_{number:05d}.js'), 'w', encoding='utf8') as chunk_file:
+                chunk_file.write(f'ileappTableChunk("{table_key}", {number}, ')
+                json.dump(rows, chunk_file, ensure_ascii=False, separators=(',', ':'))
+                chunk_file.write(');\n')
+
     def add_section_heading(self, heading, size='h2'):
         heading = html.escape(heading)
         data = '<div class="d-flex justify-content-between flex-wrap flex-md-nowrap align-items-center pt-3 pb-2 mb-3 border-bottom">' \
@@ -29,7 +29,8 @@ import uuid
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph10assetparsedfilesphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -46,7 +47,7 @@ def get_ph10assetparsedfilesphdapsql(files_found, report_folder, seeker, wrap_te
         logfunc("Unsupported ios version for PhotosData-Photos.sqlite assets have embedded files from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -170,7 +171,7 @@ def get_ph10assetparsedfilesphdapsql(files_found, report_folder, seeker, wrap_te
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -432,7 +433,7 @@ def get_ph10assetparsedfilesphdapsql(files_found, report_folder, seeker, wrap_te
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -792,7 +793,7 @@ def get_ph10assetparsedfilesphdapsql(files_found, report_folder, seeker, wrap_te
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1155,7 +1156,7 @@ def get_ph10assetparsedfilesphdapsql(files_found, report_folder, seeker, wrap_te
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1623,7 +1624,7 @@ def get_ph10assetparsedfilessyndpl(files_found, report_folder, seeker, wrap_text
         logfunc("Unsupported ios version for Syndication.photoslibrary-database-Photos.sqlite assets have embedded files from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1747,7 +1748,7 @@ def get_ph10assetparsedfilessyndpl(files_found, report_folder, seeker, wrap_text
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -2009,7 +2010,7 @@ def get_ph10assetparsedfilessyndpl(files_found, report_folder, seeker, wrap_text
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -2369,7 +2370,7 @@ def get_ph10assetparsedfilessyndpl(files_found, report_folder, seeker, wrap_text
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -2732,7 +2733,7 @@ def get_ph10assetparsedfilessyndpl(files_found, report_folder, seeker, wrap_text
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -27,7 +27,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph1assetbasicdataphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -45,7 +46,7 @@ def get_ph1assetbasicdataphdapsql(files_found, report_folder, seeker, wrap_text,
         logfunc("Unsupported version for PhotoData-Photos.sqlite basic asset data one record per zAsset-zPK from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -146,7 +147,7 @@ def get_ph1assetbasicdataphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -255,7 +256,7 @@ def get_ph1assetbasicdataphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -385,7 +386,7 @@ def get_ph1assetbasicdataphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -537,7 +538,7 @@ def get_ph1assetbasicdatasyndpl(files_found, report_folder, seeker, wrap_text, t
         logfunc("Unsupported version for Syndication.photoslibrary/database/Photos.sqlite basic asset data one record per zAsset-zPK iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -638,7 +639,7 @@ def get_ph1assetbasicdatasyndpl(files_found, report_folder, seeker, wrap_text, t
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -747,7 +748,7 @@ def get_ph1assetbasicdatasyndpl(files_found, report_folder, seeker, wrap_text, t
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -877,7 +878,7 @@ def get_ph1assetbasicdatasyndpl(files_found, report_folder, seeker, wrap_text, t
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
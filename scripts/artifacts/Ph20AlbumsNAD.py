@@ -30,7 +30,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph20albumrecordsnadphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -48,7 +49,7 @@ def get_ph20albumrecordsnadphdapsql(files_found, report_folder, seeker, wrap_tex
                 " from on iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -137,7 +138,7 @@ def get_ph20albumrecordsnadphdapsql(files_found, report_folder, seeker, wrap_tex
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -230,7 +231,7 @@ def get_ph20albumrecordsnadphdapsql(files_found, report_folder, seeker, wrap_tex
 
     elif version.parse(iosversion) >= version.parse("15"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -336,7 +337,7 @@ def get_ph20albumrecrodsnadsyndpl(files_found, report_folder, seeker, wrap_text,
                 " album records with no asset data on iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -427,7 +428,7 @@ def get_ph20albumrecrodsnadsyndpl(files_found, report_folder, seeker, wrap_text,
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -521,7 +522,7 @@ def get_ph20albumrecrodsnadsyndpl(files_found, report_folder, seeker, wrap_text,
         return
     elif version.parse(iosversion) >= version.parse("15"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -27,7 +27,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph21nonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -45,7 +46,7 @@ def get_ph21nonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_tex
                 " no asset data from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("12")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -264,7 +265,7 @@ def get_ph21nonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_tex
 
     elif (version.parse(iosversion) >= version.parse("12")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -496,7 +497,7 @@ def get_ph21nonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_tex
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -741,7 +742,7 @@ def get_ph21nonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_tex
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1001,7 +1002,7 @@ def get_ph21nonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_tex
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1261,7 +1262,7 @@ def get_ph21nonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_tex
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
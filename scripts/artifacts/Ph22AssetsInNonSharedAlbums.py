@@ -28,7 +28,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph22assetsinnonsharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -45,7 +46,7 @@ def get_ph22assetsinnonsharedalbumsphdapsql(files_found, report_folder, seeker,
         logfunc("Unsupported version for PhotoData-Photos.sqlite assets in Non-Shared Albums from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("12")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -323,7 +324,7 @@ def get_ph22assetsinnonsharedalbumsphdapsql(files_found, report_folder, seeker,
 
     elif (version.parse(iosversion) >= version.parse("12")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -613,7 +614,7 @@ def get_ph22assetsinnonsharedalbumsphdapsql(files_found, report_folder, seeker,
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -916,7 +917,7 @@ def get_ph22assetsinnonsharedalbumsphdapsql(files_found, report_folder, seeker,
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1243,7 +1244,7 @@ def get_ph22assetsinnonsharedalbumsphdapsql(files_found, report_folder, seeker,
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1592,7 +1593,7 @@ def get_ph22assetsinnonsharedalbumsphdapsql(files_found, report_folder, seeker,
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
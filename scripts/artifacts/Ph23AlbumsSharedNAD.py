@@ -27,7 +27,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph23sharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -44,7 +45,7 @@ def get_ph23sharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text,
         logfunc("Unsupported version for PhotoData-Photos.sqlite Shared Album records with no asset data from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("12")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -328,7 +329,7 @@ def get_ph23sharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif (version.parse(iosversion) >= version.parse("12")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -616,7 +617,7 @@ def get_ph23sharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -919,7 +920,7 @@ def get_ph23sharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1231,7 +1232,7 @@ def get_ph23sharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1543,7 +1544,7 @@ def get_ph23sharedalbumsphdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
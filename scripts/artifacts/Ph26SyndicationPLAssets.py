@@ -30,7 +30,8 @@ import shutil
 
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, kmlgen, timeline, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, kmlgen, timeline, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph26syndicationidassetsphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -48,7 +49,7 @@ def get_ph26syndicationidassetsphdapsql(files_found, report_folder, seeker, wrap
                 " PhotoData-Photos.sqlite for iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -286,7 +287,7 @@ def get_ph26syndicationidassetsphdapsql(files_found, report_folder, seeker, wrap
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -554,7 +555,7 @@ def get_ph26syndicationplassetssyndpl(files_found, report_folder, seeker, wrap_t
                 " Syndication.photoslibrary-database-Photos.sqlite for iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -792,7 +793,7 @@ def get_ph26syndicationplassetssyndpl(files_found, report_folder, seeker, wrap_t
 
     if version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
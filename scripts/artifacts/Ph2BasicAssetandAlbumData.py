@@ -32,7 +32,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -50,7 +51,7 @@ def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wr
         logfunc("Unsupported version for PhotoData-Photos.sqlite basic asset and album data from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("12")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -284,7 +285,7 @@ def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("12")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -518,7 +519,7 @@ def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -837,7 +838,7 @@ def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1176,7 +1177,7 @@ def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1542,7 +1543,7 @@ def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("16")) & (version.parse(iosversion) < version.parse("17")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -1916,7 +1917,7 @@ def get_ph2assetbasicandalbumdataphdapsql(files_found, report_folder, seeker, wr
 
     elif version.parse(iosversion) >= version.parse("17"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -2306,7 +2307,7 @@ def get_ph2asserbasicandconversdatasyndpl(files_found, report_folder, seeker, wr
         logfunc("Unsupported version for Syndication.photoslibrary-database-Photos.sqlite basic asset and album data iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("12")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -2543,7 +2544,7 @@ def get_ph2asserbasicandconversdatasyndpl(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("12")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -2780,7 +2781,7 @@ def get_ph2asserbasicandconversdatasyndpl(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -3101,7 +3102,7 @@ def get_ph2asserbasicandconversdatasyndpl(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -3443,7 +3444,7 @@ def get_ph2asserbasicandconversdatasyndpl(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -3812,7 +3813,7 @@ def get_ph2asserbasicandconversdatasyndpl(files_found, report_folder, seeker, wr
 
     elif (version.parse(iosversion) >= version.parse("16")) & (version.parse(iosversion) < version.parse("17")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -4189,7 +4190,7 @@ def get_ph2asserbasicandconversdatasyndpl(files_found, report_folder, seeker, wr
 
     elif version.parse(iosversion) >= version.parse("17"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
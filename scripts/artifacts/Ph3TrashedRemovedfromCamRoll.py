@@ -28,7 +28,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph3trashedphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -46,7 +47,7 @@ def get_ph3trashedphdapsql(files_found, report_folder, seeker, wrap_text, timezo
                 " trashed assets from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -118,7 +119,7 @@ def get_ph3trashedphdapsql(files_found, report_folder, seeker, wrap_text, timezo
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -190,7 +191,7 @@ def get_ph3trashedphdapsql(files_found, report_folder, seeker, wrap_text, timezo
 
     elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -275,7 +276,7 @@ def get_ph3trashedphdapsql(files_found, report_folder, seeker, wrap_text, timezo
 
     elif version.parse(iosversion) >= version.parse("16"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -385,7 +386,7 @@ def get_ph3removedfromcamerarollsyndpl(files_found, report_folder, seeker, wrap_
                     " Syndication PL assets removed from camera roll iOS " + iosversion)
         if (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
             file_found = str(files_found[0])
-            db = open_sqlite_db_readonly(file_found)
+            db = open_photos_db(file_found, report_folder)
             cursor = db.cursor()
 
             cursor.execute("""
@@ -475,7 +476,7 @@ def get_ph3removedfromcamerarollsyndpl(files_found, report_folder, seeker, wrap_
 
         elif version.parse(iosversion) >= version.parse("16"):
             file_found = str(files_found[0])
-            db = open_sqlite_db_readonly(file_found)
+            db = open_photos_db(file_found, report_folder)
             cursor = db.cursor()
 
             cursor.execute("""
@@ -26,7 +26,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph4hiddenphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -43,7 +44,7 @@ def get_ph4hiddenphdapsql(files_found, report_folder, seeker, wrap_text, timezon
         logfunc("Unsupported version for PhotoData-Photos.sqlite hidden assets from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -115,7 +116,7 @@ def get_ph4hiddenphdapsql(files_found, report_folder, seeker, wrap_text, timezon
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -187,7 +188,7 @@ def get_ph4hiddenphdapsql(files_found, report_folder, seeker, wrap_text, timezon
 
     elif version.parse(iosversion) >= version.parse("15"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
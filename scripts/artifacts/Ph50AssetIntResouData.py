@@ -29,7 +29,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph50intresouoptimzdataphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -47,7 +48,7 @@ def get_ph50intresouoptimzdataphdapsql(files_found, report_folder, seeker, wrap_
 		logfunc("Unsupported version for PhotoData-Photos.sqlite ZINTERNALRESOURCE table data from iOS " + iosversion)
 	if (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -1074,7 +1075,7 @@ def get_ph50intresouoptimzdataphdapsql(files_found, report_folder, seeker, wrap_
 
 	elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -2209,7 +2210,7 @@ def get_ph50intresouoptimzdataphdapsql(files_found, report_folder, seeker, wrap_
 
 	elif (version.parse(iosversion) >= version.parse("16")) & (version.parse(iosversion) < version.parse("17")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -3389,7 +3390,7 @@ def get_ph50intresouoptimzdataphdapsql(files_found, report_folder, seeker, wrap_
 
 	elif version.parse(iosversion) >= version.parse("17"):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -4590,7 +4591,7 @@ def get_ph50intresouoptimzdatasyndpl(files_found, report_folder, seeker, wrap_te
 		logfunc("Unsupported version for SyndicationPL-Photos.sqlite ZINTERNALRESOURCE table data from iOS " + iosversion)
 	if (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -5617,7 +5618,7 @@ def get_ph50intresouoptimzdatasyndpl(files_found, report_folder, seeker, wrap_te
 
 	elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -6753,7 +6754,7 @@ def get_ph50intresouoptimzdatasyndpl(files_found, report_folder, seeker, wrap_te
 
 	elif (version.parse(iosversion) >= version.parse("16")) & (version.parse(iosversion) < version.parse("17")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -7933,7 +7934,7 @@ def get_ph50intresouoptimzdatasyndpl(files_found, report_folder, seeker, wrap_te
 
 	elif version.parse(iosversion) >= version.parse("17"):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -28,7 +28,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph51possibleoptimizedassetsphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -46,7 +47,7 @@ def get_ph51possibleoptimizedassetsphdapsql(files_found, report_folder, seeker,
 		logfunc("Unsupported version for PhotoData-Photos.sqlite ZINTERNALRESOURCE table data from iOS " + iosversion)
 	if (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -1052,7 +1053,7 @@ def get_ph51possibleoptimizedassetsphdapsql(files_found, report_folder, seeker,
 
 	elif (version.parse(iosversion) >= version.parse("15")) & (version.parse(iosversion) < version.parse("16")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -2167,7 +2168,7 @@ def get_ph51possibleoptimizedassetsphdapsql(files_found, report_folder, seeker,
 
 	elif (version.parse(iosversion) >= version.parse("16")) & (version.parse(iosversion) < version.parse("17")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -3327,7 +3328,7 @@ def get_ph51possibleoptimizedassetsphdapsql(files_found, report_folder, seeker,
 
 	elif version.parse(iosversion) >= version.parse("17"):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
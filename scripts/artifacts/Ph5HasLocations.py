@@ -27,7 +27,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph5haslocationsphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -44,7 +45,7 @@ def get_ph5haslocationsphdapsql(files_found, report_folder, seeker, wrap_text, t
         logfunc("Unsupported version for PhotosData-Photos.sqlite assets with valid locations from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -131,7 +132,7 @@ def get_ph5haslocationsphdapsql(files_found, report_folder, seeker, wrap_text, t
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -267,7 +268,7 @@ def get_ph5haslocationsphdapsql(files_found, report_folder, seeker, wrap_text, t
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -414,7 +415,7 @@ def get_ph5haslocationsphdapsql(files_found, report_folder, seeker, wrap_text, t
 
     elif version.parse(iosversion) >= version.parse("15"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -576,7 +577,7 @@ def get_ph5haslocationssyndpl(files_found, report_folder, seeker, wrap_text, tim
         logfunc("Unsupported version for Syndication.photoslibrary-database-Photos.sqlite assets with valid locations iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -664,7 +665,7 @@ def get_ph5haslocationssyndpl(files_found, report_folder, seeker, wrap_text, tim
 
     elif (version.parse(iosversion) >= version.parse("13")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -802,7 +803,7 @@ def get_ph5haslocationssyndpl(files_found, report_folder, seeker, wrap_text, tim
 
     elif (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -950,7 +951,7 @@ def get_ph5haslocationssyndpl(files_found, report_folder, seeker, wrap_text, tim
 
     elif version.parse(iosversion) >= version.parse("15"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
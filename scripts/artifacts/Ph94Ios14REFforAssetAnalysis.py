@@ -28,7 +28,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph94ios14refforassetanalysisphdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -46,7 +47,7 @@ def get_ph94ios14refforassetanalysisphdapsql(files_found, report_folder, seeker,
 		logfunc("Unsupported version for PhotoData-Photos.sqlite reference for asset analysis from iOS " + iosversion)
 	if (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
@@ -4583,7 +4584,7 @@ def get_ph94ios14refforassetanalysissyndpl(files_found, report_folder, seeker, w
 		logfunc("Unsupported version for Syndication.photoslibrary-database-Photos.sqlite reference for asset analysis from iOS " + iosversion)
 	if (version.parse(iosversion) >= version.parse("14")) & (version.parse(iosversion) < version.parse("15")):
 		file_found = str(files_found[0])
-		db = open_sqlite_db_readonly(file_found)
+		db = open_photos_db(file_found, report_folder)
 		cursor = db.cursor()
 
 		cursor.execute("""
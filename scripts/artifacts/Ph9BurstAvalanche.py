@@ -26,7 +26,8 @@ import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, timeline, kmlgen, is_platform_windows, media_to_html
+from scripts.photos_db import open_photos_db
 
 
 def get_ph9burstavalanchephdapsql(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -43,7 +44,7 @@ def get_ph9burstavalanchephdapsql(files_found, report_folder, seeker, wrap_text,
         logfunc("Unsupported version for PhotoData-Photos.sqlite burst avalanche assets from iOS " + iosversion)
     if (version.parse(iosversion) >= version.parse("11")) & (version.parse(iosversion) < version.parse("14")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -137,7 +138,7 @@ def get_ph9burstavalanchephdapsql(files_found, report_folder, seeker, wrap_text,
 
     elif version.parse(iosversion) >= version.parse("14"):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -283,7 +283,7 @@ def get_googleChat(files_found, report_folder, seeker, wrap_text, timezone_offse
                     if checkkeyten is not None:
                         mediafilename = (protostuff['1']['10']['3'])
                         mediafilename = (mediafilename.decode())
-                        attachment = seeker.search('*/'+guid+'/tmp/'+mediafilename, return_on_first_hit=True)
+                        attachment = seeker.resolve_suffix('/'+guid+'/tmp/'+mediafilename, return_on_first_hit=True)
                         
                         if len(attachment) < 1:
                             thumb = ''
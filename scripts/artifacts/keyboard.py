@@ -18,9 +18,8 @@ def get_keyboard(files_found, report_folder, seeker, wrap_text, timezone_offset)
         
         # Keyboard Lexicon
         if file_found.endswith('dynamic-lexicon.dat'):
-            with open(file_found, 'rb') as dat_file:
-                dat_content = dat_file.read()
-                dat_content_decoded = str(dat_content, 'utf-8', 'ignore')
+            with seeker.open_mapped(file_found) as dat_file:
+                dat_content_decoded = str(dat_file.view, 'utf-8', 'ignore')
                 found_str = ''
                 for char in dat_content_decoded:
                     if char in string.printable:
@@ -10,8 +10,8 @@ import shutil
 
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, tsv, kmlgen, timeline, is_platform_windows, generate_thumbnail, \
-    open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, tsv, kmlgen, timeline, is_platform_windows, generate_thumbnail
+from scripts.photos_db import open_photos_db
 
 
 def get_photosMetadata(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -28,7 +28,7 @@ def get_photosMetadata(files_found, report_folder, seeker, wrap_text, timezone_o
         logfunc("Unsupported version for Photos.sqlite metadata on iOS " + iOSversion)
     if (version.parse(iOSversion) >= version.parse("12")) & (version.parse(iOSversion) < version.parse("13")):
         file_found = str(files_found[0])
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -368,7 +368,7 @@ def get_photosMetadata(files_found, report_folder, seeker, wrap_text, timezone_o
     elif (version.parse(iOSversion) >= version.parse("13")) & (version.parse(iOSversion) < version.parse("14")):
         file_found = str(files_found[0])
         # os.chmod(file_found, 0o0777)
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
@@ -703,7 +703,7 @@ def get_photosMetadata(files_found, report_folder, seeker, wrap_text, timezone_o
     elif version.parse(iOSversion) >= version.parse("14"):
         file_found = str(files_found[0])
         # os.chmod(file_found, 0o0777)
-        db = open_sqlite_db_readonly(file_found)
+        db = open_photos_db(file_found, report_folder)
         cursor = db.cursor()
 
         cursor.execute("""
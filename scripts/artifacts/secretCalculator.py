@@ -33,10 +33,7 @@ def get_secretCalculator(files_found, report_folder, seeker, wrap_text, timezone
                 else:
                     split_on = '/private/'
                 p = str(pathlib.Path(file_found).parent).split(split_on, 1)
-                file = f'**{p[1]}/Library/data.sqlite'
-                if is_platform_windows():
-                    file.replace('/', '\\')
-                db_file = seeker.search(file, return_on_first_hit=True)
+                db_file = seeker.resolve_suffix(f'{p[1]}/Library/data.sqlite', return_on_first_hit=True)
                 if not db_file:
                     logfunc(' [!] Unable to extract db file: "{}"'.format(db_file))
                     return
@@ -60,12 +57,11 @@ def get_secretCalculator(files_found, report_folder, seeker, wrap_text, timezone
                 data_list = []
 
                 if usageentries > 0:
+                    videos = seeker.resolve_suffixes({f'/private/{p[1]}/Library/Data/{row[2]}.mov' for row in all_rows})
                     for row in all_rows:
 
                         fileNameToSearch = f'/private/{p[1]}/Library/Data/{row[2]}.mov'
-                        if is_platform_windows():
-                            fileNameToSearch.replace('/', '\\')
-                        seekerResults = seeker.search(f'**{fileNameToSearch}', return_on_first_hit=True)
+                        seekerResults = videos[fileNameToSearch]
                         thumb = None
                         attachmentFile = None
                         if seekerResults:
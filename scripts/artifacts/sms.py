@@ -95,10 +95,13 @@ def get_sms(files_found, report_folder, seeker, wrap_text, timezone_offset):
                 )
         sms_df["data-time"] = pd.to_datetime(sms_df["data-time"])
 
+        attachment_paths = {path: path.replace('~', '', 1) for path in sms_df["Attachment Path"] if path}
+        attachments = seeker.resolve_suffixes(set(attachment_paths.values()))
+
         def copyAttachments(rec):
             pathToAttachment = None
             if rec["Attachment Path"]:
-                attachment = seeker.search('**'+rec["Attachment Path"].replace('~', '', 1), return_on_first_hit=True)
+                attachment = attachments[attachment_paths[rec["Attachment Path"]]][:1]
                 if not attachment:
                     logfunc(' [!] Unable to extract attachment file: "{}"'.format(rec['Attachment Path']))
                     return
@@ -21,13 +21,12 @@ import sqlite3
 import io
 import json
 import os
-import shutil
 import nska_deserialize as nd
 import scripts.artifacts.artGlobals
 
 from packaging import version
 from scripts.artifact_report import ArtifactHtmlReport
-from scripts.ilapfuncs import logfunc, logdevinfo, timeline, kmlgen, tsv, is_platform_windows, open_sqlite_db_readonly
+from scripts.ilapfuncs import logfunc, logdevinfo, timeline, kmlgen, tsv, is_platform_windows, open_sqlite_db_readonly, get_media_resolver, copy_media_file
 
 
 def get_whatsappMessages(files_found, report_folder, seeker, wrap_text, timezone_offset):
@@ -66,6 +65,7 @@ def get_whatsappMessages(files_found, report_folder, seeker, wrap_text, timezone
     thumb = ''
     
     if usageentries > 0:
+        media = get_media_resolver(files_found)
         for row in all_rows:
             
             if row[1] == 1:
@@ -88,21 +88,21 @@ def get_whatsappMessages(files_found, report_folder, seeker, wrap_text, timezone
             
             
             if attachment is not None:
-                for match in files_found:
-                    if attachment in match:
-                        shutil.copy2(match, report_folder)
-                        data_file_name = os.path.basename(match)
-                        thumb = f'<img src="{report_folder}/{data_file_name}"></img>'
+                matches = media.resolve_suffix(attachment)
+                if matches:
+                    data_file_name = os.path.basename(copy_media_file(matches[-1], report_folder))
+                    thumb = f'<img src="{report_folder}/{data_file_name}"></img>'
+                else:
+                    thumb = ''
             else:
                 thumb = ''
                 
             
             if attfile is not None:
-                for matchf in files_found:
-                    if attfile in matchf:
-                        shutil.copy2(matchf, report_folder)
-                        data_file_namef = os.path.basename(matchf)
-                        attfile = f'<img src="{report_folder}/{data_file_namef}" width="300"></img>'
+                matches = media.resolve_suffix(attfile)
+                if matches:
+                    data_file_namef = os.path.basename(copy_media_file(matches[-1], report_folder))
+                    attfile = f'<img src="{report_folder}/{data_file_namef}" width="300"></img>'
             else:
                 attfile = ''
                     
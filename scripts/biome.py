@@ -0,0 +1,166 @@
+# Common reader for the Biome stream artifacts.
+#
+# Biome streams are SEGB files (v1 or v2) holding one protobuf message per record. Each biome* artifact used to walk
+# the records one at a time and decode them with its typedef. Here a stream file is memory mapped, its records are
+# read from the mapping, deleted records are skipped before any data is copied, and the protobuf payloads are decoded
+# with a typedef compiled once per stream type. Artifacts already run in parallel with --workers, so a stream is
+# decoded in the process of its artifact. The artifacts only map decoded fields to rows.
+
+import os
+import struct
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import blackboxprotobuf
+
+from scripts.ilapfuncs import logfunc
+
+SEGB_MAGIC = b'SEGB'
+COCOA_EPOCH = datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+# SEGB v1: 56 byte header ending with the magic, records with a 32 byte header, aligned to 8 bytes
+SEGB1_HEADER_LENGTH = 56
+SEGB1_RECORD_HEADER = struct.Struct('<i4xdd8x')
+# SEGB v2: 32 byte header starting with the magic, records aligned to 4 bytes, a 16 byte trailer entry per record
+SEGB2_HEADER_LENGTH = 32
+SEGB2_TRAILER_ENTRY = struct.Struct('<2id')
+SEGB2_RECORD_PREFIX_LENGTH = 8  # checksum and unknown value before the protobuf payload
+segb2_states = {1: 'Written', 3: 'Deleted', 4: 'Unknown'}
+
+SegbRecord = namedtuple('SegbRecord', ('offset', 'metadata_offset', 'state', 'timestamp1', 'timestamp2', 'data'))
+SegbRecord.__doc__ = '''A SEGB record. offset is where the record starts in the file, metadata_offset where its
+    trailer entry is ('' for SEGB v1), state is 'Written' or 'Deleted', timestamp1 and timestamp2 are UTC datetimes
+    (timestamp2 is '' for SEGB v2) and data is the protobuf payload, None for deleted records.'''
+
+
+def _cocoa_time(seconds):
+    try:
+        return COCOA_EPOCH + timedelta(seconds=seconds)
+    except (OverflowError, ValueError):
+        return ''
+
+def _read_segb1_records(view, include_deleted):
+    end_of_data = min(struct.unpack_from('<I', view, 0)[0], len(view))
+    pos = SEGB1_HEADER_LENGTH
+    while pos + SEGB1_RECORD_HEADER.size <= end_of_data:
+        length, timestamp1, timestamp2 = SEGB1_RECORD_HEADER.unpack_from(view, pos)
+        if length <= 0:
+            break
+        pos += SEGB1_RECORD_HEADER.size
+        if view[pos:pos + 1] == b'\x00':
+            if include_deleted:
+                yield SegbRecord(pos, '', 'Deleted', _cocoa_time(timestamp1), _cocoa_time(timestamp2), None)
+        else:
+            yield SegbRecord(pos, '', 'Written', _cocoa_time(timestamp1), _cocoa_time(timestamp2),
+                             bytes(view[pos:pos + length]))
+        pos += length
+        if pos % 8:
+            pos += 8 - pos % 8
+
+def _read_segb2_records(view, include_deleted):
+    entries_count = struct.unpack_from('<i', view, 4)[0]
+    trailer_start = len(view) - SEGB2_TRAILER_ENTRY.size * entries_count
+    if entries_count <= 0 or trailer_start < SEGB2_HEADER_LENGTH:
+        return
+    entries = []
+    for metadata_offset in range(trailer_start, len(view), SEGB2_TRAILER_ENTRY.size):
+        end_offset, state, timestamp = SEGB2_TRAILER_ENTRY.unpack_from(view, metadata_offset)
+        entries.append((end_offset, state, timestamp, metadata_offset))
+    entries.sort()
+    pos = SEGB2_HEADER_LENGTH
+    for end_offset, state, timestamp, metadata_offset in entries:
+        # end offsets are relative to the end of the header
+        end = min(max(end_offset + SEGB2_HEADER_LENGTH, pos), trailer_start)
+        state = segb2_states.get(state, 'Unknown')
+        if state == 'Written':
+            yield SegbRecord(pos, metadata_offset, state, _cocoa_time(timestamp), '',
+                             bytes(view[pos + SEGB2_RECORD_PREFIX_LENGTH:end]))
+        elif include_deleted:
+            yield SegbRecord(pos, metadata_offset, state, _cocoa_time(timestamp), '', None)
+        pos = end
+        if end_offset % 4:
+            pos += 4 - end_offset % 4
+
+def read_segb_records(view, include_deleted=False):
+    '''Yields the SegbRecords of the SEGB v1 or v2 data in view (bytes or memoryview). Records that are not written are
+       only yielded if include_deleted is True, without their data'''
+    if view[:4] == SEGB_MAGIC:
+        yield from _read_segb2_records(view, include_deleted)
+    elif view[SEGB1_HEADER_LENGTH - 4:SEGB1_HEADER_LENGTH] == SEGB_MAGIC:
+        yield from _read_segb1_records(view, include_deleted)
+    else:
+        raise ValueError('Not a SEGB file')
+
+
+class _Typedef(dict):
+    '''Protobuf typedef that blackboxprotobuf copies cheaply. decode_message() deep copies the typedef of every
+       (nested) message it decodes, but it only changes the typedef dict and its field dicts'''
+    def __deepcopy__(self, memo):
+        fields = _Typedef()
+        for number, field in self.items():
+            fields[number] = field = dict(field)
+            if 'alt_typedefs' in field:
+                field['alt_typedefs'] = dict(field['alt_typedefs'])
+        return fields
+
+def compile_typedef(typedef):
+    '''Returns typedef (and the typedefs of its nested messages) as a _Typedef'''
+    compiled = _Typedef()
+    for number, field in typedef.items():
+        compiled[number] = field = dict(field)
+        if isinstance(field.get('message_typedef'), dict):
+            field['message_typedef'] = compile_typedef(field['message_typedef'])
+    return compiled
+
+_typedefs = {}  # stream name -> compiled typedef, for this process
+
+def get_typedef(name, typedef):
+    '''Returns the compiled typedef of the stream name, compiling typedef on first use. None decodes without typedef'''
+    if typedef is None:
+        return None
+    compiled = _typedefs.get(name)
+    if compiled is None:
+        compiled = _typedefs[name] = compile_typedef(typedef)
+    return compiled
+
+def decode_payloads(name, typedef, payloads):
+    '''Decodes the protobuf payloads of the stream name. Returns a list with the decoded message of each
+       payload, None for those that could not be decoded'''
+    typedef = get_typedef(name, typedef)
+    messages = []
+    for payload in payloads:
+        try:
+            messages.append(blackboxprotobuf.decode_message(payload, typedef)[0])
+        except Exception:
+            messages.append(None)
+    return messages
+
+
+def decode_records(name, typedef, records):
+    '''Returns [(record, message)] for the records of the stream name, message is None for deleted or undecodable
+       records'''
+    messages = iter(decode_payloads(name, typedef, [record.data for record in records if record.data is not None]))
+    decoded_records = [(record, None if record.data is None else next(messages)) for record in records]
+    failed = sum(1 for record, message in decoded_records if record.data is not None and message is None)
+    if failed:
+        logfunc(f'{failed} {name} records could not be decoded')
+    return decoded_records
+
+
+def read_biome_streams(files_found, seeker, name, typedef, include_deleted=False):
+    '''Yields (file_found, [(SegbRecord, decoded message)]) for each Biome stream file in files_found, skipping hidden
+       files, folders and tombstones. name identifies the stream type for the typedef cache. Deleted records are
+       included (with a None message) if include_deleted is True'''
+    for file_found in map(str, files_found):
+        if os.path.basename(file_found).startswith('.') or 'tombstone' in file_found:
+            continue
+        if not os.path.isfile(file_found):
+            continue
+        with seeker.open_mapped(file_found) as mapped:
+            try:
+                records = list(read_segb_records(mapped.view, include_deleted))
+            except (ValueError, struct.error) as ex:
+                logfunc(f'Could not read {name} stream {file_found}: {ex}')
+                continue
+        yield file_found, decode_records(name, typedef, records)
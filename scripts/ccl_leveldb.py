@@ -26,9 +26,10 @@ import re
 import os
 import io
 import pathlib
+import bisect
 import dataclasses
 import enum
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from types import MappingProxyType
 
 import scripts.ccl_simplesnappy as ccl_simplesnappy
@@ -78,6 +79,24 @@ def read_length_prefixed_blob(stream: typing.BinaryIO):
     return data
 
 
+def _user_key(key: bytes) -> bytes:
+    """Strips the sequence number and type (the last 8 bytes) from an internal key in a table file"""
+    return key if len(key) < 8 else key[0:-8]
+
+
+def prefix_stop_key(prefix: bytes) -> typing.Optional[bytes]:
+    """Returns the smallest key greater than every key starting with prefix (for use as a stop key), or None if there
+    is no such key (prefix is empty or all 0xff bytes)"""
+    stripped = prefix.rstrip(b"\xff")
+    if not stripped:
+        return None
+    return stripped[:-1] + bytes([stripped[-1] + 1])
+
+
+def _in_range(key: bytes, start: typing.Optional[bytes], stop: typing.Optional[bytes]) -> bool:
+    return (start is None or key >= start) and (stop is None or key < stop)
+
+
 @dataclasses.dataclass(frozen=True)
 class BlockHandle:
     """See: https://github.com/google/leveldb/blob/master/doc/table_format.md
@@ -131,10 +150,7 @@ class Record:
     @property
     def user_key(self):
         if self.file_type == FileType.Ldb:
-            if len(self.key) < 8:
-                return self.key
-            else:
-                return self.key[0:-8]
+            return _user_key(self.key)
         else:
             return self.key
 
@@ -166,6 +182,9 @@ class Block:
         self._restart_array_count, = struct.unpack("<I", self._raw[-4:])
         self._restart_array_offset = len(self._raw) - (self._restart_array_count + 1) * 4
 
+    def __len__(self):
+        return len(self._raw)
+
     def get_restart_offset(self, index) -> int:
         offset = self._restart_array_offset + (index * 4)
         return struct.unpack("<i", self._raw[offset: offset + 4])[0]
@@ -198,18 +217,54 @@ class Block:
                 yield RawBlockEntry(key, value, start_offset)
 
 
+class BlockCache:
+    """LRU cache of decompressed table blocks, shared by the LdbFiles of a database and bounded by the total size of
+    the cached blocks"""
+    DEFAULT_MAX_SIZE = 32 * 1024 * 1024
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._blocks = OrderedDict()
+        self._size = 0
+
+    def get(self, key) -> typing.Optional["Block"]:
+        block = self._blocks.get(key)
+        if block is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._blocks.move_to_end(key)
+        return block
+
+    def put(self, key, block: "Block"):
+        if key in self._blocks or len(block) > self.max_size:
+            return
+        self._blocks[key] = block
+        self._size += len(block)
+        while self._size > self.max_size:
+            _, evicted = self._blocks.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self):
+        self._blocks.clear()
+        self._size = 0
+
+
 class LdbFile:
     """A leveldb table (.ldb or .sst) file."""
     BLOCK_TRAILER_SIZE = 5
     FOOTER_SIZE = 48
     MAGIC = 0xdb4775248b80fb57
 
-    def __init__(self, file: pathlib.Path):
+    def __init__(self, file: pathlib.Path, block_cache: typing.Optional[BlockCache] = None):
         if not file.exists():
             raise FileNotFoundError(file)
 
         self.path = file
         self.file_no = int(file.stem, 16)
+        self._block_cache = block_cache
 
         self._f = file.open("rb")
         self._f.seek(-LdbFile.FOOTER_SIZE, os.SEEK_END)
@@ -222,14 +277,22 @@ class LdbFile:
             raise ValueError(f"Invalid magic number in {file}")
 
         self._index = self._read_index()
+        # the index keys separate the blocks: each is >= the keys in its block and < the keys in the next one
+        self._index_user_keys = tuple(_user_key(key) for key, _ in self._index)
 
-    def _read_block(self, handle: BlockHandle):
+    def _read_block(self, handle: BlockHandle, *, fill_cache=False):
         # block is the size in the blockhandle plus the trailer
         # the trailer is 5 bytes long.
         # idx  size  meaning
         # 0    1     CompressionType (0 = none, 1 = snappy)
         # 1    4     CRC32
 
+        cache_key = (self.file_no, handle.offset)
+        if self._block_cache is not None:
+            block = self._block_cache.get(cache_key)
+            if block is not None:
+                return block
+
         self._f.seek(handle.offset)
         raw_block = self._f.read(handle.length)
         trailer = self._f.read(LdbFile.BLOCK_TRAILER_SIZE)
@@ -239,10 +302,12 @@ class LdbFile:
 
         is_compressed = trailer[0] != 0
         if is_compressed:
-            with io.BytesIO(raw_block) as buff:
-                raw_block = ccl_simplesnappy.decompress(buff)
+            raw_block = ccl_simplesnappy.decompress(raw_block)
 
-        return Block(raw_block, is_compressed, self, handle.offset)
+        block = Block(raw_block, is_compressed, self, handle.offset)
+        if fill_cache and self._block_cache is not None:
+            self._block_cache.put(cache_key, block)
+        return block
 
     def _read_index(self) -> typing.Tuple[typing.Tuple[bytes, BlockHandle], ...]:
         index_block = self._read_block(self._index_handle)
@@ -252,9 +317,21 @@ class LdbFile:
 
     def __iter__(self) -> typing.Iterable[Record]:
         """Iterate Records in this Table file"""
-        for block_key, handle in self._index:
-            block = self._read_block(handle)
+        # like a leveldb iterator with fill_cache off, a full scan uses cached blocks but doesn't evict them
+        yield from self.seek(fill_cache=False)
+
+    def seek(self, start: bytes = None, stop: bytes = None, *, fill_cache=True) -> typing.Iterable[Record]:
+        """Iterate the Records in this Table file with user keys from start (inclusive) to stop (exclusive), only
+        reading the blocks that can hold them. Keys are compared bytewise, as with leveldb's default comparator"""
+        first = 0 if start is None else bisect.bisect_left(self._index_user_keys, start)
+        for block_key, handle in self._index[first:]:
+            block = self._read_block(handle, fill_cache=fill_cache)
             for entry in block:
+                user_key = _user_key(entry.key)
+                if start is not None and user_key < start:
+                    continue
+                if stop is not None and user_key >= stop:
+                    return
                 yield Record.ldb_record(
                     entry.key, entry.value, self.path,
                     block.offset if block.was_compressed else block.offset + entry.block_offset,
@@ -366,6 +443,13 @@ class LogFile:
 
                     yield Record.log_record(key, value, seq + i, state, self.path, start_offset)
 
+    def seek(self, start: bytes = None, stop: bytes = None) -> typing.Iterable[Record]:
+        """Iterate the Records in this Log file with keys from start (inclusive) to stop (exclusive). Log files are
+        not sorted, so the whole file is read"""
+        for record in self:
+            if _in_range(record.key, start, stop):
+                yield record
+
     def close(self):
         self._f.close()
 
@@ -539,12 +623,13 @@ class ManifestFile:
 class RawLevelDb:
     DATA_FILE_PATTERN = r"[0-9]{6}\.(ldb|log|sst)"
 
-    def __init__(self, in_dir: os.PathLike):
+    def __init__(self, in_dir: os.PathLike, *, block_cache_size=BlockCache.DEFAULT_MAX_SIZE):
 
         self._in_dir = pathlib.Path(in_dir)
         if not self._in_dir.is_dir():
             raise ValueError("in_dir is not a directory")
 
+        self.block_cache = BlockCache(block_cache_size)
         self._files = []
         latest_manifest = (0, None)
         for file in self._in_dir.iterdir():
@@ -552,7 +637,7 @@ class RawLevelDb:
                 if file.suffix.lower() == ".log":
                     self._files.append(LogFile(file))
                 elif file.suffix.lower() == ".ldb" or file.suffix.lower() == ".sst":
-                    self._files.append(LdbFile(file))
+                    self._files.append(LdbFile(file, self.block_cache))
             if file.is_file() and re.match(ManifestFile.MANIFEST_FILENAME_PATTERN, file.name):
                 manifest_no = int(re.match(ManifestFile.MANIFEST_FILENAME_PATTERN, file.name).group(1), 16)
                 if latest_manifest[0] < manifest_no:
@@ -571,9 +656,39 @@ class RawLevelDb:
         return self._in_dir
 
     def iterate_records_raw(self, *, reverse=False) -> typing.Iterable[Record]:
+        """Iterate every Record in the database files, in file number order"""
         for file_containing_records in sorted(self._files, reverse=reverse, key=lambda x: x.file_no):
             yield from file_containing_records
 
+    def seek(self, start: bytes = None, stop: bytes = None, *, prefix: bytes = None,
+             reverse=False) -> typing.Iterable[Record]:
+        """Iterate the Records with user keys from start (inclusive) to stop (exclusive), or starting with prefix, in
+        file number order. Table files are binary searched on their index and only the blocks which can hold the keys
+        are read; blocks read this way are kept in the block cache. Log files are read in full.
+        Keys are compared bytewise, as with leveldb's default comparator"""
+        if prefix is not None:
+            start, stop = prefix, prefix_stop_key(prefix)
+        for file_containing_records in sorted(self._files, reverse=reverse, key=lambda x: x.file_no):
+            yield from file_containing_records.seek(start, stop)
+
+    def iterate_latest_records(self, start: bytes = None, stop: bytes = None, *, prefix: bytes = None,
+                               include_deleted=False) -> typing.Iterable[Record]:
+        """Iterate the latest version (highest sequence number) of each user key in the range, in key order,
+        leaving out keys whose latest version is a deletion unless include_deleted is True"""
+        latest = {}
+        for record in self.seek(start, stop, prefix=prefix):
+            current = latest.get(record.user_key)
+            if current is None or record.seq > current.seq:
+                latest[record.user_key] = record
+        for user_key in sorted(latest):
+            record = latest[user_key]
+            if include_deleted or record.state != KeyState.Deleted:
+                yield record
+
+    def get(self, key: bytes) -> typing.Optional[Record]:
+        """Returns the latest live Record for the user key, or None if there isn't one or it was deleted"""
+        return next(self.iterate_latest_records(key, key + b"\x00"), None)
+
     def close(self):
         for file in self._files:
             file.close()
@@ -23,8 +23,10 @@ SOFTWARE.
 import sys
 import struct
 import io
+import time
 import typing
 import enum
+import pathlib
 
 __version__ = "0.1"
 __description__ = "Pure Python reimplementation of Google's Snappy decompression"
@@ -101,96 +103,214 @@ def read_byte(stream: typing.BinaryIO) -> typing.Optional[int]:
     return None
 
 
-def decompress(data: typing.BinaryIO) -> bytes:
-    """Decompresses the snappy compressed data stream"""
-    uncompressed_length = read_le_varint(data)
-    log(f"Uncompressed length: {uncompressed_length}")
-
-    out = io.BytesIO()
+def _decompress_python(data: typing.Union[bytes, bytearray, memoryview]) -> bytes:
+    """Decompresses the snappy compressed data in a bytes-like object into a preallocated buffer"""
+    if not isinstance(data, bytes):
+        data = memoryview(data).cast("B")
+    data_length = len(data)
 
+    # uncompressed length varint
+    uncompressed_length = 0
+    pos = 0
+    shift = 0
     while True:
-        start_offset = data.tell()
-        log(f"Reading tag at offset {start_offset}")
-        type_byte = read_byte(data)
-        if type_byte is None:
+        if pos >= data_length or pos >= 10:
+            raise ValueError("Couldn't read the uncompressed length")
+        tmp = data[pos]
+        pos += 1
+        uncompressed_length |= (tmp & 0x7f) << shift
+        if not tmp & 0x80:
             break
+        shift += 7
+    log(f"Uncompressed length: {uncompressed_length}")
 
-        log(f"Type Byte is {type_byte:02x}")
+    out = bytearray(uncompressed_length)
+    out_pos = 0
 
+    while pos < data_length:
+        type_byte = data[pos]
+        pos += 1
         tag = type_byte & 0x03
 
-        log(f"Element Type is: {ElementType(tag)}")
-
         if tag == ElementType.Literal:
-            if ((type_byte & 0xFC) >> 2) < 60:  # embedded in tag
-                length = 1 + ((type_byte & 0xFC) >> 2)
-                log(f"Literal length is embedded in type byte and is {length}")
-            elif ((type_byte & 0xFC) >> 2) == 60:  # 8 bit
-                length = 1 + read_byte(data)
-                log(f"Literal length is 8bit and is {length}")
-            elif ((type_byte & 0xFC) >> 2) == 61:  # 16 bit
-                length = 1 + read_uint16(data)
-                log(f"Literal length is 16bit and is {length}")
-            elif ((type_byte & 0xFC) >> 2) == 62:  # 16 bit
-                length = 1 + read_uint24(data)
-                log(f"Literal length is 24bit and is {length}")
-            elif ((type_byte & 0xFC) >> 2) == 63:  # 16 bit
-                length = 1 + read_uint32(data)
-                log(f"Literal length is 32bit and is {length}")
-            else:
-                raise ValueError()  # cannot ever happen
-
-            literal_data = data.read(length)
-            if len(literal_data) < length:
+            length = type_byte >> 2
+            if length >= 60:  # length in the following 1-4 bytes
+                size = length - 59
+                if pos + size > data_length:
+                    raise ValueError("Couldn't read literal length")
+                length = int.from_bytes(data[pos: pos + size], "little")
+                pos += size
+            length += 1
+
+            if pos + length > data_length:
                 raise ValueError("Couldn't read enough literal data")
-
-            out.write(literal_data)
-
+            if out_pos + length > uncompressed_length:
+                raise ValueError("Wrong data length in uncompressed data")
+            out[out_pos: out_pos + length] = data[pos: pos + length]
+            pos += length
+            out_pos += length
+            continue
+
+        if tag == ElementType.CopyOneByte:
+            if pos >= data_length:
+                raise ValueError("Couldn't read backreference offset")
+            length = ((type_byte >> 2) & 0x07) + 4
+            offset = ((type_byte & 0xE0) << 3) | data[pos]
+            pos += 1
+        else:
+            size = 2 if tag == ElementType.CopyTwoByte else 4
+            if pos + size > data_length:
+                raise ValueError("Couldn't read backreference offset")
+            length = (type_byte >> 2) + 1
+            offset = int.from_bytes(data[pos: pos + size], "little")
+            pos += size
+
+        if offset == 0:
+            raise ValueError("Offset cannot be 0")
+        if offset > out_pos:
+            raise ValueError("Backreference offset is before the start of the data")
+        if out_pos + length > uncompressed_length:
+            raise ValueError("Wrong data length in uncompressed data")
+
+        start = out_pos - offset
+        if offset >= length:
+            out[out_pos: out_pos + length] = out[start: start + length]
         else:
-            if tag == ElementType.CopyOneByte:
-                length = ((type_byte & 0x1C) >> 2) + 4
-                offset = ((type_byte & 0xE0) << 3) | read_byte(data)
-            elif tag == ElementType.CopyTwoByte:
-                length = 1 + ((type_byte & 0xFC) >> 2)
-                offset = read_uint16(data)
-            elif tag == ElementType.CopyFourByte:
-                length = 1 + ((type_byte & 0xFC) >> 2)
-                offset = read_uint32(data)
-            else:
-                raise ValueError()  # cannot ever happen
-
-            if offset == 0:
-                raise ValueError("Offset cannot be 0")
-
-            actual_offset = out.tell() - offset
-            log(f"Current Outstream Length: {out.tell()}")
-            log(f"Backreference length: {length}")
-            log(f"Backreference relative offset: {offset}")
-            log(f"Backreference absolute offset: {actual_offset}")
-
-            # have to read incrementally because you might have to read data that you've just written
-            # this is probably a really slow way of doing this.
-            # for i in range(length):
-            #     out.write(out.getbuffer()[actual_offset + i: actual_offset + i + 1].tobytes())
-            # new method for doing the same:
-            buffer = out.getbuffer()[actual_offset: actual_offset + length].tobytes()
-            condition = (offset - length) <= 0
-            if condition:
-                buffer = (buffer * length)[:length]
-                # better safe than sorry, this way we're sure to extend it
-                # as much as needed without doing some extra calculations
-            out.write(buffer)
-
-    result = out.getvalue()
-    if uncompressed_length != len(result):
+            # the copy overlaps the data it is writing, so it repeats the last offset bytes
+            out[out_pos: out_pos + length] = (out[start: out_pos] * (length // offset + 1))[:length]
+        out_pos += length
+
+    if out_pos != uncompressed_length:
         raise ValueError("Wrong data length in uncompressed data")
         # TODO: allow a partial / potentially bad result via a flag in the function call?
 
-    return result
+    return bytes(out)
+
+
+# optional native backends, used when available. Either one decodes raw (unframed) snappy data.
+try:
+    import cramjam
+
+    def _decompress_native(data):
+        return bytes(cramjam.snappy.decompress_raw(data))
+    native_backend = "cramjam"
+except ImportError:
+    try:
+        import snappy
+
+        def _decompress_native(data):
+            return snappy.uncompress(data)
+        native_backend = "python-snappy"
+    except ImportError:
+        _decompress_native = None
+        native_backend = None
+
+USE_NATIVE = native_backend is not None
+
+
+def decompress(data: typing.Union[typing.BinaryIO, bytes, bytearray, memoryview]) -> bytes:
+    """Decompresses the snappy compressed data, either a stream (read from its current position) or a bytes-like
+    object. Uses a native backend (cramjam or python-snappy) when one is installed and USE_NATIVE is set"""
+    if hasattr(data, "read"):
+        data = data.read()
+
+    if USE_NATIVE:
+        try:
+            return _decompress_native(data)
+        except Exception:
+            pass  # the Python decoder raises a ValueError describing what is wrong with the data
+
+    return _decompress_python(data)
+
+
+# (compressed, uncompressed) pairs covering each element type; uncompressed None means the data is invalid
+_TEST_VECTORS = (
+    (b"\x00", b""),
+    (b"\x05\x10hello", b"hello"),  # literal, length in the tag
+    (b"\x64\xf0\x63" + b"a" * 100, b"a" * 100),  # literal, 8 bit length
+    (b"\xac\x02\xf4\x2b\x01" + b"b" * 300, b"b" * 300),  # literal, 16 bit length
+    (b"\x0c\x04ab\x19\x02", b"ab" * 6),  # literal, overlapping 1 byte offset copy
+    (b"\x08\x0cabcd\x0e\x04\x00", b"abcd" * 2),  # literal, 2 byte offset copy
+    (b"\x06\x08xyz\x0b\x03\x00\x00\x00", b"xyz" * 2),  # literal, 4 byte offset copy
+    (b"\x08\x0cabcd\x0e\x00\x00", None),  # zero offset
+    (b"\x08\x0cabcd\x0e\x05\x00", None),  # offset before the start of the data
+    (b"\x05\x10hel", None),  # truncated literal
+    (b"\x06\x10hello", None),  # wrong uncompressed length
+    (b"\x03\x10hello", None),  # data longer than the uncompressed length
+)
+
+
+def self_test():
+    """Checks the decoders against _TEST_VECTORS; returns a list of failure descriptions"""
+    decoders = {"python": _decompress_python, "stream": lambda block: decompress(io.BytesIO(block))}
+    if native_backend is not None:
+        decoders[native_backend] = _decompress_native
+    failures = []
+    for name, decoder in decoders.items():
+        for compressed, expected in _TEST_VECTORS:
+            try:
+                result = decoder(compressed)
+            except Exception:
+                result = None
+            if result != expected:
+                failures.append(f"{name}: {compressed!r} gave {result!r}, expected {expected!r}")
+    return failures
+
+
+def _read_ldb_compressed_blocks(path) -> typing.Iterable[bytes]:
+    """Yields the snappy compressed blocks of a leveldb table file"""
+    import scripts.ccl_leveldb as ccl_leveldb
+    ldb = ccl_leveldb.LdbFile(pathlib.Path(path))
+    try:
+        handles = [ldb._index_handle] + [handle for _, handle in ldb._index]
+        for handle in handles:
+            ldb._f.seek(handle.offset)
+            block = ldb._f.read(handle.length + ldb.BLOCK_TRAILER_SIZE)
+            if block[-ldb.BLOCK_TRAILER_SIZE] == 1:
+                yield block[:handle.length]
+    finally:
+        ldb.close()
+
+
+def benchmark(paths, repeat=3):
+    """Checks that every decoder returns the same data for the compressed blocks of the leveldb table files (.ldb,
+    .sst) or raw snappy files in paths and prints how long each one takes"""
+    for failure in self_test():
+        print(failure)
+
+    blocks = []
+    for path in paths:
+        if pathlib.Path(path).suffix.lower() in (".ldb", ".sst"):
+            blocks.extend(_read_ldb_compressed_blocks(path))
+        else:
+            blocks.append(pathlib.Path(path).read_bytes())
+    compressed_size = sum(len(block) for block in blocks)
+    print(f"{len(blocks)} blocks, {compressed_size} bytes compressed")
+    if not blocks:
+        return
+
+    decoders = {"python": _decompress_python}
+    if native_backend is not None:
+        decoders[native_backend] = _decompress_native
+
+    expected = [_decompress_python(block) for block in blocks]
+    uncompressed_size = sum(len(block) for block in expected)
+    for name, decoder in decoders.items():
+        if any(decoder(block) != result for block, result in zip(blocks, expected)):
+            print(f"{name}: output differs from the Python decoder")
+            continue
+        best = min(_time_decoder(decoder, blocks) for _ in range(repeat))
+        print(f"{name}: {best:.4f} s, {uncompressed_size / best / 1e6:.1f} MB/s")
+
+
+def _time_decoder(decoder, blocks) -> float:
+    start = time.perf_counter()
+    for block in blocks:
+        decoder(block)
+    return time.perf_counter() - start
 
 
 def main(path):
-    import pathlib
     import hashlib
     f = pathlib.Path(path).open("rb")
     decompressed = decompress(f)
@@ -201,4 +321,7 @@ def main(path):
 
 
 if __name__ == "__main__":
-    main(sys.argv[1])
+    if sys.argv[1] == "--benchmark":
+        benchmark(sys.argv[2:])
+    else:
+        main(sys.argv[1])
@@ -111,6 +111,29 @@ body_sidebar_dynamic_data = \
                         </li>
 """
 body_sidebar_dynamic_data_placeholder = '<!--__INSERT-NAV-BAR-DATA-HERE__-->'
+# Loads the sidebar entries from the navigation file written once for the whole report (see nav_bar_js), it takes the
+# place of body_sidebar_dynamic_data_placeholder in artifact pages
+nav_bar_data_script = \
+"""
+                        <script src="_elements/nav_bar.js"></script>
+"""
+# Navigation file, adds the sidebar entries before its script tag and marks the entry of the current page as active
+# Variables = {nav_list_data as a JSON string}
+nav_bar_js = \
+"""(function() {{
+    var navListData = {0};
+    var script = document.currentScript;
+    script.insertAdjacentHTML('beforebegin', navListData);
+    var page = decodeURIComponent(window.location.pathname.split('/').pop());
+    var links = script.parentNode.querySelectorAll('a.nav-link');
+    for (var i = 0; i < links.length; i++) {{
+        if (links[i].getAttribute('href') === page) {{
+            links[i].classList.add('active');
+            break;
+        }}
+    }}
+}})();
+"""
 body_sidebar_trailer = \
 """
                     </ul>
@@ -186,12 +209,16 @@ tabs_code = \
         <li class="nav-item">
             <a class="nav-link" id="files-list-tab" data-toggle="tab" href="#files" role="tab" aria-controls="files" aria-selected="false">Processed files list</a>
         </li>
+        <li class="nav-item">
+            <a class="nav-link" id="perf-tab" data-toggle="tab" href="#perf" role="tab" aria-controls="perf" aria-selected="false">Performance</a>
+        </li>
     </ul>
     <div class="tab-content" id="myTabContent">
         <div class="tab-pane fade show active" id="case" role="tabpanel" aria-labelledby="case-tab"><br />{}</div>
         <div class="tab-pane fade" id="device" role="tabpanel" aria-labelledby="device-tab"><br />{}</div>
         <div class="tab-pane fade text-monospace" id="run" role="tabpanel" aria-labelledby="script-run-tab"><br />{}</div>
         <div class="tab-pane fade" id="files" role="tabpanel" aria-labelledby="profile-tab"><br />{}</div>
+        <div class="tab-pane fade" id="perf" role="tabpanel" aria-labelledby="perf-tab"><br />{}</div>
     </div>
 """
 # thank you note , at bottom of index.html
@@ -310,7 +337,7 @@ default_responsive_table_script = \
 """
     <script>
         $(document).ready(function() {
-            $('.table').DataTable({
+            $('.table').not('.table-paged').DataTable({
                 //"scrollY": "60vh",
                 //"scrollX": "10%",
                 //"scrollCollapse": true,
@@ -323,6 +350,99 @@ default_responsive_table_script = \
     </script>
 """
 
+# Fills the tables whose rows were written to data files (see ArtifactHtmlReport.write_paged_table_data). A data file
+# is loaded with a script tag when a page of the table needs its rows, which works for a report opened as a local file.
+# Searching or sorting loads all the data files of the table, as it goes through all the rows
+paged_table_script = \
+"""
+    <script>
+        var ileappTableChunks = {};  // table key -> {chunk number: rows}
+        function ileappTableChunk(key, number, rows) {
+            (ileappTableChunks[key] = ileappTableChunks[key] || {})[number] = rows;
+        }
+        function ileappLoadTableChunks(table, numbers, done) {
+            var key = table.attr('data-chunks');
+            var chunks = ileappTableChunks[key] = ileappTableChunks[key] || {};
+            var missing = numbers.filter(function(number) { return !(number in chunks); });
+            var pending = missing.length;
+            if (!pending) {
+                done(chunks);
+                return;
+            }
+            missing.forEach(function(number) {
+                var script = document.createElement('script');
+                script.src = table.attr('data-chunk-url') + ('0000' + number).slice(-5) + '.js';
+                script.onload = script.onerror = function() {
+                    document.head.removeChild(script);
+                    if (!(number in chunks)) chunks[number] = [];  // could not be loaded
+                    if (--pending == 0) done(chunks);
+                };
+                document.head.appendChild(script);
+            });
+        }
+        function ileappCellText(cell) {
+            return String(cell).replace(/<[^>]*>/g, '').toLowerCase();
+        }
+        function ileappCompareCells(a, b) {
+            if (a !== '' && b !== '' && !isNaN(a) && !isNaN(b)) return a - b;
+            return a < b ? -1 : (a > b ? 1 : 0);
+        }
+        function ileappGetTableRows(table, request, done) {
+            var rows = +table.attr('data-rows'), chunkRows = +table.attr('data-chunk-rows');
+            var terms = request.search.value.toLowerCase().split(/\s+/).filter(Boolean);
+            var first = 0, last = Math.ceil(rows / chunkRows);
+            if (!terms.length && !request.order.length) {
+                first = Math.floor(request.start / chunkRows);
+                last = Math.min(last, Math.ceil((request.start + request.length) / chunkRows));
+            }
+            var numbers = [];
+            for (var number = first; number < last; number++) numbers.push(number);
+            ileappLoadTableChunks(table, numbers, function(chunks) {
+                var data = [].concat.apply([], numbers.map(function(number) { return chunks[number]; }));
+                if (!terms.length && !request.order.length) {
+                    var start = request.start - first * chunkRows;
+                    done(data.slice(start, start + request.length), rows);
+                    return;
+                }
+                var texts = data.map(function(row) { return row.map(ileappCellText); });
+                var indexes = [];
+                texts.forEach(function(text, i) {
+                    var rowText = text.join(' ');
+                    if (terms.every(function(term) { return rowText.indexOf(term) >= 0; })) indexes.push(i);
+                });
+                indexes.sort(function(a, b) {
+                    for (var i = 0; i < request.order.length; i++) {
+                        var column = request.order[i].column;
+                        var result = ileappCompareCells(texts[a][column], texts[b][column]);
+                        if (result) return request.order[i].dir == 'desc' ? -result : result;
+                    }
+                    return a - b;
+                });
+                done(indexes.slice(request.start, request.start + request.length).map(function(i) { return data[i]; }),
+                     indexes.length);
+            });
+        }
+        $(document).ready(function() {
+            $('.table-paged').each(function() {
+                var table = $(this);
+                table.DataTable({
+                    "serverSide": true,
+                    "ajax": function(request, callback) {
+                        ileappGetTableRows(table, request, function(data, filtered) {
+                            callback({"draw": request.draw, "recordsTotal": +table.attr('data-rows'),
+                                      "recordsFiltered": filtered, "data": data});
+                        });
+                    },
+                    "order": [],
+                    "aLengthMenu": [[ 15, 50, 100, 1000 ], [ 15, 50, 100, 1000 ]],
+                });
+            });
+            $('.dataTables_length').addClass('bs-select');
+            $('#mySpinner').remove();
+        });
+    </script>
+"""
+
 page_footer = \
 """
     </body>
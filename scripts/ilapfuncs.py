@@ -2,13 +2,17 @@
 import codecs
 import csv
 from datetime import *
+import json
 import os
 import re
 import shutil
 import sqlite3
 import sys
+from collections import OrderedDict
+from contextlib import nullcontext
 from functools import lru_cache
 from pathlib import Path
+from time import perf_counter
 
 # common third party imports
 import pytz
@@ -21,6 +25,13 @@ import binascii
 import math
 from PIL import Image
 
+# optional third party imports
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
 
 os.path.basename = lru_cache(maxsize=None)(os.path.basename)
 
@@ -28,25 +39,55 @@ thumbnail_root = '**/Media/PhotoData/Thumbnails/**/'
 media_root = '**/Media/'
 thumb_size = 256, 256
 
+# Serializes writes to the shared log, TSV, timeline and KML outputs. Replaced by
+# a multiprocessing lock when artifacts are parsed by several worker processes.
+_output_lock = nullcontext()
+
+def set_output_lock(lock):
+    '''Sets the lock guarding writes to files shared by all artifacts'''
+    global _output_lock
+    _output_lock = lock if lock is not None else nullcontext()
+
+# Serializes the building of working copies of input files shared by several artifacts (eg: the indexed copy of
+# Photos.sqlite), so that worker processes wait for the copy instead of making their own. Separate from the output
+# lock, as a build can take minutes and the other artifacts must keep writing their outputs meanwhile.
+_working_copy_lock = nullcontext()
+
+def set_working_copy_lock(lock):
+    '''Sets the lock guarding the building of shared working copies'''
+    global _working_copy_lock
+    _working_copy_lock = lock if lock is not None else nullcontext()
+
+def get_working_copy_lock():
+    return _working_copy_lock
+
 class OutputParameters:
     '''Defines the parameters that are common for '''
     # static parameters
     nl = '\n'
     screen_output_file_path = ''
+    parquet_export = False  # also write the tables passed to tsv() as Parquet files, requires pyarrow
+    paged_table_rows = None  # HTML tables with more rows load them from data files, see ArtifactHtmlReport
+    image_thumbnails = None  # 'webp' or 'jpeg': pages show thumbnails of the images decoded from KTX files
 
-    def __init__(self, output_folder):
-        now = datetime.now()
-        currenttime = str(now.strftime('%Y-%m-%d_%A_%H%M%S'))
-        self.report_folder_base = os.path.join(output_folder,
-                                               'iLEAPP_Reports_' + currenttime)  # aleapp , aleappGUI, ileap_artifacts, report.py
+    def __init__(self, output_folder, report_folder_base=None):
+        '''A new timestamped report folder is created in output_folder, unless the folder of an existing report is
+           given in report_folder_base (to resume it)'''
+        if report_folder_base:
+            self.report_folder_base = report_folder_base
+        else:
+            now = datetime.now()
+            currenttime = str(now.strftime('%Y-%m-%d_%A_%H%M%S'))
+            self.report_folder_base = os.path.join(output_folder,
+                                                   'iLEAPP_Reports_' + currenttime)  # aleapp , aleappGUI, ileap_artifacts, report.py
         self.temp_folder = os.path.join(self.report_folder_base, 'temp')
         OutputParameters.screen_output_file_path = os.path.join(self.report_folder_base, 'Script Logs',
                                                                 'Screen Output.html')
         OutputParameters.screen_output_file_path_devinfo = os.path.join(self.report_folder_base, 'Script Logs',
                                                                         'DeviceInfo.html')
 
-        os.makedirs(os.path.join(self.report_folder_base, 'Script Logs'))
-        os.makedirs(self.temp_folder)
+        os.makedirs(os.path.join(self.report_folder_base, 'Script Logs'), exist_ok=bool(report_folder_base))
+        os.makedirs(self.temp_folder, exist_ok=bool(report_folder_base))
         
 def convert_local_to_utc(local_timestamp_str):
     # Parse the timestamp string with timezone offset, ex. 2023-10-27 18:18:29-0400
@@ -209,18 +250,230 @@ def get_next_unused_name(path):
         num += 1
     return os.path.join(folder, new_name)
 
+# Time spent in SQLite by this process, {(db path, sql): [number of executions, seconds]}
+_sqlite_query_stats = {}
+_sqlite_query_stats_max_entries = 10000
+
+def _add_sqlite_query_time(db_path, sql, seconds, executions=0):
+    key = (db_path, sql)
+    if key not in _sqlite_query_stats and len(_sqlite_query_stats) >= _sqlite_query_stats_max_entries:
+        key = (db_path, '(other queries)')
+    stats = _sqlite_query_stats.setdefault(key, [0, 0.0])
+    stats[0] += executions
+    stats[1] += seconds
+
+def get_sqlite_query_stats(reset=False):
+    '''Returns the time spent in SQLite by connections of open_sqlite_db_readonly() in this process, as a dictionary
+       {(db path, sql): [number of executions, seconds]}. Fetching rows counts towards the query that returned them'''
+    global _sqlite_query_stats
+    stats = _sqlite_query_stats
+    if reset:
+        _sqlite_query_stats = {}
+    return stats
+
+_report_outputs = []  # report files written in this process since the last get_report_outputs(reset=True)
+_report_outputs_journal = None  # lists the report files of the artifact being parsed, see start_report_outputs()
+
+def start_report_outputs(journal_path):
+    '''Called by the engine before an artifact is parsed: the report files it writes are also listed in journal_path
+       as they are created, so that they are deleted on resume if the run is killed before the artifact is recorded'''
+    global _report_outputs_journal
+    os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+    open(journal_path, 'w', encoding='utf8').close()
+    _report_outputs_journal = journal_path
+
+def add_report_output(path):
+    '''Records a file or folder written to the report for an artifact, so that it can be deleted when the artifact is
+       parsed again in a resumed run'''
+    if _report_outputs_journal is not None and path not in _report_outputs:
+        with open(_report_outputs_journal, 'a', encoding='utf8') as journal:
+            journal.write(path + '\n')
+    _report_outputs.append(path)
+
+def get_report_outputs(reset=False):
+    '''Returns the paths passed to add_report_output() in this process'''
+    global _report_outputs, _report_outputs_journal
+    outputs = _report_outputs
+    if reset:
+        _report_outputs = []
+        _report_outputs_journal = None
+    return outputs
+
+_output_rows = {'html': 0, 'tsv': 0, 'timeline': 0}  # rows written in this process, see get_output_row_counts()
+
+def count_output_rows(kind, rows):
+    '''Counts rows written to the report, kind is html, tsv or timeline'''
+    _output_rows[kind] += rows
+
+def get_output_row_counts(reset=False):
+    '''Returns {kind: rows} of the rows passed to count_output_rows() in this process'''
+    counts = dict(_output_rows)
+    if reset:
+        _output_rows.update(dict.fromkeys(_output_rows, 0))
+    return counts
+
+def get_sqlite_query_time():
+    '''Returns (number of executions, seconds) of all the queries in get_sqlite_query_stats()'''
+    return (sum(executions for executions, seconds in _sqlite_query_stats.values()),
+            sum(seconds for executions, seconds in _sqlite_query_stats.values()))
+
+def add_sqlite_query_stats(stats):
+    '''Adds stats returned by get_sqlite_query_stats() in another process'''
+    for (db_path, sql), (executions, seconds) in stats.items():
+        _add_sqlite_query_time(db_path, sql, seconds, executions)
+
+class _TimedCursor(sqlite3.Cursor):
+    '''Cursor that adds the time spent executing queries and fetching their rows with fetchone(), fetchmany() or
+       fetchall() to the query stats. Rows read by iterating the cursor are not timed, as timing each row costs
+       more than reading it; execute() still includes the time to the first row'''
+    _sql = ''
+
+    def _add_time(self, start, executions=0):
+        _add_sqlite_query_time(getattr(self.connection, 'db_path', ''), self._sql, perf_counter() - start, executions)
+
+    def execute(self, sql, parameters=()):
+        self._sql = sql
+        start = perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._add_time(start, 1)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._sql = sql
+        start = perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._add_time(start, 1)
+
+    def executescript(self, sql_script):
+        self._sql = sql_script
+        start = perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._add_time(start, 1)
+
+    def fetchone(self):
+        start = perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._add_time(start)
+
+    def fetchmany(self, size=None):
+        start = perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._add_time(start)
+
+    def fetchall(self):
+        start = perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._add_time(start)
+
+class _SharedConnection(sqlite3.Connection):
+    '''Read-only connection kept open by open_sqlite_db_readonly() for the artifacts opening the same database.
+       close() leaves it open, close_sqlite_dbs() closes it'''
+    db_path = ''
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or _TimedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def close(self):
+        pass
+
+    def reset(self):
+        '''Restores the settings an artifact may have changed and detaches the databases it attached'''
+        self.row_factory = None
+        self.text_factory = str
+        try:
+            for row in self.execute('PRAGMA database_list').fetchall():
+                if row[1] not in ('main', 'temp'):
+                    self.execute(f'DETACH DATABASE "{row[1]}"')
+        except sqlite3.Error:
+            pass
+
+_sqlite_dbs = OrderedDict()  # db path -> _SharedConnection, least recently opened first
+_sqlite_dbs_in_use = set()  # db paths returned during the current artifact, their connections are not closed
+sqlite_dbs_max_open = 16
+sqlite_read_pragmas = (
+    'PRAGMA query_only = ON',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA cache_size = -32768',  # 32 MB
+    'PRAGMA temp_store = MEMORY',
+)
+
 def open_sqlite_db_readonly(path):
-    '''Opens an sqlite db in read-only mode, so original db (and -wal/journal are intact)'''
+    '''Opens an sqlite db in read-only mode, so original db (and -wal/journal are intact).
+       The connection is shared with the other artifacts of this process that open the same db: it is reset when
+       returned again, and its close() does nothing. A -wal, -shm or -journal path opens its database, which
+       includes the content of its -wal file'''
+    path = str(path)
+    for suffix in ('-wal', '-shm', '-journal'):
+        if path.endswith(suffix) and os.path.isfile(path[:-len(suffix)]):
+            path = path[:-len(suffix)]
+    _sqlite_dbs_in_use.add(path)
+    db = _sqlite_dbs.get(path)
+    if db is not None:
+        _sqlite_dbs.move_to_end(path)
+        db.reset()
+        return db
+
+    uri_path = path
     if is_platform_windows():
-        if path.startswith('\\\\?\\UNC\\'): # UNC long path
-            path = "%5C%5C%3F%5C" + path[4:]
-        elif path.startswith('\\\\?\\'):    # normal long path
-            path = "%5C%5C%3F%5C" + path[4:]
-        elif path.startswith('\\\\'):       # UNC path
-            path = "%5C%5C%3F%5C\\UNC" + path[1:]
+        if uri_path.startswith('\\\\?\\UNC\\'): # UNC long path
+            uri_path = "%5C%5C%3F%5C" + uri_path[4:]
+        elif uri_path.startswith('\\\\?\\'):    # normal long path
+            uri_path = "%5C%5C%3F%5C" + uri_path[4:]
+        elif uri_path.startswith('\\\\'):       # UNC path
+            uri_path = "%5C%5C%3F%5C\\UNC" + uri_path[1:]
         else:                               # normal path
-            path = "%5C%5C%3F%5C" + path
-    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            uri_path = "%5C%5C%3F%5C" + uri_path
+    db = sqlite3.connect(f"file:{uri_path}?mode=ro", uri=True, factory=_SharedConnection)
+    db.db_path = path
+    try:
+        for pragma in sqlite_read_pragmas:
+            sqlite3.Connection.execute(db, pragma)  # not counted as artifact query time
+    except sqlite3.DatabaseError:
+        pass  # not a database, the artifact gets the error from its own queries
+    _sqlite_dbs[path] = db
+    _close_unused_sqlite_dbs()
+    return db
+
+def _close_unused_sqlite_dbs():
+    '''Closes the least recently opened connections over sqlite_dbs_max_open that the current artifact did not get,
+       it may still be using the others'''
+    for path in list(_sqlite_dbs):
+        if len(_sqlite_dbs) <= sqlite_dbs_max_open:
+            break
+        if path not in _sqlite_dbs_in_use:
+            sqlite3.Connection.close(_sqlite_dbs.pop(path))
+
+def release_sqlite_dbs():
+    '''Called by the engine after each artifact, so that the connections it got can be closed again'''
+    _sqlite_dbs_in_use.clear()
+    _close_unused_sqlite_dbs()
+
+def close_sqlite_dbs():
+    '''Closes the connections shared by open_sqlite_db_readonly()'''
+    _sqlite_dbs_in_use.clear()
+    while _sqlite_dbs:
+        path, db = _sqlite_dbs.popitem()
+        sqlite3.Connection.close(db)
 
 
 def does_column_exist_in_db(db, table_name, col_name):
@@ -283,16 +536,27 @@ def logfunc(message=""):
         log_text = GuiWindow.window_handle.nametowidget('logs_frame.log_text')
         sys.stdout.write = redirect_logs
 
-    with open(OutputParameters.screen_output_file_path, 'a', encoding='utf8') as a:
+    with _output_lock, open(OutputParameters.screen_output_file_path, 'a', encoding='utf8') as a:
         print(message)
         a.write(message + '<br>' + OutputParameters.nl)
 
 
 def logdevinfo(message=""):
-    with open(OutputParameters.screen_output_file_path_devinfo, 'a', encoding='utf8') as b:
+    with _output_lock, open(OutputParameters.screen_output_file_path_devinfo, 'a', encoding='utf8') as b:
         b.write(message + '<br>' + OutputParameters.nl)
 
 def tsv(report_folder, data_headers, data_list, tsvname):
+    count_output_rows('tsv', len(data_list))
+    with _output_lock:
+        _tsv(report_folder, data_headers, data_list, tsvname)
+    if OutputParameters.parquet_export:
+        try:
+            parquet_writer.add(report_folder, data_headers, data_list, tsvname)
+        except (OSError, pyarrow.ArrowException, TypeError, ValueError) as ex:
+            # the TSV file is written, the artifact goes on without this Parquet export
+            logfunc(f'Could not export {tsvname} to Parquet: {ex}')
+
+def _tsv(report_folder, data_headers, data_list, tsvname):
     report_folder = report_folder.rstrip('/')
     report_folder = report_folder.rstrip('\\')
     report_folder_base, tail = os.path.split(report_folder)
@@ -304,48 +568,228 @@ def tsv(report_folder, data_headers, data_list, tsvname):
         os.makedirs(tsv_report_folder)
     
     
+    add_report_output(os.path.join(tsv_report_folder, tsvname +'.tsv'))
     with codecs.open(os.path.join(tsv_report_folder, tsvname +'.tsv'), 'a', 'utf-8-sig') as tsvfile:
         tsv_writer = csv.writer(tsvfile, delimiter='\t')
         tsv_writer.writerow(data_headers)
         for i in data_list:
             tsv_writer.writerow(i)
             
-def timeline(report_folder, tlactivity, data_list, data_headers):
-    report_folder = report_folder.rstrip('/')
-    report_folder = report_folder.rstrip('\\')
-    report_folder_base, tail = os.path.split(report_folder)
-    tl_report_folder = os.path.join(report_folder_base, '_Timeline')
+def get_unique_headers(data_headers):
+    '''Returns the headers as unique names, a repeated header is followed by _2, _3...'''
+    names = []
+    for header in data_headers:
+        name = str(header)
+        count = 1
+        while name in names:
+            count += 1
+            name = f'{header}_{count}'
+        names.append(name)
+    return names
 
-    if os.path.isdir(tl_report_folder):
-        tldb = os.path.join(tl_report_folder, 'tl.db')
-        db = sqlite3.connect(tldb)
-        cursor = db.cursor()
-        cursor.execute('''PRAGMA synchronous = EXTRA''')
-        cursor.execute('''PRAGMA journal_mode = WAL''')
-        db.commit()
-    else:
-        os.makedirs(tl_report_folder)
-        # create database
-        tldb = os.path.join(tl_report_folder, 'tl.db')
-        db = sqlite3.connect(tldb, isolation_level = 'exclusive')
-        cursor = db.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE data(key TEXT, activity TEXT, datalist TEXT)
-            """
-        )
-        db.commit()
-    
-    a = 0
-    length = (len(data_list))
-    while a < length: 
-        modifiedList = list(map(lambda x, y: x.upper() + ': ' +  str(y), data_headers, data_list[a]))
-        cursor.executemany("INSERT INTO data VALUES(?,?,?)", [(str(data_list[a][0]), tlactivity.upper(), str(modifiedList))])
-        a += 1
-    db.commit()
-    db.close()
+class ParquetWriter:
+    '''Writes the tables passed to tsv() as Parquet files in _Parquet Exports, with typed columns, so they can be
+       loaded for analysis without parsing text. Files stay open while an artifact adds rows to them, each call
+       appends row groups of at most row_group_size rows. close() finishes the files, the engine calls it after
+       each artifact.
+
+       Column types are guessed from the first rows written to a file: bool, int64, float64, timestamp (UTC for
+       dates with a timezone), binary or else string. Empty strings are null in columns that are not strings.
+       Rows that do not fit the types of an open file go to a new file (name followed by a number).
+    '''
+    row_group_size = 65536
+
+    def __init__(self):
+        self._writers = {}  # tsvname -> (pyarrow.parquet.ParquetWriter, schema)
+
+    @staticmethod
+    def get_type(values):
+        '''Returns the pyarrow type for a column of values'''
+        kinds = {type(value) for value in values if value is not None and value != ''}
+        if not kinds or kinds == {str}:
+            return pyarrow.string()
+        if kinds == {bool}:
+            return pyarrow.bool_()
+        if kinds == {int}:
+            if all(-2**63 <= value < 2**63 for value in values if value is not None and value != ''):
+                return pyarrow.int64()
+            return pyarrow.string()
+        if kinds <= {int, float}:
+            return pyarrow.float64()
+        if kinds == {datetime}:
+            aware = {value.tzinfo is not None for value in values if isinstance(value, datetime)}
+            if aware == {True}:
+                return pyarrow.timestamp('us', tz='UTC')
+            if aware == {False}:
+                return pyarrow.timestamp('us')
+        if kinds <= {bytes, bytearray, memoryview}:
+            return pyarrow.binary()
+        return pyarrow.string()
+
+    @staticmethod
+    def get_value(value, data_type):
+        '''Converts value for a column of type data_type'''
+        if value is None:
+            return None
+        if data_type == pyarrow.string():
+            return value if isinstance(value, str) else str(value)
+        if value == '':
+            return None
+        if pyarrow.types.is_timestamp(data_type) and data_type.tz is not None:
+            return value.astimezone(timezone.utc)
+        if pyarrow.types.is_binary(data_type):
+            return bytes(value)
+        return value
+
+    def _get_table(self, columns, schema):
+        return pyarrow.Table.from_arrays(
+            [pyarrow.array([self.get_value(value, field.type) for value in column], type=field.type)
+             for column, field in zip(columns, schema)], schema=schema)
+
+    def _open(self, report_folder, tsvname, schema):
+        report_folder = report_folder.rstrip('/')
+        report_folder = report_folder.rstrip('\\')
+        report_folder_base, tail = os.path.split(report_folder)
+        parquet_report_folder = os.path.join(report_folder_base, '_Parquet Exports')
+        with _output_lock:
+            os.makedirs(parquet_report_folder, exist_ok=True)
+            path = get_next_unused_name(os.path.join(parquet_report_folder, tsvname + '.parquet'))
+            writer = pyarrow.parquet.ParquetWriter(path, schema)
+        add_report_output(path)
+        self._writers[tsvname] = (writer, schema)
+        return writer
+
+    def add(self, report_folder, data_headers, data_list, tsvname):
+        names = get_unique_headers(data_headers)
+        writer, schema = self._writers.get(tsvname, (None, None))
+        for start in range(0, len(data_list), self.row_group_size):
+            rows = data_list[start:start + self.row_group_size]
+            columns = [[row[i] if i < len(row) else None for row in rows] for i in range(len(names))]
+            table = None
+            if writer is not None and schema.names == names:
+                try:
+                    table = self._get_table(columns, schema)
+                except (pyarrow.ArrowException, AttributeError, TypeError, ValueError):
+                    pass  # the rows do not fit the column types of the open file
+            if table is None:
+                self.close(tsvname)
+                schema = pyarrow.schema([(name, self.get_type(column)) for name, column in zip(names, columns)])
+                writer = self._open(report_folder, tsvname, schema)
+                table = self._get_table(columns, schema)
+            writer.write_table(table)
+
+    def close(self, tsvname=None):
+        '''Finishes the file of tsvname, or all open files'''
+        for name in [tsvname] if tsvname is not None else list(self._writers):
+            if name in self._writers:
+                writer, schema = self._writers.pop(name)
+                try:
+                    writer.close()
+                except (OSError, pyarrow.ArrowException) as ex:
+                    logfunc(f'Could not finish the Parquet export of {name}: {ex}')
+
+parquet_writer = ParquetWriter()
+
+class TimelineWriter:
+    '''Buffers the rows passed to timeline() and writes them to _Timeline/tl.db in batches, in one transaction per
+       batch over a single connection per process. close() writes the remaining rows, the engine calls it once the
+       artifacts are parsed (and after each artifact in worker processes).
+
+       Table data has the columns:
+           key       first value of the row, as text
+           activity  timeline activity, upper case
+           datalist  JSON object {header: value} of the row, repeated headers are followed by _2, _3...
+           timestamp the key parsed as a date, in seconds since 1970-01-01 UTC (NULL if it is not a date)
+           module    name of the artifact that added the row
+    '''
+    batch_size = 50000
+
+    def __init__(self):
+        self.module = ''  # artifact being parsed, set by the engine
+        self._db = None
+        self._db_path = None
+        self._rows = []
+
+    @staticmethod
+    def get_timestamp(value):
+        '''Returns the unix time of a datetime or ISO 8601 string, None if value is not a date.
+           Dates without a timezone are taken as UTC'''
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value.strip())
+            except ValueError:
+                return None
+        if not isinstance(value, datetime):
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        try:
+            return value.timestamp()
+        except (OverflowError, OSError, ValueError):
+            return None
+
+    def add(self, report_folder, tlactivity, data_list, data_headers):
+        report_folder = report_folder.rstrip('/')
+        report_folder = report_folder.rstrip('\\')
+        report_folder_base, tail = os.path.split(report_folder)
+        db_path = os.path.join(report_folder_base, '_Timeline', 'tl.db')
+        if db_path != self._db_path:
+            self.close()
+            self._db_path = db_path
+
+        activity = tlactivity.upper()
+        names = get_unique_headers(data_headers)  # values of repeated headers would be lost in the JSON object
+        for row in data_list:
+            datalist = json.dumps(dict(zip(names, row)), default=str, ensure_ascii=False)
+            self._rows.append((str(row[0]), activity, datalist, self.get_timestamp(row[0]), self.module))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        self._db = sqlite3.connect(self._db_path, timeout=60)
+        self._db.execute('PRAGMA journal_mode = WAL')
+        # a resumed run keeps the rows of the artifacts already parsed, so a crash must not corrupt the database.
+        # In WAL mode NORMAL only syncs at checkpoints, and committed rows survive the process being killed
+        self._db.execute('PRAGMA synchronous = NORMAL')
+        self._db.execute('PRAGMA temp_store = MEMORY')
+        with self._db:
+            self._db.execute('''CREATE TABLE IF NOT EXISTS data(key TEXT, activity TEXT, datalist TEXT, timestamp REAL,
+                                module TEXT)''')
+            self._db.execute('CREATE INDEX IF NOT EXISTS data_timestamp ON data(timestamp)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS data_activity ON data(activity)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS data_module ON data(module)')
+
+    def flush(self):
+        '''Writes the buffered rows to the database'''
+        if not self._rows:
+            return
+        with _output_lock:
+            if self._db is None:
+                self._connect()
+            with self._db:
+                self._db.executemany('INSERT INTO data VALUES(?,?,?,?,?)', self._rows)
+        self._rows = []
+
+    def close(self):
+        '''Writes the buffered rows and closes the database connection'''
+        self.flush()
+        if self._db is not None:
+            with _output_lock:  # the last connection closed merges the WAL file into the database
+                self._db.close()
+            self._db = None
+
+timeline_writer = TimelineWriter()
+
+def timeline(report_folder, tlactivity, data_list, data_headers):
+    count_output_rows('timeline', len(data_list))
+    timeline_writer.add(report_folder, tlactivity, data_list, data_headers)
 
 def kmlgen(report_folder, kmlactivity, data_list, data_headers):
+    with _output_lock:
+        _kmlgen(report_folder, kmlactivity, data_list, data_headers)
+
+def _kmlgen(report_folder, kmlactivity, data_list, data_headers):
     report_folder = report_folder.rstrip('/')
     report_folder = report_folder.rstrip('\\')
     report_folder_base, tail = os.path.split(report_folder)
@@ -388,6 +832,7 @@ def kmlgen(report_folder, kmlactivity, data_list, data_headers):
     db.commit()
     db.close()
     kml.save(os.path.join(kml_report_folder, f'{kmlactivity}.kml'))
+    add_report_output(os.path.join(kml_report_folder, f'{kmlactivity}.kml'))
     
 ''' Returns string of printable characters. Replacing non-printable characters
 with '.', or CHR(46)
@@ -402,6 +847,36 @@ def strings(data):
     cleansed = "".join([chr(byte) if byte >= 0x20 and byte < 0x7F else chr(0) for byte in data])
     return filter(lambda string: len(string) >= 4, cleansed.split(chr(0)))
 
+# Runs of 4+ printable ASCII chars (group 1) or UTF-16LE chars (group 2), same set as string.printable
+_printable_bytes = rb'[\x20-\x7e\t\n\r\x0b\x0c]'
+_strings_bytes_re = re.compile(rb'(' + _printable_bytes + rb'{4,})|((?:' + _printable_bytes + rb'\x00){4,})')
+
+def write_unique_strings(data, output_file):
+    '''Scans data (any bytes-like object, eg: a memoryview of a mapped file) for ASCII and UTF-16LE strings and
+       writes each unique one to output_file (binary) as ASCII, one per line, as they are found.
+       Returns the number of strings written'''
+    unique_items = set()
+    for match in _strings_bytes_re.finditer(data):
+        item = match.group(1) or match.group(2)[::2]
+        if item not in unique_items:
+            unique_items.add(item)
+            output_file.write(item + b'\n')
+    return len(unique_items)
+
+def extract_strings_to_file(file_path, output_path, seeker=None):
+    '''Writes the unique strings of the file at file_path to output_path, which is removed if there are none.
+       The file is memory mapped through seeker.open_mapped(). As it can run in a worker process, errors are
+       returned rather than logged. Returns (number of strings, error message or None)'''
+    from scripts.search_files import FileSeekerBase
+    try:
+        with (seeker or FileSeekerBase()).open_mapped(file_path) as mapped, open(output_path, 'wb') as output_file:
+            count = write_unique_strings(mapped.view, output_file)
+        if not count:
+            os.remove(output_path)
+        return count, None
+    except (OSError, ValueError) as ex:
+        return 0, f'Could not extract strings from {file_path}: {ex}'
+
 ''' Retuns HTML table of the hexdump of the passed in data.
 '''
 def generate_hexdump(data, char_per_row = 5):
@@ -474,10 +949,54 @@ def generate_thumbnail(imDirectory, imFilename, seeker, report_folder):
                 pass #unsupported format
     return htmlThumbTag
 
-def media_to_html(media_path, files_found, report_folder):
+class MediaResolver:
+    '''Index of the paths in files_found by basename, to look up the media files referenced by a database without
+       scanning files_found for every row'''
+    def __init__(self, files_found):
+        self.files_found = files_found
+        self.count = len(files_found)
+        self._names = {}  # normcased basename -> [paths], in files_found order
+        for path in files_found:
+            path = str(path)
+            self._names.setdefault(os.path.normcase(os.path.basename(path)), []).append(path)
+
+    def find_by_name(self, name):
+        '''Returns the paths named name'''
+        return self._names.get(os.path.normcase(name), [])
+
+    def resolve_suffix(self, suffix):
+        '''Returns the paths ending with the path suffix at a path component, eg: Media/<chat>/a/b/<file>.jpg'''
+        suffix = os.path.normcase(suffix)
+        paths = []
+        for path in self.find_by_name(suffix.rsplit(os.sep, 1)[-1]):
+            normcased = os.path.normcase(path)
+            if normcased.endswith(suffix) and (len(normcased) == len(suffix) or suffix.startswith(os.sep)
+                                               or normcased[-len(suffix) - 1] == os.sep):
+                paths.append(path)
+        return paths
 
-    def media_path_filter(name):
-        return media_path in name
+
+_media_resolver = None
+_copied_media = set()  # (source, destination) of files copied by copy_media_file()
+
+def get_media_resolver(files_found):
+    '''Returns a MediaResolver for files_found, reused as long as the same list is passed and not added to'''
+    global _media_resolver
+    if _media_resolver is None or _media_resolver.files_found is not files_found \
+            or _media_resolver.count != len(files_found):
+        _media_resolver = MediaResolver(files_found)
+    return _media_resolver
+
+def copy_media_file(path, folder):
+    '''Copies the file at path into folder, unless it was already copied there. Returns the path of the copy'''
+    destination = os.path.join(folder, os.path.basename(path))
+    if (path, destination) not in _copied_media:
+        os.makedirs(folder, exist_ok=True)
+        shutil.copy2(path, folder)
+        _copied_media.add((path, destination))
+    return destination
+
+def media_to_html(media_path, files_found, report_folder):
 
     def relative_paths(source, splitter):
         splitted_a = source.split(splitter)
@@ -496,10 +1015,10 @@ def media_to_html(media_path, files_found, report_folder):
         splitter = '/'
 
     thumb = media_path
-    for match in filter(media_path_filter, files_found):
+    matches = [] if media_path.startswith(('~', '._')) else get_media_resolver(files_found).find_by_name(media_path)
+    if matches:
+        match = matches[-1]  # the last match is the one shown
         filename = os.path.basename(match)
-        if filename.startswith('~') or filename.startswith('._') or filename != media_path:
-            continue
 
         dirs = os.path.dirname(report_folder)
         dirs = os.path.dirname(dirs)
@@ -510,13 +1029,9 @@ def media_to_html(media_path, files_found, report_folder):
         else:
             path = os.path.dirname(match)
             dirname = os.path.basename(path)
-            filename = Path(match)
-            filename = filename.name
             locationfiles = Path(report_folder).joinpath(dirname)
-            Path(f'{locationfiles}').mkdir(parents=True, exist_ok=True)
-            shutil.copy2(match, locationfiles)
-            source = Path(locationfiles, filename)
-            source = relative_paths(str(source), splitter)
+            source = copy_media_file(match, str(locationfiles))
+            source = relative_paths(source, splitter)
 
         mimetype = guess_mime(match)
         if mimetype == None:
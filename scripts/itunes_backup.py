@@ -0,0 +1,148 @@
+# Decryption of encrypted iTunes backups (iOS 10.2 and later, with a Manifest.db).
+#
+# Manifest.plist holds the backup keybag, whose class keys are wrapped with a key derived from the backup password,
+# and the wrapped key of Manifest.db. Each file of the backup has its own key, wrapped with the key of its protection
+# class and stored in the NSKeyedArchiver plist of its row in the Files table. Files are encrypted with AES-256-CBC
+# (zero IV) and padded to 16 bytes.
+
+import hashlib
+import os
+import plistlib
+import struct
+
+from Crypto.Cipher import AES
+
+DECRYPT_CHUNK_SIZE = 1024 * 1024  # multiple of the AES block size
+
+WRAP_PASSCODE = 2  # class key wrapped with the passcode (backup password) key
+_class_key_tags = (b'CLAS', b'WRAP', b'WPKY', b'KTYP', b'PBKY')
+
+
+def aes_unwrap(kek, wrapped):
+    '''Unwraps a key with the AES key wrap algorithm (RFC 3394), returns None if the integrity check fails'''
+    n = len(wrapped) // 8 - 1
+    blocks = [wrapped[i * 8:i * 8 + 8] for i in range(n + 1)]
+    a = struct.unpack('>Q', blocks[0])[0]
+    ecb = AES.new(kek, AES.MODE_ECB)
+    for j in range(5, -1, -1):
+        for i in range(n, 0, -1):
+            b = ecb.decrypt(struct.pack('>Q', a ^ (n * j + i)) + blocks[i])
+            a = struct.unpack('>Q', b[:8])[0]
+            blocks[i] = b[8:]
+    if a != 0xA6A6A6A6A6A6A6A6:
+        return None
+    return b''.join(blocks[1:])
+
+
+class Keybag:
+    '''Backup keybag of Manifest.plist, unlock() it with the backup password to unwrap the keys of the files'''
+    def __init__(self, data):
+        self.attributes = {}
+        self.class_keys = {}  # protection class -> {tag: value}, with b'KEY' once unlocked
+        class_key = None
+        pos = 0
+        while pos + 8 <= len(data):
+            tag = data[pos:pos + 4]
+            length = struct.unpack('>I', data[pos + 4:pos + 8])[0]
+            value = data[pos + 8:pos + 8 + length]
+            pos += 8 + length
+            if length == 4:
+                value = struct.unpack('>I', value)[0]
+            if tag == b'UUID' and b'UUID' in self.attributes:
+                if class_key:
+                    self.class_keys[class_key[b'CLAS']] = class_key
+                class_key = {tag: value}
+            elif class_key is not None and tag in _class_key_tags:
+                class_key[tag] = value
+            else:
+                self.attributes.setdefault(tag, value)
+        if class_key:
+            self.class_keys[class_key[b'CLAS']] = class_key
+
+    def unlock(self, password):
+        '''Unwraps the class keys with the backup password. Returns False if the password is wrong'''
+        if isinstance(password, str):
+            password = password.encode('utf8')
+        key = password
+        if b'DPSL' in self.attributes:
+            key = hashlib.pbkdf2_hmac('sha256', key, self.attributes[b'DPSL'], self.attributes[b'DPIC'], 32)
+        key = hashlib.pbkdf2_hmac('sha1', key, self.attributes[b'SALT'], self.attributes[b'ITER'], 32)
+        for class_key in self.class_keys.values():
+            if b'WPKY' in class_key and class_key.get(b'WRAP', 0) & WRAP_PASSCODE:
+                unwrapped = aes_unwrap(key, class_key[b'WPKY'])
+                if unwrapped is None:
+                    return False
+                class_key[b'KEY'] = unwrapped
+        return True
+
+    def unwrap_key(self, protection_class, wrapped_key):
+        '''Returns the key of a file or of Manifest.db from its wrapped key and protection class'''
+        class_key = self.class_keys.get(protection_class, {}).get(b'KEY')
+        if class_key is None:
+            raise ValueError(f'No key for protection class {protection_class}')
+        key = aes_unwrap(class_key, wrapped_key)
+        if key is None:
+            raise ValueError(f'Could not unwrap a key of protection class {protection_class}')
+        return key
+
+
+def read_backup_manifest(directory):
+    '''Returns the content of the Manifest.plist of a backup, an empty dictionary if there is none'''
+    path = os.path.join(directory, 'Manifest.plist')
+    if not os.path.isfile(path):
+        return {}
+    with open(path, 'rb') as f:
+        return plistlib.load(f)
+
+def open_backup_keybag(manifest, password):
+    '''Returns the unlocked Keybag of an encrypted backup from its Manifest.plist content'''
+    if not password:
+        raise ValueError('The iTunes backup is encrypted, its password is required')
+    keybag = Keybag(manifest['BackupKeyBag'])
+    if not keybag.unlock(password):
+        raise ValueError('Wrong password for the encrypted iTunes backup')
+    return keybag
+
+def decrypt_manifest_db(directory, manifest, keybag, target):
+    '''Decrypts the Manifest.db of an encrypted backup to target'''
+    manifest_key = manifest['ManifestKey']
+    key = keybag.unwrap_key(struct.unpack('<I', manifest_key[:4])[0], manifest_key[4:])
+    decrypt_file(os.path.join(directory, 'Manifest.db'), target, key)
+
+def get_file_encryption(file_plist):
+    '''Returns (protection class, wrapped key, size, modification time) of a file from the NSKeyedArchiver plist in
+       the file column of Manifest.db. The wrapped key is None for files that are not encrypted'''
+    archive = plistlib.loads(file_plist)
+    objects = archive['$objects']
+    root = objects[archive['$top']['root'].data]
+    wrapped_key = None
+    if 'EncryptionKey' in root:
+        encryption_key = objects[root['EncryptionKey'].data]
+        if isinstance(encryption_key, dict):
+            encryption_key = encryption_key['NS.data']
+        wrapped_key = encryption_key[4:]
+    return root.get('ProtectionClass'), wrapped_key, root.get('Size'), root.get('LastModified')
+
+def decrypt_file(source, target, key, size=None):
+    '''Decrypts the file at source to target in chunks. The padding is removed, or the output truncated to size
+       (the size of the original file) when it is known'''
+    cipher = AES.new(key, AES.MODE_CBC, b'\x00' * 16)
+    written = 0
+    with open(source, 'rb') as f, open(target, 'wb') as out:
+        previous = None
+        while True:
+            chunk = f.read(DECRYPT_CHUNK_SIZE)
+            if not chunk:
+                break
+            if previous is not None:
+                out.write(previous)
+                written += len(previous)
+            previous = cipher.decrypt(chunk)
+        if previous:
+            if size is None:
+                padding = previous[-1]
+                if 1 <= padding <= 16 and previous.endswith(bytes([padding]) * padding):
+                    previous = previous[:-padding]
+            else:
+                previous = previous[:max(size - written, 0)]
+            out.write(previous)
@@ -0,0 +1,92 @@
+# Conversion of the KTX textures saved by iOS (app snapshots, ...) to images shown in the report.
+#
+# Textures are read with the KTX_reader of scripts/ktx/ios_ktx2png: LZFSE decompression, then ASTC 4x4 decoding by
+# Pillow, then a PNG is written. Files are converted in the process of the artifact, artifacts run in parallel with
+# --workers. Files with the same content are converted once, their conversions share the same image. A downscaled
+# thumbnail (WebP or JPEG) can be saved next to each PNG, for report pages to show it with a link to the full image.
+
+import hashlib
+import os
+
+from PIL import Image, features
+
+from scripts.ilapfuncs import logfunc
+from scripts.ktx.ios_ktx2png import KTX_reader, liblzfse
+
+thumbnail_size = 400, 400
+thumbnail_formats = {'webp': ('WEBP', '.webp', {'quality': 80}), 'jpeg': ('JPEG', '.jpg', {'quality': 85})}
+
+
+def get_content_hash(path):
+    '''Returns the SHA-1 of the content of the file at path'''
+    content_hash = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+def get_thumbnail_path(png_path, thumbnail_format):
+    return os.path.splitext(png_path)[0] + '_thumb' + thumbnail_formats[thumbnail_format][1]
+
+def convert_ktx(ktx_path, png_path, thumbnail_format=None):
+    '''Saves the KTX file at ktx_path as a PNG at png_path, and a thumbnail of thumbnail_format ('webp' or 'jpeg')
+       if given. Returns (saved, thumbnail path or None, error message or None)'''
+    try:
+        with open(ktx_path, 'rb') as f:
+            ktx = KTX_reader()
+            if not ktx.validate_header(f):
+                return False, None, None
+            data = ktx.get_uncompressed_texture_data(f)
+        image = Image.frombytes('RGBA', (ktx.pixelWidth, ktx.pixelHeight), data, 'astc', (4, 4, False))
+        image.save(png_path, "PNG", compress_type=3)
+        #                           ^
+        # as per https://github.com/python-pillow/Pillow/issues/5986
+        thumbnail_path = None
+        if thumbnail_format:
+            image_format, _, options = thumbnail_formats[thumbnail_format]
+            image.thumbnail(thumbnail_size)
+            if image_format == 'JPEG':
+                image = image.convert('RGB')
+            thumbnail_path = get_thumbnail_path(png_path, thumbnail_format)
+            image.save(thumbnail_path, image_format, **options)
+        return True, thumbnail_path, None
+    except (OSError, ValueError, liblzfse.error) as ex:
+        return False, None, f'Had an exception - {str(ex)}'
+
+
+class KtxConverter:
+    '''Converts KTX files to PNG images, skipping files whose content was already converted.
+       thumbnail_format is 'webp', 'jpeg' or None for no thumbnails'''
+    def __init__(self, thumbnail_format=None):
+        if thumbnail_format == 'webp' and not features.check('webp'):
+            logfunc('Pillow has no WebP support, thumbnails are saved as JPEG')
+            thumbnail_format = 'jpeg'
+        self.thumbnail_format = thumbnail_format
+        self._converted = {}  # content hash -> (png path, thumbnail path), of the files converted so far
+
+    def convert(self, conversions):
+        '''Converts each (ktx path, png path) of conversions. Returns a list with (png path, thumbnail path) for each
+           of them, where the png path is the image of an earlier file with the same content if there was one,
+           and is None if the file could not be converted'''
+        hashes = []
+        pending = {}  # content hash -> (ktx path, png path), of the first file with that content
+        for ktx_path, png_path in conversions:
+            try:
+                content_hash = get_content_hash(ktx_path)
+            except OSError as ex:
+                logfunc(f'Could not read {ktx_path} - {str(ex)}')
+                content_hash = None
+            hashes.append(content_hash)
+            if content_hash and content_hash not in self._converted and content_hash not in pending:
+                pending[content_hash] = (ktx_path, png_path)
+
+        todo = list(pending.values())
+        results = [convert_ktx(ktx_path, png_path, self.thumbnail_format) for ktx_path, png_path in todo]
+        skipped = sum(1 for content_hash in hashes if content_hash) - len(todo)
+        for content_hash, (ktx_path, png_path), (saved, thumbnail_path, error) in zip(pending, todo, results):
+            if error:
+                logfunc(error)
+            self._converted[content_hash] = (png_path, thumbnail_path) if saved else (None, None)
+        if skipped:
+            logfunc(f'{skipped} KTX files were the same as others, they were not converted again')
+        return [self._converted[content_hash] if content_hash else (None, None) for content_hash in hashes]
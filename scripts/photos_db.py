@@ -0,0 +1,156 @@
+# Shared working copy of Photos.sqlite for the Ph* and photosMetadata artifacts.
+#
+# Those artifacts run large LEFT JOIN queries over ZASSET, ZADDITIONALASSETATTRIBUTES, ZINTERNALRESOURCE, the album
+# tables and many others. Several join keys have no index in Photos.sqlite, so each query scans whole tables for every
+# asset. The first artifact that needs a Photos.sqlite copies it once into the report temp folder, with an index on
+# every join key and query planner statistics. All Photos artifacts of the run then query that copy.
+
+import hashlib
+import os
+import re
+import sqlite3
+
+from scripts.ilapfuncs import get_working_copy_lock, logfunc, open_sqlite_db_readonly
+
+# (table, column) used in the joins of the Photos artifacts, besides the many-to-many Z_<n><NAME> tables whose
+# columns are all indexed. Tables and columns missing in a given iOS version are skipped.
+photos_join_keys = (
+    ('ZADDITIONALASSETATTRIBUTES', 'ZASSETDESCRIPTION'),
+    ('ZADDITIONALASSETATTRIBUTES', 'ZMEDIAMETADATA'),
+    ('ZADDITIONALASSETATTRIBUTES', 'ZSCENEPRINT'),
+    ('ZADDITIONALASSETATTRIBUTES', 'ZUNMANAGEDADJUSTMENT'),
+    ('ZASSET', 'ZADDITIONALATTRIBUTES'),
+    ('ZASSET', 'ZCLOUDFEEDASSETSENTRY'),
+    ('ZASSET', 'ZCOMPUTEDATTRIBUTES'),
+    ('ZASSET', 'ZCONVERSATION'),
+    ('ZASSET', 'ZDAYGROUPHIGHLIGHTBEINGASSETS'),
+    ('ZASSET', 'ZDAYGROUPHIGHLIGHTBEINGEXTENDEDASSETS'),
+    ('ZASSET', 'ZDAYGROUPHIGHLIGHTBEINGKEYASSET'),
+    ('ZASSET', 'ZDAYGROUPHIGHLIGHTBEINGSUMMARYASSETS'),
+    ('ZASSET', 'ZEXTENDEDATTRIBUTES'),
+    ('ZASSET', 'ZHIGHLIGHTBEINGASSETS'),
+    ('ZASSET', 'ZHIGHLIGHTBEINGEXTENDEDASSETS'),
+    ('ZASSET', 'ZHIGHLIGHTBEINGKEYASSET'),
+    ('ZASSET', 'ZHIGHLIGHTBEINGSUMMARYASSETS'),
+    ('ZASSET', 'ZLIBRARYSCOPE'),
+    ('ZASSET', 'ZMASTER'),
+    ('ZASSET', 'ZMEDIAANALYSISATTRIBUTES'),
+    ('ZASSET', 'ZMOMENT'),
+    ('ZASSET', 'ZMOMENTSHARE'),
+    ('ZASSET', 'ZMONTHHIGHLIGHTBEINGFIRSTASSET'),
+    ('ZASSET', 'ZMONTHHIGHLIGHTBEINGKEYASSET'),
+    ('ZASSET', 'ZYEARHIGHLIGHTBEINGKEYASSET'),
+    ('ZASSETANALYSISSTATE', 'ZASSET'),
+    ('ZASSETCONTRIBUTOR', 'Z3LIBRARYSCOPEASSETCONTRIBUTORS'),
+    ('ZASSETCONTRIBUTOR', 'ZPARTICIPANT'),
+    ('ZCLOUDMASTER', 'ZMEDIAMETADATA'),
+    ('ZCLOUDRESOURCE', 'ZCLOUDMASTER'),
+    ('ZCLOUDSHAREDALBUMINVITATIONRECORD', 'ZALBUM'),
+    ('ZCLOUDSHAREDCOMMENT', 'ZCOMMENTEDASSET'),
+    ('ZCLOUDSHAREDCOMMENT', 'ZLIKEDASSET'),
+    ('ZDETECTEDFACE', 'ZASSET'),
+    ('ZDETECTEDFACE', 'ZASSETFORFACE'),
+    ('ZDETECTEDFACE', 'ZFACEGROUP'),
+    ('ZDETECTEDFACE', 'ZPERSON'),
+    ('ZDETECTEDFACE', 'ZPERSONFORFACE'),
+    ('ZDETECTEDFACEPRINT', 'ZFACE'),
+    ('ZFACECROP', 'ZPERSON'),
+    ('ZGENERICALBUM', 'ZPARENTFOLDER'),
+    ('ZGENERICASSET', 'ZADDITIONALATTRIBUTES'),
+    ('ZGENERICASSET', 'ZEXTENDEDATTRIBUTES'),
+    ('ZGENERICASSET', 'ZMASTER'),
+    ('ZINTERNALRESOURCE', 'ZASSET'),
+    ('ZMEDIAANALYSISASSETATTRIBUTES', 'ZCHARACTERRECOGNITIONATTRIBUTES'),
+    ('ZMEDIAANALYSISASSETATTRIBUTES', 'ZVISUALSEARCHATTRIBUTES'),
+    ('ZMOMENT', 'ZMEGAMOMENTLIST'),
+    ('ZMOMENT', 'ZYEARMOMENTLIST'),
+    ('ZPHOTOANALYSISASSETATTRIBUTES', 'ZASSET'),
+    ('ZPHOTOSHIGHLIGHT', 'ZPARENTDAYGROUPPHOTOSHIGHLIGHT'),
+    ('ZPHOTOSHIGHLIGHT', 'ZPARENTPHOTOSHIGHLIGHT'),
+    ('ZSHAREPARTICIPANT', 'ZSHARE'),
+    ('ZUSERFEEDBACK', 'ZMEMORY'),
+)
+
+# Core Data many-to-many tables, eg: Z_28ASSETS, Z_3MEMORIESBEINGCURATEDASSETS
+_link_table_re = re.compile(r'Z_\d+[A-Z0-9]+')
+
+_working_copies = {}  # Photos.sqlite path -> path of its working copy, for this process
+
+
+def get_working_copy_path(db_path, report_folder):
+    '''Returns the path of the working copy of db_path in the report temp folder'''
+    report_folder_base = os.path.dirname(report_folder.rstrip('/').rstrip('\\'))
+    name = hashlib.md5(db_path.encode('utf8', 'surrogateescape')).hexdigest()[:16]
+    return os.path.join(report_folder_base, 'temp', '_Photos.sqlite', name, 'Photos.sqlite')
+
+
+def create_join_indexes(db):
+    '''Creates an index on each join key of db that is not the first column of an existing index.
+       Returns the number of indexes created'''
+    tables = {name.upper(): name for (name,) in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    keys = [key for key in photos_join_keys if key[0] in tables]
+    for table in tables:
+        if _link_table_re.fullmatch(table):
+            keys.extend((table, row[1].upper()) for row in db.execute(f'PRAGMA table_info("{tables[table]}")'))
+
+    created = 0
+    for table, column in keys:
+        table_name = tables[table]
+        columns = {row[1].upper(): row[1] for row in db.execute(f'PRAGMA table_info("{table_name}")')}
+        if column not in columns:
+            continue
+        indexed = set()
+        for index in db.execute(f'PRAGMA index_list("{table_name}")').fetchall():
+            first = db.execute(f'PRAGMA index_info("{index[1]}")').fetchone()
+            if first:
+                indexed.add(first[2].upper())
+        if column in indexed:
+            continue
+        db.execute(f'CREATE INDEX "ileapp_{table}_{column}" ON "{table_name}"("{columns[column]}")')
+        created += 1
+    return created
+
+
+def _create_working_copy(db_path, working_copy_path):
+    os.makedirs(os.path.dirname(working_copy_path), exist_ok=True)
+    building_path = working_copy_path + '.building'
+    if os.path.exists(building_path):
+        os.remove(building_path)  # left by an interrupted build
+    source = open_sqlite_db_readonly(db_path)
+    db = sqlite3.connect(building_path)
+    try:
+        source.backup(db)  # includes the content of the -wal file
+        db.execute('PRAGMA journal_mode = OFF')
+        db.execute('PRAGMA synchronous = OFF')
+        created = create_join_indexes(db)
+        db.execute('PRAGMA analysis_limit = 1000')
+        db.execute('ANALYZE')
+        db.commit()
+    finally:
+        db.close()
+        source.close()
+    os.replace(building_path, working_copy_path)
+    return created
+
+
+def open_photos_db(db_path, report_folder):
+    '''Opens the shared working copy of the Photos.sqlite at db_path read-only, creating it on first use in this run.
+       report_folder is the folder passed to the artifact. If the copy cannot be made, db_path itself is opened'''
+    db_path = str(db_path)
+    for suffix in ('-wal', '-shm', '-journal'):
+        if db_path.endswith(suffix) and os.path.isfile(db_path[:-len(suffix)]):
+            db_path = db_path[:-len(suffix)]
+    working_copy_path = _working_copies.get(db_path)
+    if working_copy_path is None:
+        working_copy_path = get_working_copy_path(db_path, report_folder)
+        # other worker processes wait for the copy instead of making their own
+        with get_working_copy_lock():
+            if not os.path.exists(working_copy_path):
+                try:
+                    created = _create_working_copy(db_path, working_copy_path)
+                    logfunc(f'Created indexed working copy of {db_path} ({created} indexes added)')
+                except (sqlite3.Error, OSError) as ex:
+                    logfunc(f'Could not create working copy of {db_path}, querying it directly: {ex}')
+                    working_copy_path = db_path
+        _working_copies[db_path] = working_copy_path
+    return open_sqlite_db_readonly(working_copy_path)
@@ -1,4 +1,5 @@
 import html
+import json
 import os
 import pathlib
 import shutil
@@ -6,6 +7,7 @@ import sqlite3
 import sys
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from scripts.html_parts import *
 from scripts.ilapfuncs import logfunc
 from scripts.version_info import ileapp_version, ileapp_contributors
@@ -33,6 +35,10 @@ from scripts.version_info import ileapp_version, ileapp_contributors
 # 'CATEGORY': {'_mode': 'search', ...}
 # In search mode, the function will attempt to find a partial match for the artifact name within the specified category.
 
+# The sidebar placeholder of a page is looked for in its first page_head_size bytes, see finalize_page()
+page_head_size = 64 * 1024
+page_copy_chunk_size = 1024 * 1024
+
 icon_mappings = \
 {
     'ACCESSORY DATA HYUNDAI': 'settings',
@@ -1064,34 +1070,26 @@ def generate_report(reportfolderbase, time_in_secs, time_HMS, extraction_type, i
                         nav_list_data += list_item.format('', tail.replace(".temphtml", ".html"), icon,
                                                           tail.replace(".temphtml", ""))
 
-    # Now that we have all the file paths, start writing the files
-
-    for category, path_list in side_list.items():
-        for path in path_list:
-            old_filename = os.path.basename(path)
-            filename = old_filename.replace(".temphtml", ".html")
-            # search for it in nav_list_data, then mark that one as 'active' tab
-            active_nav_list_data = mark_item_active(nav_list_data, filename) + nav_bar_script
-            artifact_data = get_file_content(path)
-
-            # Now write out entire html page for artifact
-            f = open(os.path.join(reportfolderbase, filename), 'w', encoding='utf8')
-            artifact_data = insert_sidebar_code(artifact_data, active_nav_list_data, path)
-            f.write(artifact_data)
-            f.close()
+    # The sidebar is written once, the pages load it from _elements/nav_bar.js
+    elements_folder = os.path.join(reportfolderbase, '_elements')
+    os.makedirs(elements_folder, exist_ok=True)
+    with open(os.path.join(elements_folder, 'nav_bar.js'), 'w', encoding='utf8') as f:
+        f.write(nav_bar_js.format(json.dumps(nav_list_data)))
 
-            # Now delete .temphtml
-            os.remove(path)
-            # If dir is empty, delete it
-            try:
-                os.rmdir(os.path.dirname(path))
-            except OSError:
-                pass # Perhaps it was not empty!
+    # Now that we have all the file paths, move the pages in place
+    pages = [(path, os.path.join(reportfolderbase, os.path.basename(path).replace(".temphtml", ".html")))
+             for path_list in side_list.values() for path in path_list]
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda page: finalize_page(*page), pages))
+    for category_folder in dict.fromkeys(os.path.dirname(path) for path, _ in pages):
+        # If dir is empty, delete it
+        try:
+            os.rmdir(category_folder)
+        except OSError:
+            pass # Perhaps it was not empty!
 
     # Create index.html's page content
     create_index_html(reportfolderbase, time_in_secs, time_HMS, extraction_type, image_input_path, nav_list_data, casedata)
-    elements_folder = os.path.join(reportfolderbase, '_elements')
-    os.mkdir(elements_folder)
     __location__ = os.path.dirname(os.path.abspath(__file__))
 
     def copy_no_perm(src, dst, *, follow_symlinks=True):
@@ -1108,7 +1106,7 @@ def generate_report(reportfolderbase, time_in_secs, time_HMS, extraction_type, i
                         os.path.join(elements_folder, "dark-mode-switch.js"))
         shutil.copyfile(os.path.join(__location__, "chats.css"), os.path.join(elements_folder, "chats.css"))
         shutil.copytree(os.path.join(__location__, "MDB-Free_4.13.0"), os.path.join(elements_folder, 'MDB-Free_4.13.0'),
-                        copy_function=copy_no_perm)
+                        copy_function=copy_no_perm, dirs_exist_ok=True)
         
         
     except shutil.Error:
@@ -1117,6 +1115,23 @@ def generate_report(reportfolderbase, time_in_secs, time_HMS, extraction_type, i
             print("_elements folder seems fine. Probably nothing to worry about")
 
 
+def finalize_page(path, dest):
+    '''Moves the .temphtml page at path to dest. A page that still holds the sidebar placeholder gets the shared sidebar
+       script in its place, copying the rest of the page in chunks'''
+    placeholder = body_sidebar_dynamic_data_placeholder.encode('utf8')
+    with open(path, 'rb') as src:
+        head = src.read(page_head_size)
+    pos = head.find(placeholder)
+    if pos < 0:
+        os.replace(path, dest)
+        return
+    with open(path, 'rb') as src, open(dest, 'wb') as dst:
+        src.seek(pos + len(placeholder))
+        dst.write(head[:pos])
+        dst.write((nav_bar_data_script + nav_bar_script).encode('utf8'))
+        shutil.copyfileobj(src, dst, page_copy_chunk_size)
+    os.remove(path)
+
 def get_file_content(path):
     f = open(path, 'r', encoding='utf8')
     data = f.read()
@@ -1163,7 +1178,10 @@ def create_index_html(reportfolderbase, time_in_secs, time_HMS, extraction_type,
     processed_files_path = os.path.join(reportfolderbase, 'Script Logs', 'ProcessedFilesLog.html')
     tab4_content = get_file_content(processed_files_path)
 
-    content += tabs_code.format(tab1_content, tab2_content, tab3_content, tab4_content)
+    # Get artifact performance records (this will be tab5)
+    tab5_content = get_perf_table_content(os.path.join(reportfolderbase, 'Script Logs', 'perf.json'))
+
+    content += tabs_code.format(tab1_content, tab2_content, tab3_content, tab4_content, tab5_content)
 
     content += '</div>'  # CARD end
 
@@ -1188,6 +1206,42 @@ def create_index_html(reportfolderbase, time_in_secs, time_HMS, extraction_type,
     f.write(body_main_trailer + body_end + nav_bar_script_footer + page_footer)
     f.close()
 
+def get_perf_table_content(perf_path):
+    '''Returns the html code for the table of the artifact performance records in perf_path, slowest first'''
+    try:
+        with open(perf_path, 'r', encoding='utf8') as perf_file:
+            records = json.load(perf_file)['plugins']
+    except (OSError, ValueError, KeyError, TypeError):
+        return 'No performance records found'
+
+    def megabytes(value):
+        return '' if value is None else f'{value / 1048576:.1f}'
+
+    headers = ('Artifact', 'Module', 'Completed', 'Wall s', 'CPU s', 'Peak RSS +MB', 'Files', 'Input MB', 'Read MB',
+               'SQL s', 'HTML rows', 'TSV rows', 'Timeline rows')
+    code = \
+        """
+        <div class="table-responsive">
+            <table class="table table-bordered table-hover table-sm" width="100%">
+                <thead><tr>{}</tr></thead>
+                <tbody>
+        """.format(''.join(f'<th>{header}</th>' for header in headers))
+    for record in sorted(records, key=lambda record: record['wall_seconds'], reverse=True):
+        rows = record.get('rows', {})
+        row = (record['name'], record['module'], 'Yes' if record['completed'] else 'No',
+               f"{record['wall_seconds']:.2f}", f"{record['cpu_seconds']:.2f}",
+               megabytes(record.get('peak_rss_delta_bytes')), record.get('files_matched', ''),
+               megabytes(record.get('input_bytes')), megabytes(record.get('bytes_read')),
+               f"{record.get('sql_seconds', 0):.2f}", rows.get('html', 0), rows.get('tsv', 0), rows.get('timeline', 0))
+        code += '<tr>' + ''.join('<td>{}</td>'.format(html.escape(str(x))) for x in row) + '</tr>'
+    code += \
+        """
+                </tbody>
+            </table>
+        </div>
+        """
+    return code
+
 def generate_authors_table_code(ileapp_contributors):
     authors_data = ''
     for author_name, blog, tweet_handle, git in ileapp_contributors:
@@ -1240,15 +1294,6 @@ def generate_key_val_table_without_headings(title, data_list, html_escape=True,
 
     return code
 
-def insert_sidebar_code(data, sidebar_code, filename):
-    pos = data.find(body_sidebar_dynamic_data_placeholder)
-    if pos < 0:
-        logfunc(f'Error, could not find {body_sidebar_dynamic_data_placeholder} in file {filename}')
-        return data
-    else:
-        ret = data[0: pos] + sidebar_code + data[pos + len(body_sidebar_dynamic_data_placeholder):]
-        return ret
-
 def mark_item_active(data, itemname):
     '''Finds itemname in data, then marks that node as active. Return value is changed data'''
     pos = data.find(f'" href="{itemname}"')
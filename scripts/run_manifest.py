@@ -0,0 +1,160 @@
+# Run manifest of a report, so that an interrupted run can be resumed (ileapp.py --resume).
+#
+# Script Logs/run_manifest.json holds the settings of the run and, for each artifact that was parsed, whether it
+# completed, a hash of its plugin code, a fingerprint of its input files (paths, sizes and modification times as in
+# the input) and the report files it wrote. It is saved after each artifact. A resumed run skips the artifacts that
+# completed with the same code and inputs, and parses the others again after deleting what they wrote before.
+# While an artifact is parsed, the files it writes are also listed in a journal file (see get_outputs_journal_path), so
+# that those of an artifact killed before it was recorded are deleted as well.
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+
+from scripts.ilapfuncs import logfunc, sanitize_file_name
+from scripts.version_info import ileapp_version
+
+RUN_MANIFEST_FORMAT_VERSION = 1
+
+
+def get_code_hash(path):
+    '''Returns the SHA-1 of the plugin file at path'''
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def get_input_fingerprint(seeker, files_found):
+    '''Returns a hash of the paths, sizes and modification times (as in the input) of the files found for an
+       artifact'''
+    fingerprint = hashlib.sha1()
+    for path in sorted(set(files_found)):
+        fingerprint.update(json.dumps([path, seeker.get_source_info(path)]).encode('utf8'))
+    return fingerprint.hexdigest()
+
+
+def get_outputs_journal_path(report_folder_base, plugin_name):
+    '''Returns the path of the file listing the report files written by plugin_name while it is parsed'''
+    return os.path.join(report_folder_base, 'Script Logs', 'Artifacts In Progress',
+                        sanitize_file_name(plugin_name) + '.txt')
+
+
+class RunManifest:
+    def __init__(self, report_folder_base, settings=None):
+        self.report_folder_base = report_folder_base
+        self.path = os.path.join(report_folder_base, 'Script Logs', 'run_manifest.json')
+        self.data = {
+            'format_version': RUN_MANIFEST_FORMAT_VERSION,
+            'ileapp_version': ileapp_version,
+            'settings': settings or {},  # extraction type, input path, timezone and wrap text of the run
+            'ios_version': None,  # set by lastbuild, restored when it is skipped
+            'report_finalized': False,
+            'plugins': {},  # name -> {completed, code_hash, fingerprint, outputs (relative to the report folder)}
+        }
+
+    @classmethod
+    def load(cls, report_folder_base):
+        '''Reads the manifest of the report at report_folder_base, raises ValueError if there is no usable one'''
+        manifest = cls(report_folder_base)
+        try:
+            with open(manifest.path, 'r', encoding='utf8') as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError) as ex:
+            raise ValueError(f'Could not read the run manifest {manifest.path}: {ex}')
+        if not isinstance(data, dict) or data.get('format_version') != RUN_MANIFEST_FORMAT_VERSION:
+            raise ValueError(f'{manifest.path} is not a run manifest of this iLEAPP version')
+        manifest.data = data
+        return manifest
+
+    @property
+    def settings(self):
+        return self.data['settings']
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as manifest_file:
+            json.dump(self.data, manifest_file, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def is_up_to_date(self, plugin, fingerprint):
+        '''Returns True if plugin completed in an earlier run with the same code and input files'''
+        entry = self.data['plugins'].get(plugin.name)
+        return (entry is not None and entry['completed'] and entry['fingerprint'] == fingerprint
+                and entry['code_hash'] == get_code_hash(plugin.path))
+
+    def record(self, plugin, fingerprint, completed, outputs):
+        '''Records that plugin was parsed, with the report files it wrote, and saves the manifest'''
+        self.data['plugins'][plugin.name] = {
+            'completed': completed,
+            'code_hash': get_code_hash(plugin.path),
+            'fingerprint': fingerprint,
+            'outputs': list(dict.fromkeys(os.path.relpath(path, self.report_folder_base) for path in outputs)),
+        }
+        self.save()
+        journal_path = get_outputs_journal_path(self.report_folder_base, plugin.name)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+
+    def _get_output_paths(self, output):
+        path = os.path.join(self.report_folder_base, output)
+        if path.endswith('.temphtml'):
+            # pages are moved to the report folder when the report is generated
+            return path, os.path.join(self.report_folder_base, os.path.basename(path)[:-len('.temphtml')] + '.html')
+        return path,
+
+    def discard_outputs(self, plugin_name):
+        '''Deletes the report files, timeline rows and KML locations written by plugin_name in an earlier run, also if
+           that run was killed while it parsed plugin_name'''
+        entry = self.data['plugins'].pop(plugin_name, None)
+        outputs = entry['outputs'] if entry is not None else []
+        journal_path = get_outputs_journal_path(self.report_folder_base, plugin_name)
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r', encoding='utf8') as journal:
+                outputs += [os.path.relpath(line.rstrip('\n'), self.report_folder_base)
+                            for line in journal if line.strip()]
+        elif entry is None:
+            return  # never parsed
+        for output in outputs:
+            for path in self._get_output_paths(output):
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif os.path.exists(path):
+                    os.remove(path)
+        self._delete_rows(os.path.join('_Timeline', 'tl.db'), 'module', [plugin_name])
+        activities = [os.path.basename(output)[:-len('.kml')] for output in outputs if output.endswith('.kml')]
+        if activities:
+            self._delete_rows(os.path.join('_KML Exports', '_latlong.db'), 'activity', activities)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        self.save()
+
+    def _delete_rows(self, db_path, column, values):
+        '''Deletes the rows of table data of the report database at db_path whose column is one of values'''
+        db_path = os.path.join(self.report_folder_base, db_path)
+        if not os.path.exists(db_path):
+            return
+        db = sqlite3.connect(db_path, timeout=60)
+        try:
+            with db:
+                db.executemany(f'DELETE FROM data WHERE {column} = ?', [(value,) for value in values])
+        except sqlite3.Error as ex:
+            logfunc(f'Could not delete the rows of {", ".join(values)} from {db_path}: {ex}')
+        finally:
+            db.close()
+
+    def reopen_report(self):
+        '''Moves the pages of a generated report back to their category folders as .temphtml files, so that the
+           report is generated again with them. Not only done when report_finalized is set, as the report could have
+           been interrupted while it was generated'''
+        for entry in self.data['plugins'].values():
+            for output in entry['outputs']:
+                paths = self._get_output_paths(output)
+                if len(paths) == 2 and os.path.exists(paths[1]) and not os.path.exists(paths[0]):
+                    os.makedirs(os.path.dirname(paths[0]), exist_ok=True)
+                    os.replace(paths[1], paths[0])
+        self.data['report_finalized'] = False
+        self.save()
+
+    def set_report_finalized(self):
+        self.data['report_finalized'] = True
+        self.save()
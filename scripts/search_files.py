@@ -1,25 +1,477 @@
 import time as timex
+import errno
 import fnmatch
+import io
+import mmap
 import os
+import re
+import struct
 import tarfile
 
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from scripts.ilapfuncs import *
-from shutil import copyfile
-from zipfile import ZipFile
+from shutil import copyfile, copyfileobj
+from zipfile import ZipFile, ZIP_STORED
 
 from fnmatch import _compile_pattern
 from functools import lru_cache
+from glob import escape as glob_escape
 
 from scripts.builds_ids import get_root_path_from_domain
+from scripts.itunes_backup import decrypt_file, decrypt_manifest_db, get_file_encryption, open_backup_keybag, \
+    read_backup_manifest
 normcase = lru_cache(maxsize=None)(os.path.normcase)
 
+COPY_BUFFER_SIZE = 1024 * 1024  # chunk size used when extracting files from archives
+
+class PathIndex:
+    '''Index over a list of paths, used to narrow down the paths a glob pattern needs to be tested against.
+
+       Entries are indexed by basename, basename suffix and extension, and every directory (explicit or
+       implied by the paths) is indexed by name with the range of entries below it, which works as a trie
+       over path components. Candidates returned are always a superset of the paths matching the pattern, so the
+       pattern must still be tested on each of them.
+    '''
+    def __init__(self, paths, in_tree_order=False):
+        '''paths must be normcased. If in_tree_order is True, all entries below a directory must be
+           contiguous in paths (like a depth-first listing), otherwise they are sorted by component.'''
+        self.count = len(paths)
+        self._names = {}  # basename -> [positions]
+        self._exts = {}   # extension -> [positions]
+        self._dirs = {}   # directory name -> [(start, end)] positions of entries below it
+        split_paths = [path.split(os.sep) for path in paths]
+        if in_tree_order:
+            self._order = None
+        else:
+            self._order = sorted(range(len(paths)), key=split_paths.__getitem__)
+            split_paths = [split_paths[i] for i in self._order]
+
+        stack = []  # [(name, start)] of directories containing the current entry
+        for pos, components in enumerate(split_paths):
+            parents = components[:-1]
+            depth = 0
+            while depth < len(stack) and depth < len(parents) and stack[depth][0] == parents[depth]:
+                depth += 1
+            self._close_dirs(stack, depth, pos)
+            for name in parents[depth:]:
+                stack.append((name, pos))
+            name = components[-1]
+            self._names.setdefault(name, []).append(pos)
+            dot = name.rfind('.')
+            if dot >= 0:
+                self._exts.setdefault(name[dot:], []).append(pos)
+        self._close_dirs(stack, 0, len(split_paths))
+        self._sorted_names = sorted(self._names.keys() | self._dirs.keys())
+        self._reversed_names = sorted(name[::-1] for name in self._names)
+
+    def _close_dirs(self, stack, depth, end):
+        while len(stack) > depth:
+            name, start = stack.pop()
+            self._dirs.setdefault(name, []).append((start, end))
+
+    @staticmethod
+    def get_pattern_keys(pattern):
+        '''Returns the index lookups that every path matching the (normcased) glob pattern satisfies'''
+        keys = []
+        if '[' in pattern:
+            return keys  # a character class could contain a separator
+        segments = pattern.split(os.sep)
+        last = len(segments) - 1
+        for i, segment in enumerate(segments):
+            if i == 0 or not segment:
+                continue  # first segment is not preceded by a separator, so it may be part of a name
+            wildcard = min((segment.find(c) for c in '*?' if c in segment), default=-1)
+            if wildcard < 0:
+                keys.append(('name' if i == last else 'dir', segment))
+            elif wildcard > 0:
+                keys.append(('prefix', segment[:wildcard]))
+        wildcard = max(segments[last].rfind(c) for c in '*?')
+        suffix = segments[last][wildcard + 1:]
+        if wildcard >= 0 and suffix:
+            if suffix.startswith('.') and suffix.count('.') == 1 and wildcard == segments[last].rfind('*'):
+                keys.append(('ext', suffix))
+            else:
+                keys.append(('suffix', suffix))
+        return keys
+
+    def _lookup(self, kind, value):
+        '''Returns (size, [positions], [(start, end)]) for a key'''
+        if kind == 'name':
+            positions = self._names.get(value, [])
+            return len(positions), positions, []
+        if kind == 'ext':
+            positions = self._exts.get(value, [])
+            return len(positions), positions, []
+        if kind == 'dir':
+            ranges = self._dirs.get(value, [])
+            return sum(end - start for start, end in ranges), [], ranges
+        positions, ranges = [], []
+        if kind == 'suffix':
+            value = value[::-1]
+            i = bisect_left(self._reversed_names, value)
+            while i < len(self._reversed_names) and self._reversed_names[i].startswith(value):
+                positions.extend(self._names[self._reversed_names[i][::-1]])
+                i += 1
+            return len(positions), positions, ranges
+        i = bisect_left(self._sorted_names, value)
+        while i < len(self._sorted_names) and self._sorted_names[i].startswith(value):
+            name = self._sorted_names[i]
+            positions.extend(self._names.get(name, []))
+            ranges.extend(self._dirs.get(name, []))
+            i += 1
+        return len(positions) + sum(end - start for start, end in ranges), positions, ranges
+
+    def candidates(self, pattern):
+        '''Returns the sorted indices of paths that may match the normcased pattern, or None if the
+           index cannot narrow them down (all paths need to be tested)'''
+        best = None
+        for kind, value in self.get_pattern_keys(pattern):
+            lookup = self._lookup(kind, value)
+            if best is None or lookup[0] < best[0]:
+                best = lookup
+        if best is None or best[0] > self.count // 2:
+            return None
+        size, positions, ranges = best
+        found = set(positions)
+        for start, end in ranges:
+            found.update(range(start, end))
+        if self._order is not None:
+            found = [self._order[pos] for pos in found]
+        return sorted(found)
+
+    def find_name(self, name):
+        '''Returns the indices of paths whose basename is the normcased name'''
+        positions = self._names.get(name, [])
+        if self._order is not None:
+            return [self._order[pos] for pos in positions]
+        return list(positions)
+
+
+class PatternSet:
+    '''Combined matcher for many glob patterns, to match a list of paths against all of them in one pass.
+
+       Each pattern is filed under one literal (name, directory, prefix, suffix or extension) that all its
+       matches contain, so a path is only tested against the few patterns whose literal it contains.
+    '''
+    _key_priority = ('name', 'dir', 'ext', 'suffix', 'prefix')
+
+    def __init__(self, patterns, prefix=''):
+        '''prefix is prepended to (normcased) paths before they are tested, like "root/" in the seekers'''
+        self.patterns = list(dict.fromkeys(patterns))
+        self._prefix = prefix
+        self._compiled = [_compile_pattern(normcase(pattern)) for pattern in self.patterns]
+        self._unkeyed = []
+        buckets = {kind: {} for kind in self._key_priority}
+        for i, pattern in enumerate(self.patterns):
+            keys = PathIndex.get_pattern_keys(normcase(pattern))
+            if keys:
+                kind, value = min(keys, key=lambda key: (self._key_priority.index(key[0]), -len(key[1])))
+                buckets[kind].setdefault(value, []).append(i)
+            else:
+                self._unkeyed.append(i)
+        self._names = buckets['name']
+        self._dirs = buckets['dir']
+        self._exts = buckets['ext']
+        # prefixes and suffixes are grouped by their first/last few characters
+        self._prefix_len = min(map(len, buckets['prefix']), default=0)
+        self._prefixes = {}
+        for value, indices in buckets['prefix'].items():
+            self._prefixes.setdefault(value[:self._prefix_len], []).append((value, indices))
+        self._suffix_len = min(map(len, buckets['suffix']), default=0)
+        self._suffixes = {}
+        for value, indices in buckets['suffix'].items():
+            self._suffixes.setdefault(value[-self._suffix_len:], []).append((value, indices))
+        # patterns without any literal are tested together first, with a single regex
+        self._unkeyed_match = None
+        if self._unkeyed:
+            self._unkeyed_match = re.compile('|'.join(
+                fnmatch.translate(normcase(self.patterns[i])) for i in self._unkeyed)).match
+        self._last_parent = None
+        self._parent_candidates = ()
+
+    def _add_prefixed_by(self, component, candidates):
+        for value, indices in self._prefixes.get(component[:self._prefix_len], ()):
+            if component.startswith(value):
+                candidates.extend(indices)
+
+    def _get_parent_candidates(self, parent):
+        '''Patterns that may match because of the directories in parent, cached as paths come grouped by folder'''
+        if parent != self._last_parent:
+            candidates = []
+            if parent:
+                for component in parent.split(os.sep):
+                    candidates.extend(self._dirs.get(component, ()))
+                    if self._prefixes:
+                        self._add_prefixed_by(component, candidates)
+            self._last_parent = parent
+            self._parent_candidates = candidates
+        return self._parent_candidates
+
+    def match(self, path):
+        '''Returns the indices in self.patterns of the patterns matching path, which must be normcased'''
+        sep = path.rfind(os.sep)
+        name = path[sep + 1:]
+        candidates = []
+        candidates.extend(self._names.get(name, ()))
+        dot = name.rfind('.')
+        if dot >= 0:
+            candidates.extend(self._exts.get(name[dot:], ()))
+        if self._suffixes:
+            for value, indices in self._suffixes.get(name[-self._suffix_len:], ()):
+                if name.endswith(value):
+                    candidates.extend(indices)
+        if self._prefixes:
+            self._add_prefixed_by(name, candidates)
+        candidates.extend(self._get_parent_candidates(path[:sep] if sep >= 0 else ''))
+        target = self._prefix + path
+        if self._unkeyed_match and self._unkeyed_match(target) is not None:
+            candidates.extend(self._unkeyed)
+        if not candidates:
+            return []
+        return sorted(i for i in set(candidates) if self._compiled[i](target) is not None)
+
+    def match_all(self, paths):
+        '''Matches each of the (normcased) paths once. Returns {pattern: [indices of matching paths]}'''
+        results = {pattern: [] for pattern in self.patterns}
+        for index, path in enumerate(paths):
+            for i in self.match(path):
+                results[self.patterns[i]].append(index)
+        return results
+
+
+class ExtractionCache:
+    '''Keeps track of the files a seeker wrote to the temp folder, so that each one is extracted at most once per run.
+
+       Files are keyed by their path in the archive (or their hash for iTunes backups). If max_size (bytes) is set,
+       the least recently used files are deleted when the total size goes over it, they are extracted again if
+       needed later.
+    '''
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (path, size)
+        self._pinned = {}  # key -> number of pin() calls not undone by unpin(), these files are never evicted
+
+    def __setstate__(self, state):
+        '''A copy in a worker process never evicts the files it got from the main process, other workers may be
+           reading them'''
+        self.__dict__.update(state)
+        self._pinned = dict.fromkeys(self._entries, 1)
+
+    def get(self, key):
+        '''Returns the path of the extracted file, or None if it is not in the temp folder'''
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def pin(self, keys):
+        '''Keeps the files of keys from being evicted until unpin() is called for them as many times'''
+        for key in keys:
+            self._pinned[key] = self._pinned.get(key, 0) + 1
+
+    def unpin(self, keys):
+        for key in keys:
+            count = self._pinned.pop(key, 0) - 1
+            if count > 0:
+                self._pinned[key] = count
+
+    def add(self, key, path, keep=(), size=None):
+        '''Records an extracted file, then evicts files over the size limit except for the keys in keep and the pinned
+           ones. size is the space the file takes in the temp folder, its file size by default'''
+        if size is None:
+            size = os.path.getsize(path) if os.path.isfile(path) else 0
+        self._entries[key] = (path, size)
+        self.size += size
+        if self.max_size is not None and self.size > self.max_size:
+            for old_key in list(self._entries):
+                if self.size <= self.max_size:
+                    break
+                if old_key == key or old_key in keep or old_key in self._pinned:
+                    continue
+                old_path, old_size = self._entries.pop(old_key)
+                if old_size:
+                    try:
+                        os.remove(old_path)
+                    except OSError as ex:
+                        logfunc(f'Could not remove {old_path} from temp folder ' + str(ex))
+                self.size -= old_size
+
+
+class MappedFile(io.RawIOBase):
+    '''Read-only binary stream over a memory mapped file, returned by FileSeekerBase.open_mapped().
+
+       It can be passed to parsers that expect a file object (read/seek/tell), while view is a memoryview of the
+       whole content for regular expressions, struct.unpack_from() or slicing without copying the file in memory.
+       The view is only valid inside the with block of open_mapped().
+    '''
+    def __init__(self, view):
+        self.view = view
+        self._pos = 0
+
+    def __len__(self):
+        return len(self.view)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        start = self._pos
+        end = len(self.view) if size is None or size < 0 else min(start + size, len(self.view))
+        self._pos = max(start, end)
+        return self.view[start:end].tobytes()
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += len(self.view)
+        if offset < 0:
+            raise ValueError(f'Negative seek position {offset}')
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+    def find(self, sub, start=0, end=None):
+        '''Returns the lowest offset where sub is found in the content, or -1'''
+        match = re.compile(re.escape(sub)).search(self.view, start, len(self.view) if end is None else end)
+        return match.start() if match else -1
+
+
+@contextmanager
+def _map_file(path, offset=0, length=None):
+    '''Memory maps length bytes (default all) of the file at path from offset, yields a MappedFile'''
+    with open(path, 'rb') as f:
+        if length is None:
+            length = os.fstat(f.fileno()).st_size - offset
+        if length <= 0:
+            yield MappedFile(memoryview(b''))
+            return
+        # mmap offsets have to be a multiple of the allocation granularity
+        delta = offset % mmap.ALLOCATIONGRANULARITY
+        mapped = mmap.mmap(f.fileno(), length + delta, access=mmap.ACCESS_READ, offset=offset - delta)
+    view = memoryview(mapped)[delta:delta + length]
+    try:
+        yield MappedFile(view)
+    finally:
+        try:
+            view.release()
+            mapped.close()
+        except BufferError:
+            pass  # slices of the view are still referenced, the mapping is closed when they are garbage collected
+
+
 class FileSeekerBase:
     # This is an abstract base class
     def search(self, filepattern_to_search, return_on_first_hit=False):
         '''Returns a list of paths for files/folders that matched'''
         pass
 
+    def search_many(self, filepatterns_to_search):
+        '''Returns a dictionary {pattern: list of paths} with the same results as search() for every pattern.
+           Seekers that extract files may not have written them yet, see materialize()'''
+        return {filepattern: self.search(filepattern) for filepattern in filepatterns_to_search}
+
+    def materialize(self, paths):
+        '''Makes sure the files at paths returned by search_many() are on disk, before they are used.
+           Returns the paths that are available'''
+        return paths
+
+    def pin(self, paths):
+        '''Keeps the files at paths returned by materialize() in the temp folder until unpin() is called for them,
+           eg: while a worker process reads them'''
+        keys = self._get_cache_keys(paths)
+        if keys:
+            self._cache.pin(keys)
+
+    def unpin(self, paths):
+        keys = self._get_cache_keys(paths)
+        if keys:
+            self._cache.unpin(keys)
+
+    def open_mapped(self, path):
+        '''Returns a context manager yielding a MappedFile of the file at path (as returned by search), so large
+           files can be parsed without reading them whole into memory, eg:
+               with seeker.open_mapped(file_found) as mapped:
+                   for record in ccl_segb1.read_segb1_stream(mapped): ...
+        '''
+        self.materialize([path])
+        return _map_file(path)
+
+    def find_by_name(self, name):
+        '''Returns a list of paths for files/folders named name, looked up in the index instead of matching a
+           '**/name' pattern against every path'''
+        suffix = os.sep + name
+        return self.resolve_suffixes([suffix])[suffix]
+
+    def resolve_suffix(self, suffix, return_on_first_hit=False):
+        '''Returns a list of paths for files/folders whose path ends with suffix at a path component, eg: the
+           '/Library/SMS/Attachments/...' path stored in a database. Unlike searching '**' + suffix, the files are
+           looked up by basename in the index instead of matching every path'''
+        paths = self.resolve_suffixes([suffix])[suffix]
+        return paths[:1] if return_on_first_hit else paths
+
+    def resolve_suffixes(self, suffixes):
+        '''Returns a dictionary {suffix: list of paths} with the same results as resolve_suffix() for every suffix,
+           making the files available in a single pass, eg: for a whole column of attachment paths'''
+        listing = self._get_listing()
+        if listing is None:
+            return {suffix: self.search('**' + glob_escape(suffix)) for suffix in suffixes}
+        index, get_path = listing
+        matches = {}
+        for suffix in suffixes:
+            normcased = normcase(suffix)
+            matches[suffix] = positions = []
+            for i in index.find_name(normcased.rsplit(os.sep, 1)[-1]):
+                path = get_path(i)
+                if path.endswith(normcased) and (len(path) == len(normcased) or normcased.startswith(os.sep)
+                                                 or path[-len(normcased) - 1] == os.sep):
+                    positions.append(i)
+            positions.sort()
+        found = self._get_found(sorted({i for positions in matches.values() for i in positions}))
+        return {suffix: [found[i] for i in positions if found.get(i)] for suffix, positions in matches.items()}
+
+    def get_source_path(self, path):
+        '''Returns the path of the file at path (as returned by search or search_many) as it is named in the input'''
+        return path
+
+    def get_source_info(self, path):
+        '''Returns (size, modification time) of the file at path (as returned by search or search_many) as it is in
+           the input, without extracting it, or None if it cannot be found'''
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, int(stat.st_mtime)
+
+    def _get_listing(self):
+        '''Returns (PathIndex, function returning the normcased path at an index position) over the paths patterns
+           are matched against, or None if the seeker has no index'''
+        return None
+
+    def _get_found(self, positions):
+        '''Returns {position: path or None} for the paths at positions of the _get_listing() index'''
+        return {}
+
+    def _get_cache_keys(self, paths):
+        '''Returns the ExtractionCache keys of the files at paths, for seekers that extract files'''
+        return []
+
     def cleanup(self):
         '''close any open handles'''
         pass
@@ -31,6 +483,7 @@ class FileSeekerDir(FileSeekerBase):
         self._all_files = []
         logfunc('Building files listing...')
         self.build_files_list(directory)
+        self._index = PathIndex([normcase(item) for item in self._all_files], in_tree_order=True)
         logfunc(f'File listing complete - {len(self._all_files)} files')
 
     def build_files_list(self, directory):
@@ -47,31 +500,74 @@ class FileSeekerDir(FileSeekerBase):
     def search(self, filepattern, return_on_first_hit=False):
         pat = _compile_pattern( normcase(filepattern) )
         root = normcase("root/")
+        candidates = self._index.candidates(normcase(filepattern))
+        if candidates is None:
+            items = self._all_files
+        else:
+            items = [self._all_files[i] for i in candidates]
         if return_on_first_hit:
-            for item in self._all_files:
+            for item in items:
                 if pat( root + normcase(item) ) is not None:
                     return [item]
             return []
         pathlist = []
-        for item in self._all_files:
+        for item in items:
             if pat( root + normcase(item) ) is not None:
                 pathlist.append(item)
         return pathlist
 
+    def _get_listing(self):
+        return self._index, lambda i: normcase(self._all_files[i])
+
+    def _get_found(self, positions):
+        return {i: self._all_files[i] for i in positions}
+
 class FileSeekerItunes(FileSeekerBase):
-    def __init__(self, directory, temp_folder):
+    '''Seeker for iTunes backups, whose files are stored as <xx>/<fileID> and listed in Manifest.db.
+
+       The listing is indexed by logical path (the root path of the domain followed by relativePath), in which the
+       files of a domain are a single subtree, so a pattern naming folders of a domain is only tested against the
+       files of that subtree. Files found are not copied out of the backup: they appear in the temp folder at their
+       logical path as hard links to the stored file, so plugins still see their original names. Databases with a
+       -wal or -journal file are copied instead, as a connection that is not read-only would write them back. If
+       the temp folder is on another volume, files are copied.
+
+       Encrypted backups need their password. Manifest.db is decrypted to the temp folder when the seeker is
+       created, the other files only when they are found, in parallel, to their logical path in the temp folder.
+    '''
+    _db_companions = ('-wal', '-shm', '-journal')
+
+    def __init__(self, directory, temp_folder, max_temp_size=None, password=None):
         FileSeekerBase.__init__(self)
         self.directory = directory
-        self._all_files = {}
+        self._all_files = {}  # logical path -> (fileID, domain)
+        self._relative_paths = []  # logical paths, grouped by domain
         self.temp_folder = temp_folder
+        self._cache = ExtractionCache(max_temp_size)
+        self._planned = {}  # temp path -> logical path, for files returned by search() and search_many()
+        self._can_link = True
+        self._keybag = None  # unlocked Keybag of an encrypted backup
+        self._manifest_db_path = os.path.join(directory, "Manifest.db")
+        try:
+            manifest = read_backup_manifest(directory)
+        except (OSError, ValueError) as ex:
+            logfunc(f'Could not read Manifest.plist from {directory}, ' + str(ex))
+            manifest = {}
+        if manifest.get('IsEncrypted'):
+            logfunc('Decrypting Manifest.db of the encrypted backup...')
+            self._keybag = open_backup_keybag(manifest, password)
+            self._manifest_db_path = os.path.join(temp_folder, "Manifest.db")
+            os.makedirs(temp_folder, exist_ok=True)
+            decrypt_manifest_db(directory, manifest, self._keybag, self._manifest_db_path)
         logfunc('Building files listing...')
         self.build_files_list(directory)
+        self._index = PathIndex([normcase(path) for path in self._relative_paths])
         logfunc(f'File listing complete - {len(self._all_files)} files')
-    
+
     def build_files_list(self, directory):
         '''Populates paths from Manifest.db files into _all_files'''
         try: 
-            db = open_sqlite_db_readonly(os.path.join(directory, "Manifest.db"))
+            db = open_sqlite_db_readonly(self._manifest_db_path)
             cursor = db.cursor()
             cursor.execute(
                 """
@@ -83,81 +579,350 @@ class FileSeekerItunes(FileSeekerBase):
                 Files
                 WHERE
                 flags=1
+                ORDER BY
+                domain
                 """
             )
-            all_rows = cursor.fetchall()
-            for row in all_rows:
-                hash_filename = row[0]
-                domain = row[1]
-                root_path = get_root_path_from_domain(domain)
-                relative_path = row[2]
+            domains = {}  # domain -> (domain, root path), so rows share one string per domain
+            for hash_filename, domain, relative_path in cursor:
+                if domain not in domains:
+                    domains[domain] = (domain, get_root_path_from_domain(domain))
+                domain, root_path = domains[domain]
                 full_path = os.path.join(root_path, relative_path)
-                self._all_files[full_path] = hash_filename
+                if full_path not in self._all_files:
+                    self._relative_paths.append(full_path)
+                self._all_files[full_path] = (hash_filename, domain)
             db.close()
         except Exception as ex:
             logfunc(f'Error opening Manifest.db from {directory}, ' + str(ex))
             raise ex
 
     def search(self, filepattern, return_on_first_hit=False):
-        pathlist = []
-        matching_keys = fnmatch.filter(self._all_files, filepattern)
-        for relative_path in matching_keys:
-            hash_filename = self._all_files[relative_path]
-            original_location = os.path.join(self.directory, hash_filename[:2], hash_filename)
-            temp_location = os.path.join(self.temp_folder, sanitize_file_path(relative_path))
-            if is_platform_windows():
-                temp_location = temp_location.replace('/', '\\')
+        pat = _compile_pattern( normcase(filepattern) )
+        candidates = self._index.candidates(normcase(filepattern))
+        if candidates is None:
+            candidates = range(len(self._relative_paths))
+        matches = []
+        for i in candidates:
+            if pat( normcase(self._relative_paths[i]) ) is not None:
+                matches.append(self._relative_paths[i])
+                if return_on_first_hit:
+                    break
+        found = self._get_files(matches)
+        return [found[relative_path] for relative_path in matches if found[relative_path]]
+
+    def search_many(self, filepatterns):
+        '''Matches all patterns in a single pass over the Manifest.db files. Files are only linked or decrypted when
+           materialize() is called for them'''
+        matches = PatternSet(filepatterns).match_all([normcase(path) for path in self._relative_paths])
+        results = {}
+        for filepattern in filepatterns:
+            results[filepattern] = pathlist = []
+            for i in matches[filepattern]:
+                temp_location = self._get_temp_location(self._relative_paths[i])
+                self._planned[temp_location] = self._relative_paths[i]
+                pathlist.append(temp_location)
+        return results
+
+    def materialize(self, paths):
+        found = self._get_files([self._planned[path] for path in paths if path in self._planned])
+        return [path for path in paths if path not in self._planned or found[self._planned[path]]]
+
+    def get_source_info(self, path):
+        if path in self._planned:
+            path = self.get_backup_location(self._planned[path])
+        return FileSeekerBase.get_source_info(self, path)
+
+    def get_source_path(self, path):
+        if path in self._planned:
+            relative_path = self._planned[path]
+            domain = self._all_files[relative_path][1]
+            root_path = get_root_path_from_domain(domain)
+            return f'{domain}/{relative_path[len(root_path) + 1:] if root_path else relative_path}'
+        return path
+
+    def open_mapped(self, path):
+        '''Files of a backup that is not encrypted are mapped where they are stored'''
+        if path in self._planned and self._keybag is None:
+            return _map_file(self.get_backup_location(self._planned[path]))
+        return FileSeekerBase.open_mapped(self, path)
+
+    def get_backup_location(self, relative_path):
+        '''Returns the path of the file stored in the backup for a logical path'''
+        hash_filename = self._all_files[relative_path][0]
+        return os.path.join(self.directory, hash_filename[:2], hash_filename)
+
+    def _get_listing(self):
+        return self._index, lambda i: normcase(self._relative_paths[i])
+
+    def _get_found(self, positions):
+        found = self._get_files([self._relative_paths[i] for i in positions])
+        return {i: found[self._relative_paths[i]] for i in positions}
+
+    def _get_cache_keys(self, paths):
+        return [self._all_files[self._planned[path]][0] for path in paths if path in self._planned]
+
+    def _get_temp_location(self, relative_path):
+        temp_location = os.path.join(self.temp_folder, sanitize_file_path(relative_path))
+        if is_platform_windows():
+            temp_location = temp_location.replace('/', '\\')
+        return temp_location
+
+    def _get_files(self, relative_paths):
+        '''Makes the files at the logical paths available in the temp folder, unless already there. Returns
+           {logical path: temp path or None on failure}'''
+        keep = {self._all_files[relative_path][0] for relative_path in relative_paths}
+        found = {}
+        missing = []
+        for relative_path in dict.fromkeys(relative_paths):
+            found[relative_path] = self._cache.get(self._all_files[relative_path][0])
+            if found[relative_path] is None:
+                missing.append(relative_path)
+        if self._keybag is None:
+            for relative_path in missing:
+                found[relative_path] = self._link_file(relative_path)
+        else:
+            found.update(self._decrypt_files(missing))
+        for relative_path in missing:
+            if found[relative_path]:
+                self._planned[found[relative_path]] = relative_path
+                size = 0 if os.path.samefile(found[relative_path], self.get_backup_location(relative_path)) else None
+                self._cache.add(self._all_files[relative_path][0], found[relative_path], keep, size)
+        return found
+
+    def _must_copy(self, relative_path):
+        '''Databases with a -wal or -journal file, and those files, are copied so that the backup is never written'''
+        if relative_path.endswith(self._db_companions):
+            return True
+        return relative_path + '-wal' in self._all_files or relative_path + '-journal' in self._all_files
+
+    def _link_file(self, relative_path):
+        '''Writes a file of the backup to the temp folder at its logical path, as a hard link to the stored file or
+           as a copy. Returns the temp path or None on failure'''
+        original_location = self.get_backup_location(relative_path)
+        temp_location = self._get_temp_location(relative_path)
+        try:
+            os.makedirs(os.path.dirname(temp_location), exist_ok=True)
+            if self._can_link and not self._must_copy(relative_path):
+                try:
+                    if os.path.lexists(temp_location):
+                        os.remove(temp_location)
+                    os.link(original_location, temp_location)
+                    return temp_location
+                except OSError as ex:
+                    if ex.errno == errno.ENOENT:
+                        raise
+                    # another volume or a file system without hard links, all the next files are copied
+                    self._can_link = False
+            copyfile(original_location, temp_location)
+            return temp_location
+        except Exception as ex:
+            logfunc(f'Could not copy {original_location} to {temp_location} ' + str(ex))
+        return None
+
+    def _get_file_encryptions(self, relative_paths):
+        '''Returns {logical path: (protection class, wrapped key, size, modification time)} read from the Files
+           table of the decrypted Manifest.db'''
+        paths_by_hash = {}
+        for relative_path in relative_paths:
+            paths_by_hash.setdefault(self._all_files[relative_path][0], []).append(relative_path)
+        hashes = list(paths_by_hash)
+        encryptions = {}
+        db = open_sqlite_db_readonly(self._manifest_db_path)
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            cursor = db.execute(f"SELECT fileID, file FROM Files WHERE fileID IN ({','.join('?' * len(chunk))})",
+                                chunk)
+            for hash_filename, file_plist in cursor:
+                try:
+                    encryption = get_file_encryption(file_plist)
+                except Exception as ex:
+                    logfunc(f'Could not read the encryption key of {hash_filename} from Manifest.db ' + str(ex))
+                    continue
+                for relative_path in paths_by_hash[hash_filename]:
+                    encryptions[relative_path] = encryption
+        return encryptions
+
+    def _decrypt_files(self, relative_paths):
+        '''Decrypts files of an encrypted backup to their logical path in the temp folder, in parallel. Returns
+           {logical path: temp path or None on failure}'''
+        encryptions = self._get_file_encryptions(relative_paths)
+        def decrypt(relative_path):
+            original_location = self.get_backup_location(relative_path)
+            temp_location = self._get_temp_location(relative_path)
+            if relative_path not in encryptions:
+                logfunc(f'Could not decrypt {original_location}, it is not in Manifest.db')
+                return None
+            protection_class, wrapped_key, size, mtime = encryptions[relative_path]
             try:
                 os.makedirs(os.path.dirname(temp_location), exist_ok=True)
-                copyfile(original_location, temp_location)
-                pathlist.append(temp_location)
+                if wrapped_key is None:
+                    copyfile(original_location, temp_location)
+                else:
+                    decrypt_file(original_location, temp_location,
+                                 self._keybag.unwrap_key(protection_class, wrapped_key), size)
+                if mtime:
+                    os.utime(temp_location, (mtime, mtime))
+                return temp_location
             except Exception as ex:
-                logfunc(f'Could not copy {original_location} to {temp_location} ' + str(ex))
-        return pathlist
+                logfunc(f'Could not decrypt {original_location} to {temp_location} ' + str(ex))
+            return None
+        if len(relative_paths) < 2:
+            return {relative_path: decrypt(relative_path) for relative_path in relative_paths}
+        # AES runs without the GIL, files are decrypted by several threads
+        with ThreadPoolExecutor(max_workers=min(len(relative_paths), os.cpu_count() or 1)) as executor:
+            return dict(zip(relative_paths, executor.map(decrypt, relative_paths)))
 
 class FileSeekerTar(FileSeekerBase):
-    def __init__(self, tar_file_path, temp_folder):
+    '''Seeker for tar and tar.gz archives.
+
+       The archive is read sequentially: the member index is built in one pass, during which the members
+       matched by search_many() are extracted as soon as they are reached, as reading them later would mean
+       decompressing the archive again. Members are written in chunks and remembered, later searches get
+       them from the temp folder.
+    '''
+    def __init__(self, tar_file_path, temp_folder, max_temp_size=None):
         FileSeekerBase.__init__(self)
+        self.tar_file_path = tar_file_path
         self.is_gzip = tar_file_path.lower().endswith('gz')
         mode ='r:gz' if self.is_gzip else 'r'
         self.tar_file = tarfile.open(tar_file_path, mode)
         self.temp_folder = temp_folder
         self.directory = temp_folder
+        self._members = None  # list of TarInfo, in archive order
+        self._index = None
+        self._cache = ExtractionCache(max_temp_size)  # member position -> extracted path
+        self._planned = {}  # extracted path -> member position, for files returned by search_many()
+
+    def __getstate__(self):
+        '''Open archive handles cannot be shared with worker processes, they reopen it instead'''
+        state = self.__dict__.copy()
+        del state['tar_file']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tar_file = tarfile.open(self.tar_file_path, 'r:gz' if self.is_gzip else 'r')
+
+    def _read_members(self, matcher=None):
+        '''Reads all member headers in a single pass over the archive. Members matching the PatternSet matcher
+           are extracted as they are reached. Returns {pattern: [member positions]} for the matcher'''
+        logfunc('Building files listing...')
+        matches = {pattern: [] for pattern in matcher.patterns} if matcher else {}
+        self._members = []
+        for member in self.tar_file:
+            position = len(self._members)
+            self._members.append(member)
+            if matcher:
+                matched = matcher.match(normcase(member.name))
+                for i in matched:
+                    matches[matcher.patterns[i]].append(position)
+                if matched:
+                    self._get_extracted([position])
+        self._index = PathIndex([normcase(member.name) for member in self._members])
+        logfunc(f'File listing complete - {len(self._members)} files')
+        return matches
+
+    def _get_extracted(self, positions):
+        '''Returns the paths of the members at positions, extracting those not already in the temp folder in
+           archive order, so a compressed archive is read forward only'''
+        extracted = {}
+        for position in sorted(set(positions)):
+            extracted[position] = self._cache.get(position)
+            if extracted[position] is None:
+                extracted[position] = self._extract_member(self._members[position])
+                if extracted[position]:
+                    self._cache.add(position, extracted[position], keep=positions)
+                    self._planned[extracted[position]] = position
+        return [extracted[position] for position in positions if extracted[position]]
+
+    def materialize(self, paths):
+        '''Extracts again any of the paths that were evicted from the temp folder'''
+        positions = [self._planned[path] for path in paths if path in self._planned]
+        available = set(self._get_extracted(positions))
+        return [path for path in paths if path not in self._planned or path in available]
+
+    def get_source_info(self, path):
+        if path in self._planned:
+            member = self._members[self._planned[path]]
+            return member.size, int(member.mtime)
+        return FileSeekerBase.get_source_info(self, path)
 
     def search(self, filepattern, return_on_first_hit=False):
-        pathlist = []
+        if self._members is None:
+            self._read_members()
         pat = _compile_pattern( normcase(filepattern) )
         root = normcase("root/")
-        for member in self.tar_file.getmembers():
-            if pat( root + normcase(member.name) ) is not None:
-                try:
-                    clean_name = sanitize_file_path(member.name)
-                    full_path = os.path.join(self.temp_folder, Path(clean_name))
-                    if member.isdir():
-                        os.makedirs(full_path, exist_ok=True)
-                    else:
-                        parent_dir = os.path.dirname(full_path)
-                        if not os.path.exists(parent_dir):
-                            os.makedirs(parent_dir)
-                        with open(full_path, "wb") as fout:
-                            fout.write(tarfile.ExFileObject(self.tar_file, member).read())
-                            fout.close()
-                        os.utime(full_path, (member.mtime, member.mtime))
-                    pathlist.append(full_path)
-                except Exception as ex:
-                    logfunc(f'Could not write file to filesystem, path was {member.name} ' + str(ex))
-        return pathlist
+        candidates = self._index.candidates(normcase(filepattern))
+        if candidates is None:
+            candidates = range(len(self._members))
+        positions = [i for i in candidates if pat( root + normcase(self._members[i].name) ) is not None]
+        return self._get_extracted(positions)
+
+    def search_many(self, filepatterns):
+        '''Matches all patterns in a single pass over the archive, extracting each match once as it is reached'''
+        matcher = PatternSet(filepatterns, normcase("root/"))
+        if self._members is None:
+            matches = self._read_members(matcher)
+        else:
+            matches = matcher.match_all([normcase(member.name) for member in self._members])
+        return {filepattern: self._get_extracted(matches[filepattern]) for filepattern in filepatterns}
+
+    def _get_listing(self):
+        if self._members is None:
+            self._read_members()
+        return self._index, lambda i: normcase(self._members[i].name)
+
+    def _get_found(self, positions):
+        self._get_extracted(positions)
+        return {i: self._cache.get(i) for i in positions}
+
+    def _get_cache_keys(self, paths):
+        return [self._planned[path] for path in paths if path in self._planned]
+
+    def _extract_member(self, member):
+        '''Writes a member to the temp folder, returns its path or None on failure'''
+        try:
+            clean_name = sanitize_file_path(member.name)
+            full_path = os.path.join(self.temp_folder, Path(clean_name))
+            if member.isdir():
+                os.makedirs(full_path, exist_ok=True)
+            else:
+                parent_dir = os.path.dirname(full_path)
+                if not os.path.exists(parent_dir):
+                    os.makedirs(parent_dir)
+                with open(full_path, "wb") as fout:
+                    copyfileobj(tarfile.ExFileObject(self.tar_file, member), fout, COPY_BUFFER_SIZE)
+                os.utime(full_path, (member.mtime, member.mtime))
+            return full_path
+        except Exception as ex:
+            logfunc(f'Could not write file to filesystem, path was {member.name} ' + str(ex))
+        return None
 
     def cleanup(self):
         self.tar_file.close()
 
 class FileSeekerZip(FileSeekerBase):
-    def __init__(self, zip_file_path, temp_folder):
+    def __init__(self, zip_file_path, temp_folder, max_temp_size=None):
         FileSeekerBase.__init__(self)
+        self.zip_file_path = zip_file_path
         self.zip_file = ZipFile(zip_file_path)
         self.name_list = self.zip_file.namelist()
         self.temp_folder = temp_folder
         self.directory = temp_folder
+        self._cache = ExtractionCache(max_temp_size)
+        self._planned = {}  # extracted path -> member, for files returned by search_many()
+        self._index = None  # PathIndex over name_list, built on first use
+
+    def __getstate__(self):
+        '''Open archive handles cannot be shared with worker processes, they reopen it instead'''
+        state = self.__dict__.copy()
+        del state['zip_file']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.zip_file = ZipFile(self.zip_file_path)
 
     def search(self, filepattern, return_on_first_hit=False):
         pathlist = []
@@ -165,18 +930,98 @@ class FileSeekerZip(FileSeekerBase):
         root = normcase("root/")
         for member in self.name_list:
             if pat( root + normcase(member) ) is not None:
-                try:
-                    extracted_path = self.zip_file.extract(member, path=self.temp_folder) # already replaces illegal chars with _ when exporting
-                    f = self.zip_file.getinfo(member)
-                    date_time = f.date_time
-                    date_time = timex.mktime(date_time + (0, 0, -1))
-                    os.utime(extracted_path, (date_time, date_time))
+                extracted_path = self._extract_member(member)
+                if extracted_path:
                     pathlist.append(extracted_path)
-                except Exception as ex:
-                    member = member.lstrip("/")
-                    logfunc(f'Could not write file to filesystem, path was {member} ' + str(ex))
         return pathlist
 
+    def search_many(self, filepatterns):
+        '''Matches all patterns in a single pass over the members. Members are only extracted when materialize()
+           is called for them'''
+        matches = PatternSet(filepatterns, normcase("root/")).match_all([normcase(member) for member in self.name_list])
+        results = {}
+        for filepattern in filepatterns:
+            results[filepattern] = pathlist = []
+            for i in matches[filepattern]:
+                extracted_path = self._get_extract_path(self.name_list[i])
+                self._planned[extracted_path] = self.name_list[i]
+                pathlist.append(extracted_path)
+        return results
+
+    def materialize(self, paths):
+        members = {self._planned[path] for path in paths if path in self._planned}
+        return [path for path in paths if path not in self._planned or self._extract_member(self._planned[path], members)]
+
+    def get_source_info(self, path):
+        if path in self._planned:
+            info = self.zip_file.getinfo(self._planned[path])
+            return info.file_size, int(timex.mktime(info.date_time + (0, 0, -1)))
+        return FileSeekerBase.get_source_info(self, path)
+
+    def open_mapped(self, path):
+        '''Members stored without compression that are not in the temp folder are mapped straight from the archive'''
+        member = self._planned.get(path)
+        if member is not None and self._cache.get(member) is None:
+            info = self.zip_file.getinfo(member)
+            if info.compress_type == ZIP_STORED and not info.flag_bits & 0x1 and not info.is_dir():
+                with open(self.zip_file_path, 'rb') as f:
+                    f.seek(info.header_offset)
+                    header = f.read(30)
+                if len(header) == 30 and header[:4] == b'PK\x03\x04':
+                    name_length, extra_length = struct.unpack_from('<HH', header, 26)
+                    return _map_file(self.zip_file_path, info.header_offset + 30 + name_length + extra_length,
+                                     info.file_size)
+        return FileSeekerBase.open_mapped(self, path)
+
+    def _get_listing(self):
+        if self._index is None:
+            self._index = PathIndex([normcase(member) for member in self.name_list])
+        return self._index, lambda i: normcase(self.name_list[i])
+
+    def _get_found(self, positions):
+        members = {self.name_list[i] for i in positions}
+        return {i: self._extract_member(self.name_list[i], members) for i in positions}
+
+    def _get_cache_keys(self, paths):
+        return [self._planned[path] for path in paths if path in self._planned]
+
+    def _get_extract_path(self, member):
+        '''Returns the path ZipFile.extract() writes member to, it replaces illegal chars with _ and drops
+           unsafe path components'''
+        arcname = member.replace('/', os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        invalid_path_parts = ('', os.path.curdir, os.path.pardir)
+        arcname = os.path.sep.join(x for x in arcname.split(os.path.sep) if x not in invalid_path_parts)
+        if os.path.sep == '\\':
+            arcname = ZipFile._sanitize_windows_name(arcname, os.path.sep)
+        return os.path.normpath(os.path.join(self.temp_folder, arcname))
+
+    def _extract_member(self, member, keep=()):
+        '''Writes a member to the temp folder in chunks, unless already there. Returns its path or None on failure'''
+        extracted_path = self._cache.get(member)
+        if extracted_path:
+            return extracted_path
+        try:
+            f = self.zip_file.getinfo(member)
+            extracted_path = self._get_extract_path(member)
+            if f.is_dir():
+                os.makedirs(extracted_path, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(extracted_path), exist_ok=True)
+                with self.zip_file.open(f) as source, open(extracted_path, 'wb') as target:
+                    copyfileobj(source, target, COPY_BUFFER_SIZE)
+            date_time = f.date_time
+            date_time = timex.mktime(date_time + (0, 0, -1))
+            os.utime(extracted_path, (date_time, date_time))
+            self._cache.add(member, extracted_path, keep)
+            return extracted_path
+        except Exception as ex:
+            member = member.lstrip("/")
+            logfunc(f'Could not write file to filesystem, path was {member} ' + str(ex))
+        return None
+
     def cleanup(self):
         self.zip_file.close()
         
\ No newline at end of file